@@ -1,21 +1,19 @@
-import sys
-from dotenv import dotenv_values
+# Logger Objects, each one gets initialized on its first access (e.g. 'from Application import NL_logs')
+_LOGGER_NAMES = {
+    'bot_logs'    : 'bot',
+    'TPL_logs'    : 'TPL',      # 'TPL_logs' -> 'Trading Platform Linkage Logs'
+    'NL_logs'     : 'NL',       # 'NL_logs' -> 'Nobitex Linkage Logs'
+    'trade_logs'  : 'trade',
+    'jarchi_logs' : 'jarchi'
+}
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
 
-from Application.utils.logs import get_logger # noqa: E402      
+def __getattr__(name: str):
+    if name not in _LOGGER_NAMES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
+    from Application.utils.logs import get_logger
 
-
-
-
-# Initialization of Logger Objects
-
-bot_logs = get_logger(logger_name='bot')
-# 'TPL_logs' -> 'Trading Platform Linkage Logs'
-TPL_logs = get_logger(logger_name='TPL')
-# 'NL_logs' -> 'Nobitex Linkage Logs'
-NL_logs  = get_logger(logger_name='NL')
-trade_logs = get_logger(logger_name='trade')
-jarchi_logs = get_logger(logger_name='jarchi')
\ No newline at end of file
+    logger = get_logger(logger_name=_LOGGER_NAMES[name])
+    globals()[name] = logger
+    return logger
\ No newline at end of file
@@ -1,16 +1,28 @@
 import sys
+import time
 import httpx
 import asyncio
+from typing import Awaitable
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import TPL_logs # noqa: E402
+from Application.api.hedging import hedged # noqa: E402
+from Application.api.retry_policy import RetryPolicy, DeadlineExceeded, circuit_breaker # noqa: E402
 
 
 
 
+def _fits(deadline: float | None, delay: float) -> bool:
+    """
+    Returns True if waiting 'delay' seconds still leaves time for another try before deadline.
+    """
+    return deadline is None or time.monotonic() + delay < deadline
+
+
 
 # =================================================================================================
 class APIService:
@@ -25,38 +37,96 @@ class APIService:
                        *,
                        params         : dict[str, str] | None = None, 
                        data           : dict[str, str] | None = None, 
-                       headers        : dict[str, str] | None = None) -> httpx.Response:
-        
-        for attempt in range(tries):
+                       headers        : dict[str, str] | None = None,
+                       idempotent     : bool | None = None,
+                       fail_fast      : bool = False,
+                       deadline       : float | None = None,
+                       hedge          : str | None = None) -> httpx.Response:
+        """
+        Sends the request, retrying it as the 'RetryPolicy' allows.
+
+        Parameters:
+            tries_interval (float): Base delay of the exponential backoff between tries.
+            tries (int): Maximum number of tries.
+            idempotent (bool): Whether the request is safe to be sent twice, defaults to True for
+                               GET and False for other methods. Requests that are not idempotent
+                               are only retried when the server surely has not processed them.
+            fail_fast (bool): Don't retry timeouts, for latency-critical requests.
+            deadline (float): 'time.monotonic()' time by which the request must be done, across
+                              all of its tries (see 'retry_policy.deadline_after()').
+            hedge (str): Name of the endpoint's shared throttle to hedge this idempotent request
+                         through (see 'hedging.hedged()').
+
+        Returns:
+            response (httpx.Response): The last response, its status may still be 429 or 5xx when
+                                       tries got exhausted.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker of endpoint is open.
+            DeadlineExceeded: If the deadline passed before a response was received.
+            httpx.NetworkError: If no response was received after retries.
+        """
+        policy  = RetryPolicy(tries      = tries,
+                              base_delay = tries_interval,
+                              idempotent = (method == 'GET') if idempotent is None else idempotent,
+                              fail_fast  = fail_fast)
+        breaker = circuit_breaker(endpoint)
+        attempt = 0
+
+        if hedge and not policy.idempotent:
+            raise ValueError(f'Can not hedge the non-idempotent request "{method} {endpoint}".')
+
+        while True:
+            trial = breaker.check()
+
+            attempt_timeout = timeout
+            if deadline is not None:
+                attempt_timeout = min(timeout, deadline - time.monotonic())
+                if attempt_timeout <= 0:
+                    raise DeadlineExceeded(f'Deadline of "{method} {endpoint}" passed after '
+                                           f'{attempt} tries.')
+
+            def send() -> Awaitable[httpx.Response]:
+                return client.request(method  = method,
+                                      url     = f"{url}{endpoint}",
+                                      params  = params,
+                                      json    = data,
+                                      headers = headers,
+                                      timeout = attempt_timeout)
             try:
-                response = await client.request(method  = method, 
-                                                url     = f"{url}{endpoint}", 
-                                                params  = params, 
-                                                json    = data, 
-                                                headers = headers, 
-                                                timeout = timeout)
-                
-                # print('request object:\t', response.request)
-                # print('request data:\t', data)
-                # print('response:\t', response)
-                # print('response dict:\t', response.json())
-                # print('\n\n')
+                response = await (hedged(send, endpoint, hedge) if hedge else send())
+            except httpx.HTTPError as err:
+                breaker.record_failure()
+                TPL_logs.error(f'HTTP request error on "{method} {endpoint}" '
+                               f'(try {attempt + 1}/{policy.tries}): {err!r}')
+                delay = policy.delay(attempt)
+                if not policy.should_retry(attempt, error=err):
+                    raise httpx.NetworkError('Inside _request method of APIService class:'
+                                             '\n\tAPI request failed after retries') from err
+                if not _fits(deadline, delay):
+                    raise DeadlineExceeded(f'Deadline of "{method} {endpoint}" passed after '
+                                           f'{attempt + 1} tries.') from err
+
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.release_trial() if trial else None
+                raise
+
+            if response.status_code < 500 and response.status_code != 429:
+                breaker.record_success()
                 return response
 
-            except httpx.HTTPError as err:
-                print(err)
-                TPL_logs.error(f"HTTP request error: {err}")
-                if attempt < tries - 1:
-                    await asyncio.sleep(tries_interval)
-
-            except Exception as err:
-                print(err)
-                TPL_logs.error(f"Unexpected error: {err}")
-                if attempt < tries - 1:
-                    await asyncio.sleep(tries_interval)
-
-        raise  httpx.NetworkError('Inside _request method of APIService class:'
-                                  '\n\tAPI request failed after retries')
+            breaker.record_failure()
+            TPL_logs.error(f'"{method} {endpoint}" responded {response.status_code} '
+                           f'(try {attempt + 1}/{policy.tries}).')
+            delay = policy.delay(attempt, response)
+            if not policy.should_retry(attempt, response=response) or not _fits(deadline, delay):
+                return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
     # ____________________________________________________________________________ . . .
 
 
@@ -70,8 +140,11 @@ class APIService:
                   *,
                   params         : dict[str, str] | None = None,
                   data           : dict[str, str] | None = None,
-                  headers        : dict[str, str] | None = None) -> httpx.Response:
-        
+                  headers        : dict[str, str] | None = None,
+                  fail_fast      : bool = False,
+                  deadline       : float | None = None,
+                  hedge          : str | None = None) -> httpx.Response:
+
         return await self._request(client         = client,
                                    method         = "GET",
                                    url            = url,
@@ -81,7 +154,10 @@ class APIService:
                                    tries          = tries,
                                    params         = params,
                                    data           = data,
-                                   headers        = headers)
+                                   headers        = headers,
+                                   fail_fast      = fail_fast,
+                                   deadline       = deadline,
+                                   hedge          = hedge)
     # ____________________________________________________________________________ . . .
 
 
@@ -94,8 +170,11 @@ class APIService:
                    tries          : int,
                    *,
                    data           : dict[str, str] | None = None,
-                   headers        : dict[str, str] | None = None) -> httpx.Response:
-        
+                   headers        : dict[str, str] | None = None,
+                   idempotent     : bool = False,
+                   fail_fast      : bool = False,
+                   deadline       : float | None = None) -> httpx.Response:
+
         return await self._request(client         = client,
                                    method         = "POST",
                                    url            = url,
@@ -104,7 +183,10 @@ class APIService:
                                    tries_interval = tries_interval,
                                    tries          = tries,
                                    data           = data,
-                                   headers        = headers)
+                                   headers        = headers,
+                                   idempotent     = idempotent,
+                                   fail_fast      = fail_fast,
+                                   deadline       = deadline)
     # ____________________________________________________________________________ . . .
 
 
@@ -0,0 +1,126 @@
+import sys
+import time
+import httpx
+import asyncio
+from collections import deque
+from dotenv import dotenv_values
+from typing import Awaitable, Callable
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application import TPL_logs                            # noqa: E402
+import Application.configs.admin_config as aconfig          # noqa: E402
+from Application.api.rate_limits import endpoint_throttle   # noqa: E402
+
+
+
+
+# =================================================================================================
+class LatencyTracker:
+    """
+    Rolling window of the response times of an endpoint.
+    """
+    __slots__ = ('samples', 'min_samples')
+
+    def __init__(self,
+                 window      : int = aconfig.Hedge.WINDOW,
+                 min_samples : int = aconfig.Hedge.MIN_SAMPLES):
+        self.samples     : deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+    # ____________________________________________________________________________ . . .
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+    # ____________________________________________________________________________ . . .
+
+    def quantile(self, q: float = aconfig.Hedge.QUANTILE) -> float | None:
+        """
+        Returns the q-quantile of recorded response times, None until enough samples got recorded.
+        """
+        if len(self.samples) < self.min_samples:
+            return None
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+# ________________________________________________________________________________ . . .
+
+
+_trackers: dict[str, LatencyTracker] = {}
+
+
+def latency_tracker(endpoint: str) -> LatencyTracker:
+    """
+    Returns the shared latency tracker of endpoint.
+    """
+    tracker = _trackers.get(endpoint)
+    if tracker is None:
+        tracker = _trackers[endpoint] = LatencyTracker()
+
+    return tracker
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+async def _timed(send: Callable[[], Awaitable[httpx.Response]],
+                 tracker: LatencyTracker) -> httpx.Response:
+    start = time.monotonic()
+    response = await send()
+    tracker.record(time.monotonic() - start)
+
+    return response
+# ________________________________________________________________________________ . . .
+
+
+async def hedged(send          : Callable[[], Awaitable[httpx.Response]],
+                 endpoint      : str,
+                 throttle_name : str) -> httpx.Response:
+    """
+    Sends an idempotent request and, if it is still pending after the p95 response time of the
+    endpoint, fires a second identical request and returns whichever completes first.
+
+    The hedge is only fired if the shared rate budget of endpoint has room for it right now, so
+    hedging never delays or starves the regular callers of the endpoint.
+
+    Parameters:
+        send (Callable): Returns a new awaitable of the request on each call.
+        endpoint (str): The endpoint path whose latency is tracked.
+        throttle_name (str): Name of the endpoint's shared throttle (e.g. 'ORDER_BOOK').
+
+    Returns:
+        response (httpx.Response): The first received response.
+
+    Raises:
+        httpx.HTTPError: Error of the last failed request, if both of them failed.
+    """
+    tracker = latency_tracker(endpoint)
+    delay = tracker.quantile()
+    primary: asyncio.Future[httpx.Response] = asyncio.ensure_future(_timed(send, tracker))
+    if delay is None:
+        return await primary
+
+    hedge: asyncio.Future[httpx.Response] | None = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not await endpoint_throttle(throttle_name).try_acquire():
+            return await primary
+
+        TPL_logs.debug(f'Hedging "{endpoint}" request after {delay:.3f}s.')
+        hedge = asyncio.ensure_future(_timed(send, tracker))
+
+        pending: set[asyncio.Future[httpx.Response]] = {primary, hedge}
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if not pending:
+                return done.pop().result()
+    finally:
+        for request in (primary, hedge):
+            if request is not None and not request.done():
+                request.cancel()
+# =================================================================================================
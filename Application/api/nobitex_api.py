@@ -9,15 +9,28 @@ from aiolimiter import AsyncLimiter
 from typing import Any, AsyncGenerator
 from persiantools.jdatetime import JalaliDateTime # type: ignore
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import NL_logs                             # noqa: E402
 from Application.data.user import User                      # noqa: E402
 from Application.api.utils import wait_time                 # noqa: E402
 import Application.configs.admin_config as aconfig          # noqa: E402
 from Application.api.api_service import APIService          # noqa: E402
+from Application.api.rate_limits import endpoint_throttle   # noqa: E402
+from Application.api.retry_policy import deadline_after     # noqa: E402
+from Application.utils.tracing import mark, traced          # noqa: E402
 from Application.data.exchange import Nobitex as nb         # noqa: E402
+from Application.data.market_info import PairInfo,\
+                                         pair_info,\
+                                         check_order,\
+                                         order_price,\
+                                         pair_symbol,\
+                                         fetch_pair_info,\
+                                         normalize_price,\
+                                         fetch_market_info,\
+                                         normalize_amount   # noqa: E402
 # from Application.configs.config import MarketData as md   # noqa: E402
 from Application.data.data_tools import parse_orders,\
                                         parse_positions,\
@@ -50,18 +63,14 @@ class Market:
         Yields:
             market_price (float | int): Market price for given trading pair.
         """
-        last_fetch_time: float = 0.0
-        limiter = AsyncLimiter(max_rate    = nb.Endpoint.MARKET_STATS_RL,
-                               time_period = nb.Endpoint.MARKET_STATS_RP)
+        throttle = endpoint_throttle('MARKET_STATS')
 
         payload = {'srcCurrency': src_currency,
                    'dstCurrency': dst_currency}
         
         async with httpx.AsyncClient() as http_agent:
             while True:
-                await limiter.acquire()
-                wait = wait_time(nb.Endpoint.MARKET_STATS_MI, time.time(), last_fetch_time)
-                await asyncio.sleep(wait) if (wait > 0) else None
+                await throttle.acquire()
 
                 response = await self.service.get(client         = http_agent,
                                                   url            = nb.URL,
@@ -69,15 +78,48 @@ class Market:
                                                   timeout        = aconfig.Market.OHLC.TIMEOUT,
                                                   tries_interval = nb.Endpoint.MARKET_STATS_MI,
                                                   tries          = aconfig.Market.OHLC.TRIES,
-                                                  params         = payload)
-                
-                last_fetch_time = time.time()
+                                                  params         = payload,
+                                                  hedge          = 'MARKET_STATS')
 
                 market_price = response.json()['stats'][f'{src_currency}-{dst_currency}']['latest']
                 yield market_price
     # ____________________________________________________________________________ . . .
 
 
+    async def fetch_market_prices(self,
+                                  http_agent     : httpx.AsyncClient,
+                                  src_currencies : list[str],
+                                  dst_currencies : list[str]) -> dict[str, float]:
+        """
+        Fetches the market prices of many trading pairs in a single request.
+
+        Parameters:
+            http_agent (AsyncClient): The HTTP client used to make the request.
+            src_currencies (list[str]): Source currencies.
+            dst_currencies (list[str]): Destination currencies, each one is eather 'usdt' | 'rls'.
+
+        Returns:
+            market_prices (dict[str, float]): Latest prices keyed by 'src-dst' pair names.
+        """
+        payload = {'srcCurrency': ','.join(sorted(set(src_currencies))),
+                   'dstCurrency': ','.join(sorted(set(dst_currencies)))}
+
+        response = await self.service.get(client         = http_agent,
+                                          url            = nb.URL,
+                                          endpoint       = nb.Endpoint.MARKET_STATS,
+                                          timeout        = aconfig.Market.Stats.TIMEOUT,
+                                          tries_interval = nb.Endpoint.MARKET_STATS_MI,
+                                          tries          = aconfig.Market.Stats.TRIES,
+                                          params         = payload,
+                                          hedge          = 'MARKET_STATS')
+
+        stats: dict = response.json().get('stats', {})
+
+        return {pair: float(stat['latest']) for pair, stat in stats.items()
+                if isinstance(stat, dict) and stat.get('latest') is not None}
+    # ____________________________________________________________________________ . . .
+
+
     async def kline(self,
                     http_agent     : httpx.AsyncClient,
                     symbol         : str,
@@ -296,17 +338,13 @@ class Market:
         - order_book_bids_df (DataFrame): Bid orders DataFrame with columns 'price' and 'volume'.
         - midprice (float):
         """
-        last_fetch_time: float = 0.0
-        limiter = AsyncLimiter(max_rate    = nb.Endpoint.ORDER_BOOK_RL,
-                               time_period = nb.Endpoint.ORDER_BOOK_RP)
+        throttle = endpoint_throttle('ORDER_BOOK')
 
         endpoint = nb.Endpoint.ORDER_BOOK +  f'{src_currency.upper() + dst_currency.upper()}'
 
         async with http_agent:
             while True:
-                await limiter.acquire()
-                wait = wait_time(nb.Endpoint.ORDER_BOOK_MI, time.time(), last_fetch_time)
-                await asyncio.sleep(wait) if (wait > 0) else None
+                await throttle.acquire()
 
                 response = await self.service.get(
                     client         = http_agent,
@@ -314,11 +352,10 @@ class Market:
                     endpoint       = endpoint,
                     timeout        = aconfig.Market.OrderBook.TIMEOUT,
                     tries_interval = nb.Endpoint.ORDER_BOOK_MI,
-                    tries          = aconfig.Market.OrderBook.TRIES
+                    tries          = aconfig.Market.OrderBook.TRIES,
+                    hedge          = 'ORDER_BOOK'
                 )
 
-                last_fetch_time = time.time()
-
                 order_book_asks_df, order_book_bids_df, midprice = parse_order_book(
                     raw_order_book = response.json()
                 )
@@ -327,6 +364,41 @@ class Market:
     # ____________________________________________________________________________ . . .
 
 
+    async def fetch_all_order_books(
+        self,
+        http_agent : httpx.AsyncClient,
+        symbols    : set[str] | None = None
+    ) -> dict[str, tuple[pd.DataFrame, pd.DataFrame, float]]:
+        """
+        Fetches the order books of all markets in a single request.
+
+        Parameters:
+            http_agent (AsyncClient): The HTTP agent which is used to make the request call.
+            symbols (set[str]): Symbols (e.g. 'USDTIRT') to parse, parses all of them if None.
+
+        Returns:
+            order_books (dict): Tuples of (asks_df, bids_df, mid_price) keyed by symbol.
+        """
+        response = await self.service.get(client         = http_agent,
+                                          url            = nb.URL,
+                                          endpoint       = nb.Endpoint.ORDER_BOOK + 'all',
+                                          timeout        = aconfig.Market.OrderBook.TIMEOUT,
+                                          tries_interval = nb.Endpoint.ORDER_BOOK_MI,
+                                          tries          = aconfig.Market.OrderBook.TRIES,
+                                          hedge          = 'ORDER_BOOK')
+
+        order_books: dict = {}
+        for symbol, raw_order_book in response.json().items():
+            if symbols is not None and symbol not in symbols:
+                continue
+            if isinstance(raw_order_book, dict) and raw_order_book.get('asks') \
+                                                and raw_order_book.get('bids'):
+                order_books[symbol] = parse_order_book(raw_order_book)
+
+        return order_books
+    # ____________________________________________________________________________ . . .
+
+
     def _prior_timestamp(self, data: pd.DataFrame | dict, *, timeframe: str) -> int:
         """
         This is an internal sub_method for '_init_fetch' method which returns the timestamp of the 
@@ -392,14 +464,27 @@ class Trade:
     # ____________________________________________________________________________ . . .
 
 
-    async def fetch_asset_deceimals(self):
+    async def fetch_asset_deceimals(self,
+                                    src_currency : str,
+                                    dst_currency : str,
+                                    http_agent   : httpx.AsyncClient | None = None) -> PairInfo:
         """
-        
+        Returns the precisions (tick and lot sizes) of a market along with its other trading rules,
+        which are cached and fetched again once 'MarketInfo.TTL' passes.
+
+        Parameters:
+            src_currency (str): Source currency.
+            dst_currency (str): Destination currency.
+            http_agent (AsyncClient): The HTTP agent which is used if the rules get fetched.
+
+        Returns:
+            pair (PairInfo): Trading rules of the market.
         """
-        pass
+        return await fetch_pair_info(pair_symbol(src_currency, dst_currency), http_agent)
     # ____________________________________________________________________________ . . .
 
 
+    @traced('place_order')
     async def _base_place_order(self,
                                http_agent   : httpx.AsyncClient,
                                token        : str,
@@ -420,7 +505,14 @@ class Trade:
             src_currency (str): Source currency.
             dst_currency (str): Destination currency.
             amount (float): Amount to trade.
-            kwargs: Other additional parameters.
+            kwargs: Other additional parameters, 'deadline' bounds the total time of placement and
+                    defaults to 'PlaceOrder.DEADLINE' seconds from now.
+
+        Amount and prices are rounded to the lot and tick sizes of the market from its trading
+        rules, which are fetched first if their cache expired, see 'fetch_asset_deceimals()'.
+
+        Raises:
+            ValueError: If the order breaks the trading rules of the market.
 
         Returns:
             request_response (dict): The response of order placement from the exchange.
@@ -432,12 +524,18 @@ class Trade:
         execution = kwargs.get('execution')
         if execution and mode:
             raise ValueError("Cannot specify both 'execution' and 'mode'.")
-        
+
+        pair = await self.fetch_asset_deceimals(src_currency, dst_currency, http_agent)
+
+        def price(key: str) -> str:
+            value = kwargs.get(key)
+            return normalize_price(value, pair) if value is not None else str(value)
+
         headers = {'Authorization': f'Token {token}'}
         payload: dict  = {'type'          : side, # IMPELEMENT DEFAULT VALUES FOR .get FUNCTIONS.
                           'srcCurrency'   : src_currency,
                           'dstCurrency'   : dst_currency,
-                          'amount'        : str(amount)}   # Implement a function to be called here to correct the "price" and "amount" floating point numbers.
+                          'amount'        : normalize_amount(amount, pair)}
 
 
         if environment == 'spot':
@@ -453,21 +551,27 @@ class Trade:
         if execution:
             payload['execution'] = execution
             if execution in {'limit', 'stop_limit'}:
-                payload['price'] = str(kwargs.get('price'))
+                payload['price'] = price('price')
             if execution in {'stop_limit', 'stop_market'}:
-                payload['stopPrice'] = str(kwargs.get('stop_price'))
+                payload['stopPrice'] = price('stop_price')
 
         elif mode:
             payload.update({'mode'          : mode,
-                            'price'         : str(kwargs.get('price')),
-                            'stopPrice'     : str(kwargs.get('stop_price')),
-                            'stopLimitPrice': str(kwargs.get('stop_limit_price'))})
+                            'price'         : price('price'),
+                            'stopPrice'     : price('stop_price'),
+                            'stopLimitPrice': price('stop_limit_price')})
+
+        reference_price = 'price' if kwargs.get('price') is not None else 'stop_price'
+        check_order(payload['amount'],
+                    price(reference_price) if kwargs.get(reference_price) is not None else None,
+                    pair)
 
 
         if kwargs.get('client_oid'):
             payload['clientOrderId'] = kwargs.get('client_oid')
 
 
+        mark('order_on_wire')
         response = await self.service.post(client         = http_agent,
                                            url            = nb.URL,
                                            endpoint       = endpoint,
@@ -475,7 +579,11 @@ class Trade:
                                            tries_interval = tries_interval,
                                            tries          = aconfig.Trade.Place.PlaceOrder.TRIES,
                                            data           = payload,
-                                           headers        = headers)
+                                           headers        = headers,
+                                           idempotent     = bool(kwargs.get('client_oid')),
+                                           fail_fast      = True,
+                                           deadline       = kwargs.get('deadline') or deadline_after(
+                                               aconfig.Trade.Place.PlaceOrder.DEADLINE))
 
         return response.json()
     # ____________________________________________________________________________ . . .
@@ -871,6 +979,51 @@ class Trade:
     # ____________________________________________________________________________ . . .
 
 
+    async def fetch_orders_page(self,
+                                client       : httpx.AsyncClient,
+                                token        : str,
+                                *,
+                                status       : str = 'all',
+                                page         : int = 1,
+                                from_id      : int | None = None,
+                                src_currency : str | None = None,
+                                dst_currency : str | None = None) -> dict:
+        """
+        Fetches a single page of user's orders.
+
+        Parameters:
+            client (httpx.AsyncClient): HTTP client.
+            token (str): User's API token.
+            status (str): The status of orders. Expects eather "all" | "open" | "done" | "close".
+            page (int): To request a specific page of responses in case "hasNext" flag is "True".
+            from_id (int): Only orders with this id and newer ones are returned if given.
+            src_currency (str): Source currency.
+            dst_currency (str): Destination currency is eather "rls" | "usdt".
+
+        Returns: A dictionary containing 3 elements: -request status, -orders, and -hasNext flag
+        """
+        payload = {'status': status, 'details': '2', 'page': str(page), 'pageSize': '100'}
+        if from_id is not None:
+            payload['fromId'] = str(from_id)
+        if src_currency and dst_currency:
+            payload['dstCurrency'] = dst_currency
+            payload['srcCurrency'] = src_currency
+
+        headers = {'Authorization': 'Token ' + token}
+
+        response = await self.service.get(client         = client,
+                                          url            = nb.URL,
+                                          endpoint       = nb.Endpoint.ORDERS,
+                                          timeout        = aconfig.Trade.Fetch.Orders.TIMEOUT,
+                                          tries_interval = nb.Endpoint.ORDERS_MI,
+                                          tries          = aconfig.Trade.Fetch.Orders.TRIES,
+                                          data           = payload,
+                                          headers        = headers)
+
+        return response.json()
+    # ____________________________________________________________________________ . . .
+
+
     async def fetch_positions(self,
                               client     : httpx.AsyncClient,
                               token      : str,
@@ -1012,7 +1165,8 @@ class Trade:
                                          tries_interval = nb.Endpoint.UPDATE_STATUS_MI,
                                          tries          = aconfig.Trade.Place.CancelOrders.TRIES,
                                          data           = payload,
-                                         headers        = headers)
+                                         headers        = headers,
+                                         idempotent     = True)
 
             return response.json()
 
@@ -1047,7 +1201,8 @@ class Trade:
             timeout        = aconfig.Trade.Place.CancelOrders.TIMEOUT,
             tries_interval = nb.Endpoint.CANCEL_ORDERS_MI,
             tries          = aconfig.Trade.Place.CancelOrders.TRIES,
-            headers        = headers
+            headers        = headers,
+            idempotent     = True
         )
 
         return 'succeeded' if response.json()['status'] == 'ok' else 'failed'
@@ -1064,7 +1219,8 @@ class Trade:
                              src_currecy  : str | None = None,
                              dst_currency : str | None = None,
                              price        : float | str | None = None, # CAN BE 'market' FOR MARKET ORDER EXECUTIONS?
-                             stop_price   : float | None = None):
+                             stop_price   : float | None = None,
+                             deadline     : float | None = None):
         """
         Close a position.
 
@@ -1079,6 +1235,8 @@ class Trade:
             dst_currency (str - optional): Destination currency is eather 'usdt' | 'rls'.
             price (float): It's the current market price for 'merket' order executions, or the limit closing price for 'limit' order executions.
             stop_price (float): The price that activates 'stop' orders.
+            deadline (float): 'time.monotonic()' time to give up closing by, defaults to
+                              'ClosePosition.DEADLINE' seconds from now.
 
         Raises:
             ValueError:
@@ -1113,7 +1271,10 @@ class Trade:
                 tries_interval = nb.Endpoint.CLOSE_POSITION_MI,
                 tries          = aconfig.Trade.Place.ClosePosition.TRIES,
                 data           = payload,
-                headers        = headers
+                headers        = headers,
+                fail_fast      = True,
+                deadline       = deadline or deadline_after(
+                    aconfig.Trade.Place.ClosePosition.DEADLINE)
             )
 
             return response.json()
@@ -1123,6 +1284,16 @@ class Trade:
     # ____________________________________________________________________________ . . .
 
 
+    @staticmethod
+    def market_close_price(price: float | int, dst_currency: str, src_currency: str = '') -> str:
+        """
+        Converts a market price to the 'price' parameter of a market 'close_position' request, by
+        the currency scaling and tick size of the market.
+        """
+        return order_price(price, pair_info(pair_symbol(src_currency, dst_currency)))
+    # ____________________________________________________________________________ . . .
+
+
     async def close_all_positions(self, token: str):
         """
         Closes all active positions by market price.
@@ -1163,15 +1334,24 @@ class Trade:
         positions_pairs = list(set(positions_pairs))
 
 
-        # Fetch market price for trading pairs
+        # Fetch market prices of all trading pairs in a single request
+        # along with the trading rules of the markets, if their cache expired
         market = Market(APIService())
-        market_prices: dict = {}
+        async with httpx.AsyncClient() as http_agent:
+            market_prices, market_info = await asyncio.gather(
+                market.fetch_market_prices(
+                    http_agent     = http_agent,
+                    src_currencies = [src for src, _ in positions_pairs],
+                    dst_currencies = [dst for _, dst in positions_pairs]
+                ),
+                fetch_market_info(http_agent),
+                return_exceptions = True
+            )
 
-        for src, dst in positions_pairs:
-            market_prices[f'{src}-{dst}'] = await anext(market.live_fetch_market_price(
-                src_currency = src,
-                dst_currency = dst
-            ))
+        if isinstance(market_prices, BaseException):
+            raise market_prices
+        if isinstance(market_info, BaseException):
+            NL_logs.error(f'Closing positions by the last known trading rules: {market_info}')
 
 
         # Prepare coroutines for closing positions
@@ -1184,11 +1364,9 @@ class Trade:
                 src_currecy  = position.get('srcCurrency')
                 dst_currency = position.get('dstCurrency')
 
-                price = market_prices[f'{src_currecy}-{dst_currency}']
-                if isinstance(price, int):
-                    price = str(int(price/10)) if dst_currency == 'rls' else str(price)
-                else:
-                    price = str(price/10) if dst_currency == 'rls' else str(price)
+                price = self.market_close_price(market_prices[f'{src_currecy}-{dst_currency}'],
+                                                dst_currency,
+                                                src_currecy)
 
                 coroutines.append(
                     self.close_position(
@@ -1336,7 +1514,8 @@ class Account:
                               tries_interval = nb.Endpoint.BALANCE_MI,
                               tries          = aconfig.Account.Balance.TRIES,
                               data           = payload,
-                              headers        = headers)
+                              headers        = headers,
+                              idempotent     = True)
 
         return response.json()
     # ____________________________________________________________________________ . . .
@@ -0,0 +1,122 @@
+import sys
+import time
+import asyncio
+from dotenv import dotenv_values
+from aiolimiter import AsyncLimiter
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.api.utils import wait_time         # noqa: E402
+from Application.data.exchange import Nobitex as nb # noqa: E402
+
+
+
+
+
+# =================================================================================================
+class EndpointThrottle:
+    def __init__(self,
+                 max_rate     : int,
+                 rate_period  : float,
+                 min_interval : float = 0.0,
+                 limiter      : AsyncLimiter | None = None):
+        """
+        Rate limiter of a single exchange endpoint which is shared by every caller of it.
+
+        Parameters:
+            max_rate (int): Maximum number of requests in every 'rate_period'.
+            rate_period (float): The rate limit period in seconds.
+            min_interval (float): Minimum interval between two subsequent requests in seconds.
+            limiter (AsyncLimiter): An existing rate budget to share instead of a new one.
+        """
+        self.limiter = limiter or AsyncLimiter(max_rate, rate_period)
+        self.min_interval = min_interval
+        self._last_call: float = 0.0
+        self._lock: asyncio.Lock | None = None
+    # ____________________________________________________________________________ . . .
+
+
+    async def acquire(self):
+        """
+        Waits until sending one more request to the endpoint stays within its rate limits.
+        """
+        await self.limiter.acquire()
+
+        if self.min_interval <= 0:
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            wait = wait_time(self.min_interval, time.time(), self._last_call)
+            await asyncio.sleep(wait) if (wait > 0) else None
+            self._last_call = time.time()
+    # ____________________________________________________________________________ . . .
+
+
+    def has_capacity(self) -> bool:
+        """
+        Returns True if a request can be sent right now without waiting for the limiter.
+        """
+        return self.limiter.has_capacity() and \
+               wait_time(self.min_interval, time.time(), self._last_call) == 0
+    # ____________________________________________________________________________ . . .
+
+
+    async def try_acquire(self) -> bool:
+        """
+        Takes one request from the rate budget only if it is available right now. It ignores the
+        minimum interval, which is meant to pace polling loops rather than to protect the budget.
+
+        Returns:
+            acquired (bool): False if the budget is exhausted.
+        """
+        if not self.limiter.has_capacity():
+            return False
+
+        await self.limiter.acquire()
+        return True
+# =================================================================================================
+
+
+
+
+
+# =================================================================================================
+_throttles: dict[tuple[str, bool], EndpointThrottle] = {}
+
+
+def endpoint_throttle(endpoint_name: str, spaced: bool = True) -> EndpointThrottle:
+    """
+    Returns the shared throttle of given endpoint, creating it on first call from the rate limit
+    constants of 'Nobitex.Endpoint'.
+
+    Parameters:
+        endpoint_name (str): Name of endpoint attribute in 'Nobitex.Endpoint' (e.g. 'OHLC').
+        spaced (bool): Whether to also keep the '_MI' interval between subsequent spaced
+                       requests. Spaced and unspaced throttles of an endpoint share its rate
+                       budget.
+
+    Raises:
+        AttributeError: If rate limit constants of the endpoint are not defined.
+
+    Returns:
+        throttle (EndpointThrottle): The shared throttle object of endpoint.
+    """
+    throttle = _throttles.get((endpoint_name, spaced))
+
+    if throttle is None:
+        sibling = _throttles.get((endpoint_name, not spaced))
+        throttle = EndpointThrottle(
+            max_rate     = getattr(nb.Endpoint, f'{endpoint_name}_RL'),
+            rate_period  = getattr(nb.Endpoint, f'{endpoint_name}_RP'),
+            min_interval = getattr(nb.Endpoint, f'{endpoint_name}_MI') if spaced else 0.0,
+            limiter      = sibling.limiter if sibling else None
+        )
+        _throttles[(endpoint_name, spaced)] = throttle
+
+    return throttle
+# =================================================================================================
@@ -0,0 +1,229 @@
+import sys
+import time
+import httpx
+import random
+from email.utils import parsedate_to_datetime
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application import TPL_logs                        # noqa: E402
+import Application.configs.admin_config as aconfig      # noqa: E402
+
+
+# Errors raised before the request could reach the server, retrying them can never duplicate it
+UNSENT_REQUEST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Statuses telling that the server did not process the request
+UNPROCESSED_STATUSES = frozenset({429, 503})
+
+
+
+
+# =================================================================================================
+class CircuitOpenError(httpx.HTTPError):
+    """
+    Raised instead of sending a request to an endpoint whose circuit breaker is open.
+    """
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f'Circuit breaker of "{endpoint}" is open, retry in {retry_in:.1f}s.')
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+# ________________________________________________________________________________ . . .
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """
+    Raised when the deadline of a request passes before it could get a response.
+    """
+# ________________________________________________________________________________ . . .
+
+
+def deadline_after(seconds: float) -> float:
+    """
+    Returns the deadline which is 'seconds' from now, on the 'time.monotonic()' clock. The same
+    deadline can be passed down to every request of an operation to bound its total duration.
+    """
+    return time.monotonic() + seconds
+# ________________________________________________________________________________ . . .
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request gets retried.
+
+    Idempotent requests are retried on any transport error and on 429/5xx statuses. Requests
+    that are not idempotent are retried only when the server surely has not processed them, that
+    is on errors raised before sending them and on 429/503 statuses. Fail-fast requests are not
+    retried after timeouts, so a latency-critical call never stacks tries × timeout seconds.
+    Delays grow exponentially with full jitter, and a 'Retry-After' header of server is honored.
+    """
+    __slots__ = ('tries', 'base_delay', 'max_delay', 'idempotent', 'fail_fast')
+
+    def __init__(self,
+                 tries      : int,
+                 base_delay : float,
+                 max_delay  : float = aconfig.Retry.MAX_DELAY,
+                 idempotent : bool = True,
+                 fail_fast  : bool = False):
+        """
+        Parameters:
+            tries (int): Maximum number of attempts.
+            base_delay (float): Delay ceiling of the first retry in seconds, doubled on each retry.
+            max_delay (float): Upper bound of delays in seconds.
+            idempotent (bool): Whether sending the request twice has the same effect as once.
+            fail_fast (bool): Whether to give up on timeouts instead of retrying.
+        """
+        self.tries      = max(1, tries)
+        self.base_delay = base_delay
+        self.max_delay  = max_delay
+        self.idempotent = idempotent
+        self.fail_fast  = fail_fast
+    # ____________________________________________________________________________ . . .
+
+    def should_retry(self,
+                     attempt  : int,
+                     *,
+                     error    : Exception | None = None,
+                     response : httpx.Response | None = None) -> bool:
+        """
+        Returns True if the failed attempt (counted from 0) should be retried.
+        """
+        if attempt >= self.tries - 1:
+            return False
+
+        if error is not None:
+            if isinstance(error, UNSENT_REQUEST_ERRORS):
+                return True
+            if self.fail_fast and isinstance(error, httpx.TimeoutException):
+                return False
+            return self.idempotent and isinstance(error, httpx.TransportError)
+
+        if response is not None:
+            if response.status_code in UNPROCESSED_STATUSES:
+                return True
+            return self.idempotent and response.status_code >= 500
+
+        return False
+    # ____________________________________________________________________________ . . .
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """
+        Returns the seconds to wait before retrying the failed attempt (counted from 0).
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_delay))
+
+        return backoff
+# ________________________________________________________________________________ . . .
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """
+    Returns the seconds requested by the 'Retry-After' header of response, if there is any.
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+class CircuitBreaker:
+    """
+    Per endpoint circuit breaker.
+
+    After 'failure_threshold' consecutive failures the circuit opens and requests are refused
+    for 'reset_timeout' seconds. Then a single trial request is let through (half-open), whose
+    success closes the circuit and whose failure opens it again.
+    """
+    __slots__ = ('endpoint', 'failure_threshold', 'reset_timeout', 'failures', 'opened_at',
+                 '_trial_sent')
+
+    def __init__(self,
+                 endpoint          : str,
+                 failure_threshold : int = aconfig.Retry.BREAKER_THRESHOLD,
+                 reset_timeout     : float = aconfig.Retry.BREAKER_RESET_TIMEOUT):
+        self.endpoint          = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout     = reset_timeout
+        self.failures          : int = 0
+        self.opened_at         : float | None = None
+        self._trial_sent       : bool = False
+    # ____________________________________________________________________________ . . .
+
+    def check(self) -> bool:
+        """
+        Raises CircuitOpenError if a request to the endpoint must not be sent now.
+
+        Returns:
+            trial (bool): Whether the request is the half-open trial, which must be released by
+                          'release_trial()' if it ends without a recorded success or failure.
+        """
+        if self.opened_at is None:
+            return False
+
+        retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+        if retry_in > 0 or self._trial_sent:
+            raise CircuitOpenError(self.endpoint, max(retry_in, 0.0))
+
+        self._trial_sent = True
+        return True
+    # ____________________________________________________________________________ . . .
+
+    def release_trial(self) -> None:
+        """
+        Lets another trial request through, after the trial got canceled or failed without an
+        outcome of the endpoint.
+        """
+        self._trial_sent = False
+    # ____________________________________________________________________________ . . .
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            TPL_logs.info(f'Circuit breaker of "{self.endpoint}" got closed.')
+
+        self.failures, self.opened_at, self._trial_sent = 0, None, False
+    # ____________________________________________________________________________ . . .
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self._trial_sent or (self.opened_at is None and
+                                self.failures >= self.failure_threshold):
+            TPL_logs.warning(f'Circuit breaker of "{self.endpoint}" got opened after '
+                             f'{self.failures} consecutive failures.')
+            self.opened_at, self._trial_sent = time.monotonic(), False
+# ________________________________________________________________________________ . . .
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """
+    Returns the shared circuit breaker of endpoint.
+    """
+    breaker = _breakers.get(endpoint)
+    if breaker is None:
+        breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+
+    return breaker
+# =================================================================================================
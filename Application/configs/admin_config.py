@@ -7,6 +7,10 @@ class Market:
         TRIES=2
         TIMEOUT=3
 
+    class Stats:
+        TRIES=2
+        TIMEOUT=3
+
 
 class Trade:
     class Fetch:
@@ -22,6 +26,7 @@ class Trade:
         class PlaceOrder:
             TRIES=3
             TIMEOUT=2.5
+            DEADLINE=5.0
         class CancelOrders:
             TRIES=3
             TIMEOUT=3.5
@@ -29,6 +34,14 @@ class Trade:
         class ClosePosition:
             TRIES=3
             TIMEOUT=3.5
+            DEADLINE=6.0
+
+        class Dispatch:
+            WORKERS=4
+
+    class Lifecycle:
+        RECONCILE_INTERVAL=5.0
+        UNKNOWN_TIMEOUT=60.0
 
 class Account:
     class Profile:
@@ -41,4 +54,43 @@ class Account:
 
     class Balance:
         TRIES=5
-        TIMEOUT=4.0
\ No newline at end of file
+        TIMEOUT=4.0
+
+
+class Retry:
+    MAX_DELAY=8.0
+    BREAKER_THRESHOLD=5
+    BREAKER_RESET_TIMEOUT=30.0
+
+
+class Hedge:
+    QUANTILE=0.95
+    WINDOW=200
+    MIN_SAMPLES=20
+
+
+class Recovery:
+    CONCURRENCY=8
+    SLA=10.0
+    MONITOR_INTERVAL=10.0
+
+
+class Tracing:
+    RING_SIZE=65536
+    EXPORT_INTERVAL=60.0
+
+
+class SignalValidation:
+    TIMEOUT=1.0
+    CACHE_SIZE=256
+
+
+class MarketInfo:
+    TTL=3600.0
+    TRIES=3
+    TIMEOUT=4.0
+
+
+class PortfolioRisk:
+    MAX_OPEN_RISK=0.06
+    MAX_MARGIN_USAGE=1.0
@@ -0,0 +1,451 @@
+import sys
+import httpx
+import asyncio
+import pandas as pd
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.utils.logs import get_logger                           # noqa: E402
+from Application.data.exchange import Nobitex                           # noqa: E402
+from Application.api import nobitex_api as NB_API                       # noqa: E402
+from Application.utils.event_channels import Event                      # noqa: E402
+import Application.configs.admin_config as Aconfig                      # noqa: E402
+from Application.api.api_service import APIService                      # noqa: E402
+from Application.data.resampler import OHLCVResampler                  # noqa: E402
+from Application.api.rate_limits import endpoint_throttle               # noqa: E402
+from Application.trading import strategy_fields as strategy             # noqa: E402
+from Application.utils.exchange.nobitex import resolution_seconds       # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler     # noqa: E402
+from Application.data.data_tools import df_has_news,\
+                                        Tehran_timestamp,\
+                                        update_dataframe,\
+                                        kline_timestamps,\
+                                        parse_kline_to_df               # noqa: E402
+
+
+bot_logs = get_logger(logger_name='bot_logs')
+
+BASE_RESOLUTION = '1'
+
+
+
+
+# =================================================================================================
+class DataHub:
+    """
+    Keyed data hub that keeps kline stores of many (symbol, resolution) pairs along with order books
+    and market prices of many trading pairs.
+
+    Only the 1-minute klines of each symbol are polled, higher timeframes are bootstrapped once
+    and then built locally by incremental resamplers fed with the new 1-minute candles. Order books and market prices of all pairs
+    are fetched by single batched requests. All requests share the per-endpoint rate limits.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super(DataHub, cls).__new__(cls)
+            cls._instance._initialize_data()
+
+        return cls._instance
+    # ____________________________________________________________________________ . . .
+
+    def __init__(self) -> None:
+        self.jarchi = EventHandler()
+        self.market = NB_API.Market(APIService())
+
+        self.jarchi.register_event(Event.NEW_SYMBOL_KLINE_DATA, ['symbol',
+                                                                 'resolution',
+                                                                 'kline_df'])
+        self.jarchi.register_event(Event.SYMBOL_CANDLE_CLOSED, ['symbol',
+                                                                'resolution',
+                                                                'candle'])
+    # ____________________________________________________________________________ . . .
+
+    def _initialize_data(self) -> None:
+        self.pairs         : dict[str, dict]                       = {}
+        self.resolutions   : dict[str, set[str]]                   = {}
+        self.klines        : dict[tuple[str, str], pd.DataFrame]   = {}
+        self.offsets       : dict[tuple[str, str], int]            = {}
+        self.resamplers    : dict[tuple[str, str], OHLCVResampler] = {}
+        self.market_prices : dict[str, float]                      = {}
+        self.order_books   : dict[str, tuple[pd.DataFrame,
+                                             pd.DataFrame,
+                                             float]]               = {}
+        self.required_candles: int = strategy.COMPUTION_SIZE
+
+        bot_logs.info('"DataHub" has initialized data values.')
+    # ____________________________________________________________________________ . . .
+
+    def subscribe(self, trading_pair: dict, resolutions: list[str]) -> None:
+        """
+        Adds a trading pair along with its required resolutions to the hub.
+
+        Parameters:
+            trading_pair (dict): A dict with 'symbol', 'src_currency' and 'dst_currency' keys.
+            resolutions (list[str]): Required resolutions of the pair (e.g. ['1', '15', '60']).
+        """
+        for resolution in resolutions:
+            resolution_seconds(resolution)
+
+        symbol = trading_pair['symbol']
+        self.pairs[symbol] = trading_pair
+        self.resolutions.setdefault(symbol, set()).update(
+            resolution for resolution in resolutions if resolution != BASE_RESOLUTION
+        )
+
+        bot_logs.info(f'"DataHub" subscribed to "{symbol}" on resolutions {resolutions}.')
+    # ____________________________________________________________________________ . . .
+
+    def subscribe_watched_pairs(self) -> None:
+        """
+        Subscribes to every pair of the 'watched_pairs' field in strategy config file.
+        """
+        for pair in strategy.WATCHED_PAIRS:
+            self.subscribe(trading_pair = {'symbol'       : pair['symbol'],
+                                           'src_currency' : pair['src_currency'],
+                                           'dst_currency' : pair['dst_currency']},
+                           resolutions  = pair.get('timeframes', [BASE_RESOLUTION]))
+    # ____________________________________________________________________________ . . .
+
+    async def start(self) -> None:
+        """
+        Initiates the kline stores of all subscribed pairs and then constantly keeps klines, order
+        books and market prices of them up to date.
+        """
+        try:
+            await self._initiate_klines()
+            self._initiate_resamplers()
+
+            await asyncio.gather(self._live_klines(),
+                                 self._live_order_books(),
+                                 self._live_market_prices())
+        except Exception as err:
+            bot_logs.error(f'Inside "DataHub.start()" method: {err}')
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    async def _fetch_kline(self,
+                           http_agent : httpx.AsyncClient,
+                           symbol     : str,
+                           resolution : str,
+                           end        : int,
+                           *,
+                           countback  : int | None = None,
+                           start      : int | None = None) -> dict:
+        """
+        Sends a single kline request within the shared rate limit of OHLC endpoint and returns the
+        raw kline data.
+        """
+        await endpoint_throttle('OHLC').acquire()
+
+        raw_kline = await self.market.kline(http_agent     = http_agent,
+                                            symbol         = symbol,
+                                            resolution     = resolution,
+                                            end            = end,
+                                            timeout        = Aconfig.Market.OHLC.TIMEOUT,
+                                            tries_interval = Nobitex.Endpoint.OHLC_MI,
+                                            tries          = Aconfig.Market.OHLC.TRIES,
+                                            countback      = countback,
+                                            start          = start)
+
+        return raw_kline if raw_kline.get('t') else {}
+    # ____________________________________________________________________________ . . .
+
+    def _base_store_size(self, symbol: str) -> int:
+        """
+        Returns the size of 1-minute store of symbol, which must be large enough to cover two of
+        the largest derived candles.
+        """
+        largest_period = max((resolution_seconds(resolution)
+                              for resolution in self.resolutions.get(symbol, set())), default=0)
+
+        return max(self.required_candles,
+                   2 * largest_period // resolution_seconds(BASE_RESOLUTION))
+    # ____________________________________________________________________________ . . .
+
+    async def _initiate_kline(self,
+                              http_agent : httpx.AsyncClient,
+                              symbol     : str,
+                              resolution : str,
+                              size       : int) -> None:
+        """
+        Populates the kline store of given symbol and resolution to the desired size.
+        """
+        kline_df = pd.DataFrame()
+        end = Tehran_timestamp()
+
+        while len(kline_df) < size:
+            raw_kline = await self._fetch_kline(http_agent, symbol, resolution, end,
+                                                countback=size - len(kline_df))
+            if not raw_kline:
+                break
+
+            data = parse_kline_to_df(raw_kline)
+            kline_df = data if kline_df.empty else pd.concat([data, kline_df])
+            kline_df = kline_df[~kline_df.index.duplicated(keep='last')]
+
+            if len(data) <= 1:
+                break
+            end = int(raw_kline['t'][0])
+
+        key = (symbol, resolution)
+        self.klines[key] = update_dataframe(pd.DataFrame(), kline_df.sort_index(), size)
+
+        if not kline_df.empty:
+            period = resolution_seconds(resolution)
+            self.offsets[key] = kline_timestamps(kline_df.tail(1))[0] % period
+
+        bot_logs.info(f'"DataHub" initiated "{symbol}" klines of resolution "{resolution}" with '\
+                      f'{len(self.klines[key])} candles.')
+    # ____________________________________________________________________________ . . .
+
+    async def _initiate_klines(self, symbols: list[str] | None = None) -> None:
+        """
+        Populates the kline stores of the given subscribed symbols, all of them by default,
+        concurrently.
+        """
+        async with httpx.AsyncClient() as http_agent:
+            coroutines = []
+            for symbol in self.pairs if symbols is None else symbols:
+                coroutines.append(self._initiate_kline(http_agent, symbol, BASE_RESOLUTION,
+                                                       self._base_store_size(symbol)))
+
+                for resolution in self.resolutions[symbol]:
+                    coroutines.append(self._initiate_kline(http_agent, symbol, resolution,
+                                                           self.required_candles))
+
+            results = await asyncio.gather(*coroutines, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, Exception):
+                bot_logs.error(f'Error while initiating klines in "DataHub": {result}')
+    # ____________________________________________________________________________ . . .
+
+    async def _live_klines(self) -> None:
+        """
+        Constantly updates the 1-minute stores of subscribed symbols in a round-robin manner and
+        derives their higher timeframes from them. Symbols whose store is empty (e.g. after a
+        failed bootstrap) are bootstrapped again, backing off while no store could be populated.
+        """
+        async with httpx.AsyncClient() as http_agent:
+            while True:
+                empty = [symbol for symbol in self.pairs
+                         if self.klines.get((symbol, BASE_RESOLUTION), pd.DataFrame()).empty]
+
+                if empty:
+                    try:
+                        await self._initiate_klines(empty)
+                        self._initiate_resamplers(empty)
+                    except Exception as err:
+                        bot_logs.error(f'Error while bootstrapping klines in "DataHub": {err}')
+
+                if len(empty) == len(self.pairs):
+                    await asyncio.sleep(Nobitex.Endpoint.OHLC_MI)
+                    continue
+
+                for symbol in list(self.pairs):
+                    try:
+                        await self._update_symbol(http_agent, symbol)
+                    except Exception as err:
+                        bot_logs.error(f'Error while updating "{symbol}" klines in "DataHub": {err}')
+    # ____________________________________________________________________________ . . .
+
+    def _initiate_resamplers(self, symbols: list[str] | None = None) -> None:
+        """
+        Creates a resampler for every derived timeframe of the given symbols, all of them by
+        default, and feeds it with the 1-minute store, so it catches up with the candle that is
+        currently open.
+        """
+        for symbol in self.pairs if symbols is None else symbols:
+            base_df = self.klines.get((symbol, BASE_RESOLUTION), pd.DataFrame())
+            base_rows = list(zip(kline_timestamps(base_df), base_df['open'], base_df['high'],
+                                 base_df['low'], base_df['close'], base_df['volume'])) \
+                        if not base_df.empty else []
+
+            for resolution in self.resolutions[symbol]:
+                key = (symbol, resolution)
+                resampler = OHLCVResampler(period = resolution_seconds(resolution),
+                                           offset = self.offsets.get(key, 0))
+
+                # Candles older than the one before the open candle are already in the store
+                latest_open = resampler.bucket_of(base_rows[-1][0]) if base_rows else 0
+                for row in base_rows:
+                    if row[0] >= latest_open - resampler.period:
+                        resampler.update(*row)
+
+                self.resamplers[key] = resampler
+    # ____________________________________________________________________________ . . .
+
+    async def _update_symbol(self, http_agent: httpx.AsyncClient, symbol: str) -> None:
+        """
+        Fetches new 1-minute candles of symbol, updates its stores and emits on the
+        "NEW_SYMBOL_KLINE_DATA" event channel for every changed store and on the
+        "SYMBOL_CANDLE_CLOSED" event channel for every closed higher timeframe candle.
+        """
+        base_key = (symbol, BASE_RESOLUTION)
+        base_df = self.klines.get(base_key, pd.DataFrame())
+        if base_df.empty:
+            return
+
+        raw_kline = await self._fetch_kline(http_agent, symbol, BASE_RESOLUTION, Tehran_timestamp(),
+                                            start=kline_timestamps(base_df.tail(1))[0])
+        if not raw_kline:
+            return
+
+        data = parse_kline_to_df(raw_kline)
+        if not df_has_news(base_df, data):
+            return
+
+        self.klines[base_key] = update_dataframe(origin_df = base_df,
+                                                 late_df   = data,
+                                                 size      = self._base_store_size(symbol))
+
+        events = [(Event.NEW_SYMBOL_KLINE_DATA, {'symbol'     : symbol,
+                                                 'resolution' : BASE_RESOLUTION,
+                                                 'kline_df'   : self.klines[base_key]})]
+
+        rows = list(zip(raw_kline['t'], raw_kline['o'], raw_kline['h'],
+                        raw_kline['l'], raw_kline['c'], raw_kline['v']))
+        for resolution in self.resolutions[symbol]:
+            changed, closed_candles = self._derive_kline(symbol, resolution, rows)
+
+            if changed:
+                events.append((Event.NEW_SYMBOL_KLINE_DATA,
+                               {'symbol'     : symbol,
+                                'resolution' : resolution,
+                                'kline_df'   : self.klines[(symbol, resolution)]}))
+
+            for candle in closed_candles:
+                events.append((Event.SYMBOL_CANDLE_CLOSED,
+                               {'symbol'     : symbol,
+                                'resolution' : resolution,
+                                'candle'     : dict(zip(('time', 'open', 'high', 'low', 'close',
+                                                         'volume'), candle))}))
+
+        await self.jarchi.bulk_emit(*events)
+    # ____________________________________________________________________________ . . .
+
+    def _derive_kline(self,
+                      symbol     : str,
+                      resolution : str,
+                      rows       : list[tuple]) -> tuple[bool, list[tuple]]:
+        """
+        Folds new 1-minute candles into the resampler of given higher timeframe and writes its
+        closed and open candles into the store.
+
+        Parameters:
+            symbol (str): The trading symbol.
+            resolution (str): The higher timeframe to update.
+            rows (list[tuple]): New 1-minute candles as (time, open, high, low, close, volume).
+
+        Returns:
+            changed (bool): Whether the higher timeframe store got new data.
+            closed_candles (list[tuple]): Higher timeframe candles that got closed.
+        """
+        key = (symbol, resolution)
+        resampler = self.resamplers.get(key)
+        if resampler is None:
+            return False, []
+
+        closed_candles = []
+        for row in rows:
+            closed_candles.extend(resampler.update(*row))
+
+        candles = closed_candles + [candle for candle in [resampler.current()] if candle]
+        if not candles:
+            return False, closed_candles
+
+        derived_df = parse_kline_to_df({'t': [candle[0] for candle in candles],
+                                        'o': [candle[1] for candle in candles],
+                                        'h': [candle[2] for candle in candles],
+                                        'l': [candle[3] for candle in candles],
+                                        'c': [candle[4] for candle in candles],
+                                        'v': [candle[5] for candle in candles]})
+        current_df = self.klines.get(key, pd.DataFrame())
+
+        if not df_has_news(current_df, derived_df):
+            return False, closed_candles
+
+        self.klines[key] = update_dataframe(current_df, derived_df, self.required_candles)
+        return True, closed_candles
+    # ____________________________________________________________________________ . . .
+
+    def get_kline_df(self, symbol: str, resolution: str = BASE_RESOLUTION) -> pd.DataFrame:
+        """
+        Returns kline dataframe of given symbol and resolution.
+        """
+        return self.klines.get((symbol, resolution), pd.DataFrame())
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    async def _live_order_books(self) -> None:
+        """
+        Constantly fetches the order books of all subscribed pairs through a single request.
+        """
+        throttle = endpoint_throttle('ORDER_BOOK')
+
+        async with httpx.AsyncClient() as http_agent:
+            while True:
+                if not self.pairs:
+                    await asyncio.sleep(Nobitex.Endpoint.ORDER_BOOK_MI)
+                    continue
+
+                await throttle.acquire()
+                try:
+                    self.order_books.update(
+                        await self.market.fetch_all_order_books(http_agent, set(self.pairs))
+                    )
+                except Exception as err:
+                    bot_logs.error(f'Error while fetching order books in "DataHub": {err}')
+    # ____________________________________________________________________________ . . .
+
+    def get_order_book(self, symbol: str) -> tuple[pd.DataFrame, pd.DataFrame, float] | None:
+        """
+        Returns the order book of symbol in shape of a tuple (asks_df, bids_df, mid_price).
+        """
+        return self.order_books.get(symbol)
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    async def _live_market_prices(self) -> None:
+        """
+        Constantly fetches the market prices of all subscribed pairs through a single request.
+        """
+        throttle = endpoint_throttle('MARKET_STATS')
+
+        async with httpx.AsyncClient() as http_agent:
+            while True:
+                if not self.pairs:
+                    await asyncio.sleep(Nobitex.Endpoint.MARKET_STATS_MI)
+                    continue
+
+                await throttle.acquire()
+                try:
+                    self.market_prices.update(await self.market.fetch_market_prices(
+                        http_agent     = http_agent,
+                        src_currencies = [pair['src_currency'] for pair in self.pairs.values()],
+                        dst_currencies = [pair['dst_currency'] for pair in self.pairs.values()]
+                    ))
+                except Exception as err:
+                    bot_logs.error(f'Error while fetching market prices in "DataHub": {err}')
+    # ____________________________________________________________________________ . . .
+
+    def get_market_price(self, src_currency: str, dst_currency: str) -> float | None:
+        """
+        Returns the latest market price of given trading pair.
+        """
+        return self.market_prices.get(f'{src_currency}-{dst_currency}')
+# =================================================================================================
@@ -4,25 +4,29 @@ import asyncio
 import pandas as pd
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.data.user import User                                                      # noqa: E402
+from Application.utils import tracing                                                       # noqa: E402
 from Application.utils.logs import get_logger                                               # noqa: E402
 from Application.data.exchange import Nobitex                                               # noqa: E402
 from Application.api import nobitex_api as NB_API                                           # noqa: E402
 from Application.utils.event_channels import Event                                          # noqa: E402
 import Application.configs.admin_config as Aconfig                                          # noqa: E402
 from Application.api.api_service import APIService                                          # noqa: E402
+from Application.data.trade_store import TradeStore                                         # noqa: E402
 # from Application.data.validator import is_consistent                                      # noqa: E402
-from Application.data.data_tools import has_signal,\
-                                        df_has_news,\
+from Application.data.data_tools import df_has_news,\
                                         update_dataframe,\
                                         parse_kline_to_df                                   # noqa: E402
 from Application.trading import strategy_fields as strategy                                 # noqa: E402
 from Application.utils.simplified_event_handler import EventHandler                         # noqa: E402
+from Application.trading.portfolio_manager import PortfolioRiskEngine                      # noqa: E402
+from Application.trading.signals.signal_matrix import SignalMatrix                          # noqa: E402
 from Application.trading.signals.signal_generator import generate_signals                   # noqa: E402
 from Application.trading.stop_loss.stop_loss import declare_static_sl_price                 # noqa: E402
+from Application.trading.market.validator import market_verdict                             # noqa: E402
 from Application.trading.analysis.indicator_supervisor import compute_indicators,\
                                                               compute_validation_indicators # noqa: E402
 from Application.trading.position_sizing.position_sizer import compute_position_margin_size # noqa: E402
@@ -52,10 +56,12 @@ class DataProcessor:
 
         self.jarchi.register_event(Event.NEW_KLINE_DATA, ['kline_df'])
         self.jarchi.register_event(Event.NEW_TRADING_SIGNAL, ['setup_name',
+                                                              'signal_time',
                                                               'kline_df',
                                                               'indicator_df'])
         
         self.jarchi.register_event(Event.LATE_TRADING_SIGNAL, ['setup_name',
+                                                              'signal_time',
                                                               'kline_df',
                                                               'indicator_df'])
 
@@ -70,9 +76,9 @@ class DataProcessor:
     def _initialize_data(self) -> None:
         self.kline_df                 : pd.DataFrame        = pd.DataFrame()
         self.signal_df                : pd.DataFrame        = pd.DataFrame()
+        self.signal_matrix            : SignalMatrix | None = None
         self.market_price             : float               = 0.0
         self.indicator_df             : pd.DataFrame        = pd.DataFrame()
-        self.positions_df             : pd.DataFrame        = pd.DataFrame()
         self.next_trade_df            : pd.DataFrame        = pd.DataFrame(columns=['signal_time',
                                                                                     'entry_signal',
                                                                                     'entry',
@@ -235,11 +241,16 @@ class DataProcessor:
                 max_rate       = Nobitex.Endpoint.OHLC_RL,
                 rate_period    = Nobitex.Endpoint.OHLC_RP
             ):
-                data = parse_kline_to_df(data)
-                if not data.equals(self.kline_df) and df_has_news(self.kline_df, data):
-                    self.kline_df = update_dataframe(origin_df=self.kline_df,
-                                                     late_df=data,
-                                                     size=strategy.COMPUTION_SIZE)
+                tracing.start_tick()
+                with tracing.span('kline_parse'):
+                    data = parse_kline_to_df(data)
+                    has_news = not data.equals(self.kline_df) and df_has_news(self.kline_df, data)
+
+                if has_news:
+                    with tracing.span('kline_update'):
+                        self.kline_df = update_dataframe(origin_df=self.kline_df,
+                                                         late_df=data,
+                                                         size=strategy.COMPUTION_SIZE)
                     
                     # if is_consistent(self.kline_df, config.MarketData.OHLC.RESOLUTION):
                     func_name=self._live_kline.__qualname__
@@ -248,7 +259,7 @@ class DataProcessor:
                     await self.jarchi.emit(Event.NEW_KLINE_DATA,
                                      kline_df=self.kline_df)
 
-                    print(self.kline_df)
+                    bot_logs.debug('kline_df:\n%s', self.kline_df.tail())
         except Exception as err:
             bot_logs.error(f'Error during live kline fetching: {err}')
     # ____________________________________________________________________________ . . .
@@ -302,6 +313,7 @@ class DataProcessor:
         async for data in self.account.live_fetch_portfolio_balance():
             if data != self.portfolio_balance:
                 self.portfolio_balance = data
+                PortfolioRiskEngine().set_balance(data)
     # ____________________________________________________________________________ . . .
 
     def get_portfolio_balance(self) -> tuple[float, float]:
@@ -356,7 +368,7 @@ class DataProcessor:
             bot_logs.info(f'Broadcasting "{Event.NEW_INDICATORS_DATA}" event from '\
                          '"DataProcessor.computing_indicators()" method.')
             
-            print(self.indicator_df)
+            bot_logs.debug('indicator_df:\n%s', self.indicator_df.tail())
             await self.jarchi.emit(Event.NEW_INDICATORS_DATA,
                                    kline_df     = self.kline_df,
                                    indicator_df = self.indicator_df)
@@ -385,6 +397,10 @@ class DataProcessor:
             validation_setups (list): List of market validation setups is goinf to be used to extract indicator functions from.
         """
         try:
+            # Verdicts hold until the candle closes, there is nothing to validate again
+            if market_verdict(self.kline_df) is not None:
+                return
+
             self.validation_indicators_df = await compute_validation_indicators(
                 validation_system = strategy.MARKET_VALIDATION_SYSTEM,
                 kline_df          = self.kline_df
@@ -415,35 +431,35 @@ class DataProcessor:
 
     async def generating_signals(self):
         """
-        Calls trading signal generator function from SignalChief and emits on "NEW_TRADING_SIGNAL"
-        event channel.
+        Calls trading signal generator function from SignalChief and emits the new and late signals
+        of all setups on "NEW_TRADING_SIGNAL" and "LATE_TRADING_SIGNAL" event channels at once.
 
         Parameters:
         """
         try:
-            self.signal_df = await generate_signals(trading_system = strategy.ENTRY_SYSTEM,
-                                                    kline_df       = self.kline_df,
-                                                    indicators_df  = self.indicator_df)
-            
-            for column in self.signal_df:
-                if has_signal(self.signal_df, column) == 'new_signal':
-                    bot_logs.info(f'Broadcasting "{Event.NEW_TRADING_SIGNAL}" event from'\
-                                '"DataProcessor.generating_signals()" method.')
-                    
-                    await self.jarchi.emit(Event.NEW_TRADING_SIGNAL,
-                                           kline_df      = self.kline_df,
-                                           indicator_df  = self.indicator_df,
-                                           setup_name    = column)
-
-                elif has_signal(self.signal_df, column) == 'late_signal':
-                    bot_logs.info(f'Broadcasting "{Event.LATE_TRADING_SIGNAL}" event from'\
-                                '"DataProcessor.generating_signals()" method.')
-                    
-                    await self.jarchi.emit(Event.LATE_TRADING_SIGNAL,
-                                           kline_df      = self.kline_df,
-                                           indicator_df  = self.indicator_df,
-                                           setup_name    = column)
-                
+            self.signal_matrix = await generate_signals(trading_system = strategy.ENTRY_SYSTEM,
+                                                        kline_df       = self.kline_df,
+                                                        indicators_df  = self.indicator_df)
+            self.signal_df = self.signal_matrix.frame()
+
+            new_signals, late_signals = self.signal_matrix.latest()
+            signals = ((Event.NEW_TRADING_SIGNAL, new_signals, -1),
+                       (Event.LATE_TRADING_SIGNAL, late_signals, -2))
+
+            events = [(event, {'kline_df'     : self.kline_df,
+                               'indicator_df' : self.indicator_df,
+                               'setup_name'   : setup_name,
+                               'signal_time'  : self.signal_matrix.index[position]})
+                      for event, setup_names, position in signals
+                      for setup_name in setup_names]
+
+            if events:
+                bot_logs.info(f'Broadcasting {len(new_signals)} "{Event.NEW_TRADING_SIGNAL}" and '\
+                              f'{len(late_signals)} "{Event.LATE_TRADING_SIGNAL}" events from '\
+                              '"DataProcessor.generating_signals()" method.')
+
+                await self.jarchi.bulk_emit(*events)
+
 
         except Exception as err:
             bot_logs.error('Inside "DataProcessor.generating_signals()" method of DataProcessor: ',
@@ -494,6 +510,14 @@ class DataProcessor:
         return self.next_trade_df
     # ____________________________________________________________________________ . . .
 
+    @property
+    def positions_df(self) -> pd.DataFrame:
+        """
+        Returns the open positions of the 'TradeStore', which is kept in sync by the orders engine.
+        """
+        return TradeStore().positions_df()
+    # ____________________________________________________________________________ . . .
+
 
 
 
@@ -504,42 +528,27 @@ class DataProcessor:
         """
         bot_logs.info('Initiating "positions_df" ...')
 
-        self.positions_df = await anext(self.trade.fetch_open_positions(
-            client       = httpx.AsyncClient(),
-            token        = User.TOKEN,    # type: ignore
-            req_interval = Nobitex.Endpoint.POSITIONS_MI,
-            max_rate     = Nobitex.Endpoint.POSITIONS_RL,
-            rate_period  = Nobitex.Endpoint.POSITIONS_RP
-        ))
+        trade_store = TradeStore()
+        async with httpx.AsyncClient() as http_agent:
+            await trade_store.sync_positions(http_agent)
+            await trade_store.sync_orders(http_agent)
+
+        positions_df = self.positions_df
 
         # broadcast OPEN_POSITIONS_EXIST event in case there are any open positions
-        if not self.positions_df.empty:
+        if not positions_df.empty:
             bot_logs.info(f'Broadcasting "{Event.OPEN_POSITIONS_EXIST}" event from '\
                          '"DataProcessor._initiate_positions()" method.')
             
-            await self.jarchi.emit(event=Event.OPEN_POSITIONS_EXIST, positions_df=self.positions_df)
+            await self.jarchi.emit(event=Event.OPEN_POSITIONS_EXIST, positions_df=positions_df)
     # ____________________________________________________________________________ . . .
 
     async def _live_positions(self):
         """
-        Constantly updates positions dataframe with new data.
+        Constantly keeps orders and positions in sync through the 'TradeStore', which broadcasts
+        fine-grained order and position events for every change.
         """
-        async for new_positions in self.trade.fetch_open_positions(
-            client       = httpx.AsyncClient(),
-            token        = User.TOKEN,    # type: ignore
-            req_interval = Nobitex.Endpoint.POSITIONS_MI,
-            max_rate     = Nobitex.Endpoint.POSITIONS_RL,
-            rate_period  = Nobitex.Endpoint.POSITIONS_RP
-        ):
-            if not new_positions.equals(self.positions_df) and df_has_news(
-                self.positions_df, new_positions
-            ):
-                self.positions_df = new_positions
-
-                bot_logs.info(f'Broadcasting "{Event.OPEN_POSITIONS_EXIST}" event from'\
-                             '"DataProcessor._live_positions()" method.')
-
-                await self.jarchi.emit(Event.OPEN_POSITIONS_EXIST, positions_df=self.positions_df)
+        await TradeStore().live()
 # =================================================================================================
 
 
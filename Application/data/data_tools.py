@@ -2,15 +2,16 @@ import sys
 import pytz
 import importlib
 import pandas as pd
-from typing import Any
+from typing import Any, Mapping
 from datetime import datetime
 from dotenv import dotenv_values
 from persiantools.jdatetime import JalaliDateTime    # type: ignore
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.utils.load_json import load                        # noqa: E402
+from Application.utils.load_json import load, load_cached           # noqa: E402
 from Application.utils.logs import get_logger                       # noqa: E402
 from Application.utils.simplified_event_handler import EventHandler # noqa: E402
 
@@ -42,19 +43,27 @@ def has_signal(signals_df: pd.DataFrame, column) -> str | None:
 # ________________________________________________________________________________ . . .
 
 
-def extract_field_value(field : str, config_path: str | None = None) -> Any:
+def extract_field_value(field       : str,
+                        config_path : str | None = None,
+                        config      : Mapping | None = None) -> Any:
     """
     Extracts the value of a strategy field.
 
+    Parameters:
+        field (str): Name of the field.
+        config_path (str): Path of the config file, defaults to 'strategy.json'.
+        config (Mapping): A pre-loaded config to extract the field from instead of the file.
+
     Raises:
         ValueError:
-    
+
     Returns:
         extracted_value (Any):
     """
-    path = config_path if config_path else r'Application/configs/strategy.json'
+    if config is None:
+        config = load_cached(config_path if config_path else r'Application/configs/strategy.json')
 
-    value = load(path).get(field, None)
+    value = config.get(field, None)
 
     if not value:
         raise ValueError(f"Can not find value of '{field}' field 'strategy.json' config file, "\
@@ -66,7 +75,7 @@ def extract_field_value(field : str, config_path: str | None = None) -> Any:
 
 def extract_non_singular_strategy_setup(
         setup_name                      : str,
-        config                          : dict,
+        config                          : Mapping,
         setup_functions_module_path     : str,
         indicator_functions_module_path : str | None = None,
         validator_functions_module_path : str | None = None
@@ -77,7 +86,7 @@ def extract_non_singular_strategy_setup(
 
     Parameters:
         setup_name (str): The field in the strategy config from which to extract objects.
-        config (dict): The pre-loaded json configuration dictionary.
+        config (Mapping): The pre-loaded json configuration dictionary.
         chief_module_path (str): Path to the module where the setup functions are defined.
         indicators_module_path (str): Path to the module where the indicator functions are defined.
 
@@ -136,14 +145,14 @@ def extract_non_singular_strategy_setup(
 
 
 def extract_singular_strategy_setup(setup_name            : str,
-                                    config                : dict,
+                                    config                : Mapping,
                                     setup_functions_module_path : str):
     """
     Extracts function, and properties of a sigular strategy setup.
 
     Parameters:
         setup_name (str): The field name in the strategy.json config file from which to extract objects.
-        config (dict): The pre-loaded json configuration dictionary.
+        config (Mapping): The pre-loaded json configuration dictionary.
         setup_functions_module_path (str): Path to the module where the setup functions are defined.
 
     Returns:
@@ -188,6 +197,49 @@ def parse_kline_to_df(raw_kline: dict) -> pd.DataFrame:
 # ________________________________________________________________________________ . . .
 
 
+def kline_timestamps(kline_df: pd.DataFrame) -> list[int]:
+    """
+    Returns the integer timestamps of kline DataFrame's JalaliDateTime index.
+    """
+    return [int(JalaliDateTime.to_gregorian(jdatetime).timestamp()) for jdatetime in kline_df.index]
+# ________________________________________________________________________________ . . .
+
+
+def resample_kline(kline_df: pd.DataFrame, period: int, offset: int = 0) -> pd.DataFrame:
+    """
+    Aggregates kline data into candles of a higher timeframe.
+
+    Parameters:
+        kline_df (DataFrame): Kline DataFrame of the lower timeframe.
+        period (int): Length of higher timeframe candles in seconds.
+        offset (int): Offset of higher timeframe candle opens from epoch, in seconds.
+
+    Returns:
+        resampled_df (DataFrame): Kline DataFrame of the higher timeframe.
+    """
+    if kline_df.empty:
+        return kline_df
+
+    tz = pytz.timezone('Asia/Tehran')
+
+    buckets = [timestamp - ((timestamp - offset) % period)
+               for timestamp in kline_timestamps(kline_df)]
+
+    resampled_df = kline_df.reset_index(drop=True).groupby(buckets, sort=True).agg(
+        open   = ('open', 'first'),
+        high   = ('high', 'max'),
+        low    = ('low', 'min'),
+        close  = ('close', 'last'),
+        volume = ('volume', 'sum')
+    )
+
+    resampled_df.index = pd.Index([JalaliDateTime.fromtimestamp(timestamp, tz)
+                                   for timestamp in resampled_df.index], name='time')
+
+    return resampled_df
+# ________________________________________________________________________________ . . .
+
+
 def parse_order_book(raw_order_book: dict) -> tuple[pd.DataFrame, pd.DataFrame, float]:
     """
     Converts raw order book data received from exchange API into pandas DataFrame shape.
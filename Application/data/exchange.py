@@ -1,10 +1,11 @@
 import sys
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.utils.load_json import load    # noqa: E402
+from Application.utils.load_json import load_cached    # noqa: E402
 
 # __all__ = ["API_KEY", "CURRENT_TIME", "BASE_URL", "TESTNET"]
 
@@ -14,7 +15,7 @@ from Application.utils.load_json import load    # noqa: E402
 # =================================================================================================
 class Nobitex:
     URL = 'https://testnetapi.nobitex.ir' \
-          if load(r'Application/configs/config.json')['setting'] == "TEST" \
+          if load_cached(r'Application/configs/config.json')['setting'] == "TEST" \
           else 'https://api.nobitex.ir'
 
     class Endpoint:
@@ -43,6 +44,11 @@ class Nobitex:
         ORDER_BOOK_RL: int = 300
         ORDER_BOOK_RP: int = 60
 
+        OPTIONS: str = '/v2/options'
+        OPTIONS_MI: float = 2.0
+        OPTIONS_RL: int = 30
+        OPTIONS_RP: int = 60
+
         POSITIONS: str = '/positions/list'
         POSITIONS_MI: float = 2.0
         POSITIONS_RL: int = 30
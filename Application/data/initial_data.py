@@ -1,8 +1,9 @@
 import sys
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application.data.data_tools import extract_field_value # noqa: E402
 
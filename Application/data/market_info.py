@@ -0,0 +1,252 @@
+import sys
+import time
+import httpx
+import asyncio
+import functools
+from typing import Any, NamedTuple
+from decimal import Decimal, ROUND_FLOOR, ROUND_HALF_UP
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.utils.logs import get_logger                   # noqa: E402
+import Application.configs.admin_config as aconfig              # noqa: E402
+from Application.data.exchange import Nobitex as nb             # noqa: E402
+from Application.api.api_service import APIService              # noqa: E402
+from Application.api.rate_limits import endpoint_throttle       # noqa: E402
+
+
+bot_logs = get_logger(logger_name='bot_logs')
+
+# Currency codes of the 'minOrders' field of the options, next to their names
+_CURRENCY_CODES = {'2': 'rls', '13': 'usdt'}
+_SYMBOL_QUOTES = (('USDT', 'usdt'), ('IRT', 'rls'), ('RLS', 'rls'))
+# Order prices per unit of the price table prices, Rial markets take Toman order prices
+_PRICE_SCALES = {'rls': 0.1}
+
+
+
+
+# =================================================================================================
+class PairInfo(NamedTuple):
+    """
+    Trading rules of a market.
+
+    Attributes:
+        min_notional (float): Minimum value of an order in the destination currency.
+        max_notional (float): Maximum value of an order in the destination currency.
+        amount_step (float): Step of the order amounts (lot size), 0 if unknown.
+        price_step (float): Step of the order prices (tick size), 0 if unknown.
+        price_scale (float): Order prices per unit of the prices of the price table.
+    """
+    min_notional : float = 0.0
+    max_notional : float = float('inf')
+    amount_step  : float = 0.0
+    price_step   : float = 0.0
+    price_scale  : float = 1.0
+# ________________________________________________________________________________ . . .
+
+
+def _quote_currency(symbol: str) -> str:
+    for suffix, currency in _SYMBOL_QUOTES:
+        if symbol.upper().endswith(suffix):
+            return currency
+    return ''
+# ________________________________________________________________________________ . . .
+
+
+def parse_market_options(raw_options: dict) -> dict[str, PairInfo]:
+    """
+    Extracts the trading rules of every market from the response of the options endpoint.
+
+    Parameters:
+        raw_options (dict): Response of '/v2/options'.
+
+    Returns:
+        pairs (dict): PairInfo of the markets keyed by symbol (e.g. 'BTCUSDT').
+    """
+    options = raw_options.get('nobitex', {})
+
+    min_orders = {_CURRENCY_CODES.get(str(currency), str(currency).lower()): float(value)
+                  for currency, value in options.get('minOrders', {}).items()}
+    max_orders = {_CURRENCY_CODES.get(str(currency), str(currency).lower()): float(value)
+                  for currency, value in options.get('maxOrders', {}).items()}
+
+    amount_steps = options.get('amountPrecisions', {})
+    price_steps = options.get('pricePrecisions', {})
+
+    pairs = {}
+    for symbol in amount_steps.keys() | price_steps.keys():
+        quote = _quote_currency(symbol)
+        pairs[symbol.upper()] = PairInfo(min_notional = min_orders.get(quote, 0.0),
+                                         max_notional = max_orders.get(quote, float('inf')),
+                                         amount_step  = float(amount_steps.get(symbol, 0.0)),
+                                         price_step   = float(price_steps.get(symbol, 0.0)),
+                                         price_scale  = _PRICE_SCALES.get(quote, 1.0))
+    return pairs
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+_cache: dict[str, Any] = {'pairs': {}, 'expires': 0.0, 'lock': None}
+
+
+async def _request_options(http_agent: httpx.AsyncClient) -> dict:
+    response = await APIService().get(client         = http_agent,
+                                      url            = nb.URL,
+                                      endpoint       = nb.Endpoint.OPTIONS,
+                                      timeout        = aconfig.MarketInfo.TIMEOUT,
+                                      tries_interval = nb.Endpoint.OPTIONS_MI,
+                                      tries          = aconfig.MarketInfo.TRIES)
+    return response.json()
+# ________________________________________________________________________________ . . .
+
+
+async def fetch_market_info(http_agent : httpx.AsyncClient | None = None,
+                            force      : bool = False) -> dict[str, PairInfo]:
+    """
+    Returns the trading rules of all markets, fetched from the exchange options at most once per
+    'MarketInfo.TTL' seconds, concurrent callers share the same request.
+
+    Parameters:
+        http_agent (AsyncClient): The HTTP agent which is used to make the request call.
+        force (bool): Fetch again even if the cached rules did not expire.
+
+    Returns:
+        pairs (dict): PairInfo of the markets keyed by symbol.
+    """
+    if not force and time.time() < _cache['expires']:
+        return _cache['pairs']
+
+    if _cache['lock'] is None:
+        _cache['lock'] = asyncio.Lock()
+
+    async with _cache['lock']:
+        if not force and time.time() < _cache['expires']:
+            return _cache['pairs']
+
+        await endpoint_throttle('OPTIONS').acquire()
+        if http_agent is None:
+            async with httpx.AsyncClient() as client:
+                raw_options = await _request_options(client)
+        else:
+            raw_options = await _request_options(http_agent)
+
+        _cache.update(pairs=parse_market_options(raw_options),
+                      expires=time.time() + aconfig.MarketInfo.TTL)
+        bot_logs.info(f'Trading rules of {len(_cache["pairs"])} markets got fetched.')
+
+    return _cache['pairs']
+# ________________________________________________________________________________ . . .
+
+
+def pair_symbol(src_currency: str, dst_currency: str) -> str:
+    """
+    Returns the symbol of the market (e.g. 'BTCIRT' for 'btc' and 'rls').
+    """
+    return src_currency.upper() + ('IRT' if dst_currency.lower() == 'rls' else dst_currency.upper())
+# ________________________________________________________________________________ . . .
+
+
+def pair_info(symbol: str) -> PairInfo:
+    """
+    Returns the cached trading rules of the market, without any limit if they are unknown.
+    """
+    pair = _cache['pairs'].get(symbol.upper())
+    if pair is None:
+        return PairInfo(price_scale=_PRICE_SCALES.get(_quote_currency(symbol), 1.0))
+    return pair
+# ________________________________________________________________________________ . . .
+
+
+async def fetch_pair_info(symbol: str, http_agent: httpx.AsyncClient | None = None) -> PairInfo:
+    """
+    Returns the trading rules of the market, fetching them first if the cache expired. When the
+    exchange is not reachable the last known rules are returned.
+    """
+    try:
+        await fetch_market_info(http_agent)
+    except Exception as err:
+        bot_logs.error(f'Inside "market_info.fetch_pair_info()": {err}')
+
+    return pair_info(symbol)
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+@functools.cache
+def _decimal(value: float) -> Decimal:
+    return Decimal(repr(value))
+# ________________________________________________________________________________ . . .
+
+
+def _snap(value: float | str | Decimal, step: float, rounding: str) -> Decimal:
+    number = Decimal(str(value))
+    if step <= 0:
+        return number
+
+    step_decimal = _decimal(step)
+    return (number / step_decimal).to_integral_value(rounding) * step_decimal
+# ________________________________________________________________________________ . . .
+
+
+def _plain(number: Decimal) -> str:
+    return format(number.normalize(), 'f')
+# ________________________________________________________________________________ . . .
+
+
+def normalize_amount(amount: float | str, pair: PairInfo) -> str:
+    """
+    Rounds an order amount down to the lot size of the market, as the request field string.
+    """
+    return _plain(_snap(amount, pair.amount_step, ROUND_FLOOR))
+# ________________________________________________________________________________ . . .
+
+
+def normalize_price(price: float | str | Decimal, pair: PairInfo) -> str:
+    """
+    Rounds an order price to the nearest tick of the market, as the request field string.
+    """
+    return _plain(_snap(price, pair.price_step, ROUND_HALF_UP))
+# ________________________________________________________________________________ . . .
+
+
+def order_price(table_price: float | str, pair: PairInfo) -> str:
+    """
+    Converts a price of the price table (e.g. 'DataHub.market_prices') to an order price of the
+    market, scaled and rounded to its tick.
+    """
+    return normalize_price(Decimal(str(table_price)) * _decimal(pair.price_scale), pair)
+# ________________________________________________________________________________ . . .
+
+
+def check_order(amount: str, price: float | str | None, pair: PairInfo) -> None:
+    """
+    Checks a normalized order against the trading rules of the market, so that orders which the
+    exchange would reject are never sent.
+
+    Parameters:
+        amount (str): Normalized order amount.
+        price (float | str | None): Order price, the notional is not checked without it.
+        pair (PairInfo): Trading rules of the market.
+
+    Raises:
+        ValueError: If the amount is below the lot size or the notional is out of the bounds.
+    """
+    if Decimal(amount) <= 0:
+        raise ValueError(f'Order amount "{amount}" is below the lot size "{pair.amount_step}".')
+
+    if price is None:
+        return
+
+    notional = float(amount) * float(price) / pair.price_scale
+    if not pair.min_notional <= notional <= pair.max_notional:
+        raise ValueError(f'Order notional "{notional}" is out of the market bounds '
+                         f'[{pair.min_notional}, {pair.max_notional}].')
+# =================================================================================================
@@ -0,0 +1,149 @@
+"""
+This module contains the incremental OHLCV resampler which builds higher timeframe candles out of
+1-minute candles without requesting them from exchange.
+"""
+Candle = tuple[int, float, float, float, float, float]    # (time, open, high, low, close, volume)
+
+
+
+
+# =================================================================================================
+class OHLCVResampler:
+    """
+    Keeps running aggregates of the open higher timeframe candle and folds lower timeframe candles
+    into it one by one.
+
+    The latest lower timeframe candle is kept apart from the aggregate, since the exchange keeps
+    revising it until it gets closed. A candle is only reported when it has been built from its
+    very first lower timeframe candle, so partially seen candles never leak out.
+    """
+    __slots__ = ('period', 'offset', 'bucket', 'primed', '_has_aggregate', '_open', '_high', '_low',
+                 '_volume', '_last')
+
+    def __init__(self, period: int, offset: int = 0):
+        """
+        Parameters:
+            period (int): Length of higher timeframe candles in seconds.
+            offset (int): Offset of higher timeframe candle opens from epoch, in seconds.
+        """
+        if period <= 0:
+            raise ValueError('Period must be positive')
+
+        self.period : int        = period
+        self.offset : int        = offset % period
+        self.bucket : int | None = None
+        self.primed : bool       = False
+
+        self._has_aggregate : bool          = False
+        self._open          : float         = 0.0
+        self._high          : float         = 0.0
+        self._low           : float         = 0.0
+        self._volume        : float         = 0.0
+        self._last          : Candle | None = None
+    # ____________________________________________________________________________ . . .
+
+
+    def bucket_of(self, timestamp: int) -> int:
+        """
+        Returns the open time of the higher timeframe candle that contains the timestamp.
+        """
+        return timestamp - ((timestamp - self.offset) % self.period)
+    # ____________________________________________________________________________ . . .
+
+
+    def update(self,
+               timestamp : int,
+               open      : float,
+               high      : float,
+               low       : float,
+               close     : float,
+               volume    : float) -> list[Candle]:
+        """
+        Folds a lower timeframe candle into the running aggregates.
+
+        Parameters:
+            timestamp (int): Open time of the lower timeframe candle.
+            open, high, low, close, volume (float): Values of the lower timeframe candle.
+
+        Returns:
+            closed_candles (list[Candle]): Higher timeframe candles that got closed by this candle.
+        """
+        candle: Candle = (int(timestamp), float(open), float(high), float(low), float(close),
+                          float(volume))
+        closed_candles: list[Candle] = []
+
+        if self._last is None:
+            self.bucket = self.bucket_of(candle[0])
+            self.primed = candle[0] == self.bucket
+            self._last = candle
+            return closed_candles
+
+        # A revision of an already folded candle can not be applied, so it is ignored
+        if candle[0] < self._last[0]:
+            return closed_candles
+
+        # A revision of the latest candle replaces it
+        if candle[0] == self._last[0]:
+            self._last = candle
+            return closed_candles
+
+        bucket = self.bucket_of(candle[0])
+        if bucket != self.bucket:
+            if self.primed:
+                closed_candles.append(self._aggregate())
+
+            self.bucket = bucket
+            self.primed = True
+            self._has_aggregate = False
+        else:
+            self._fold_last()
+
+        self._last = candle
+        return closed_candles
+    # ____________________________________________________________________________ . . .
+
+
+    def current(self) -> Candle | None:
+        """
+        Returns the open (not yet closed) higher timeframe candle, or None if it is not completely
+        seen yet.
+        """
+        if self._last is None or not self.primed:
+            return None
+
+        return self._aggregate()
+    # ____________________________________________________________________________ . . .
+
+
+    def _fold_last(self) -> None:
+        """
+        Moves the latest lower timeframe candle into the running aggregates.
+        """
+        _, open, high, low, _, volume = self._last    # type: ignore
+
+        if self._has_aggregate:
+            self._high = max(self._high, high)
+            self._low = min(self._low, low)
+            self._volume += volume
+        else:
+            self._open, self._high, self._low, self._volume = open, high, low, volume
+            self._has_aggregate = True
+    # ____________________________________________________________________________ . . .
+
+
+    def _aggregate(self) -> Candle:
+        """
+        Combines the running aggregates with the latest lower timeframe candle.
+        """
+        _, open, high, low, close, volume = self._last    # type: ignore
+
+        if not self._has_aggregate:
+            return (self.bucket, open, high, low, close, volume)    # type: ignore
+
+        return (self.bucket,                                        # type: ignore
+                self._open,
+                max(self._high, high),
+                min(self._low, low),
+                close,
+                self._volume + volume)
+# =================================================================================================
@@ -0,0 +1,308 @@
+import sys
+import httpx
+import asyncio
+import pandas as pd
+from typing import Awaitable, Callable, Iterable
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.utils.logs import get_logger                           # noqa: E402
+from Application.data.user import User                                  # noqa: E402
+from Application.api import nobitex_api as NB_API                       # noqa: E402
+from Application.utils.event_channels import Event                      # noqa: E402
+from Application.api.api_service import APIService                      # noqa: E402
+from Application.data.data_tools import parse_positions                 # noqa: E402
+from Application.api.rate_limits import endpoint_throttle               # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler     # noqa: E402
+
+
+bot_logs = get_logger(logger_name='bot_logs')
+
+FINAL_ORDER_STATUSES = frozenset({'Done', 'Canceled'})
+
+
+
+
+# =================================================================================================
+def _amount(order: dict, field: str) -> float:
+    return float(order.get(field) or 0)
+# ________________________________________________________________________________ . . .
+
+
+def order_change(old: dict | None, new: dict) -> str | None:
+    """
+    Returns the event describing how an order changed between two snapshots of it, if any.
+    """
+    status = new.get('status')
+    if status == 'Canceled':
+        return Event.ORDER_CANCELED if old is None or old.get('status') != 'Canceled' else None
+
+    matched = _amount(new, 'matchedAmount')
+    if matched <= (_amount(old, 'matchedAmount') if old else 0):
+        return None
+
+    if status == 'Done' or _amount(new, 'unmatchedAmount') <= 0:
+        return Event.ORDER_FILLED
+
+    return Event.ORDER_PARTIALLY_FILLED
+# ________________________________________________________________________________ . . .
+
+
+async def fetch_all_pages(http_agent    : httpx.AsyncClient,
+                          token         : str,
+                          endpoint_name : str,
+                          key           : str,
+                          fetch_page    : Callable[..., Awaitable[dict]],
+                          **params) -> list[dict]:
+    """
+    Fetches every page of a paginated trade endpoint under its shared rate limits.
+
+    Parameters:
+        http_agent (AsyncClient): The HTTP client used to make the requests.
+        token (str): User's API token.
+        endpoint_name (str): Name of endpoint's shared throttle (e.g. 'ORDERS').
+        key (str): Key of the records in responses (e.g. 'orders').
+        fetch_page (Callable): Fetcher of a single page, like 'Trade.fetch_orders_page()'.
+        params: Other parameters of 'fetch_page'.
+
+    Returns:
+        records (list[dict]): Records of all pages.
+    """
+    throttle = endpoint_throttle(endpoint_name)
+    records: list[dict] = []
+    page, has_next = 1, True
+
+    while has_next:
+        await throttle.acquire()
+        data = await fetch_page(http_agent, token, page=page, **params)
+        records.extend(data.get(key, []))
+        has_next = data.get('hasNext', False)
+        page += 1
+
+    return records
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+class TradeStore:
+    """
+    Local store of user's orders and open positions keyed by their exchange ids.
+
+    Instead of re-downloading the whole history on each poll, orders are synced from the oldest
+    order which is still open (or after the newest known one), and only the active positions are
+    fetched. Snapshots are applied as deltas, and changes are broadcast as fine-grained events
+    (filled, partially filled, canceled, position opened and closed).
+    """
+    _instance = None
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super(TradeStore, cls).__new__(cls)
+            cls._instance._initialize_data()
+
+        return cls._instance
+    # ____________________________________________________________________________ . . .
+
+    def __init__(self) -> None:
+        self.jarchi = EventHandler()
+        self.trade = NB_API.Trade(APIService())
+
+        for event in (Event.ORDER_FILLED, Event.ORDER_CANCELED, Event.ORDER_PARTIALLY_FILLED):
+            self.jarchi.register_event(event, ['order'])
+        for event in (Event.POSITION_OPENED, Event.POSITION_CLOSED):
+            self.jarchi.register_event(event, ['position'])
+    # ____________________________________________________________________________ . . .
+
+    def _initialize_data(self) -> None:
+        self.orders           : dict[str, dict] = {}
+        self.positions        : dict[str, dict] = {}
+        self.client_ids       : dict[str, str]  = {}
+        self.open_order_ids   : set[str]        = set()
+        self.newest_order_id  : int | None      = None
+        self.seed_order_id    : int             = 0
+        self.orders_synced    : bool            = False
+        self.positions_synced : bool            = False
+
+        bot_logs.info('"TradeStore" has initialized data values.')
+    # ____________________________________________________________________________ . . .
+
+    def order(self, order_id: str | int) -> dict | None:
+        return self.orders.get(str(order_id))
+    # ____________________________________________________________________________ . . .
+
+    def order_by_client_id(self, client_oid: str) -> dict | None:
+        order_id = self.client_ids.get(client_oid)
+        return self.orders.get(order_id) if order_id else None
+    # ____________________________________________________________________________ . . .
+
+    def position(self, position_id: str | int) -> dict | None:
+        return self.positions.get(str(position_id))
+    # ____________________________________________________________________________ . . .
+
+    def open_orders(self) -> list[dict]:
+        return [self.orders[order_id] for order_id in self.open_order_ids]
+    # ____________________________________________________________________________ . . .
+
+    def positions_df(self) -> pd.DataFrame:
+        """
+        Returns the open positions in the shape that 'parse_positions()' returns them.
+        """
+        return parse_positions({'positions': list(self.positions.values())})
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    def apply_orders(self, raw_orders: Iterable[dict]) -> list[tuple[str, dict]]:
+        """
+        Applies fetched orders to the store.
+
+        Returns:
+            changes (list[tuple[str, dict]]): Pairs of (event, order) for the changed orders.
+        """
+        changes: list[tuple[str, dict]] = []
+
+        for raw_order in raw_orders:
+            order_id = str(raw_order['id'])
+            change = order_change(self.orders.get(order_id), raw_order)
+
+            self.orders[order_id] = raw_order
+            if raw_order.get('clientOrderId'):
+                self.client_ids[raw_order['clientOrderId']] = order_id
+
+            if raw_order.get('status') in FINAL_ORDER_STATUSES:
+                self.open_order_ids.discard(order_id)
+            else:
+                self.open_order_ids.add(order_id)
+
+            if self.newest_order_id is None or int(order_id) > self.newest_order_id:
+                self.newest_order_id = int(order_id)
+
+            if change:
+                changes.append((change, raw_order))
+
+        return changes
+    # ____________________________________________________________________________ . . .
+
+    def apply_positions(self, raw_positions: Iterable[dict]) -> list[tuple[str, dict]]:
+        """
+        Applies a complete snapshot of active positions to the store, positions missing from the
+        snapshot are considered closed.
+
+        Returns:
+            changes (list[tuple[str, dict]]): Pairs of (event, position) for opened and closed
+                                              positions.
+        """
+        changes: list[tuple[str, dict]] = []
+        active: dict[str, dict] = {str(position['id']): position for position in raw_positions}
+
+        for position_id in self.positions.keys() - active.keys():
+            changes.append((Event.POSITION_CLOSED, self.positions.pop(position_id)))
+
+        for position_id, position in active.items():
+            if position_id not in self.positions:
+                changes.append((Event.POSITION_OPENED, position))
+            self.positions[position_id] = position
+
+        return changes
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    async def sync_orders(self, http_agent: httpx.AsyncClient) -> list[tuple[str, dict]]:
+        """
+        Fetches the orders changed since the last sync and applies them. The first sync only
+        seeds the store and broadcasts nothing, see 'seed_orders()'.
+        """
+        if not self.orders_synced:
+            await self.seed_orders(http_agent)
+            return []
+
+        from_id: int | None
+        if self.open_order_ids:
+            status, from_id = 'all', min(int(order_id) for order_id in self.open_order_ids)
+        else:
+            status = 'all'
+            from_id = self.newest_order_id + 1 if self.newest_order_id is not None else None
+
+        raw_orders = await fetch_all_pages(http_agent, User.require_token(), 'ORDERS', 'orders',
+                                           self.trade.fetch_orders_page,
+                                           status=status, from_id=from_id)
+
+        # Orders which are older than the seed and unknown to the store are history, not changes
+        history = {str(order['id']) for order in raw_orders
+                   if int(order['id']) <= self.seed_order_id and str(order['id']) not in self.orders}
+
+        changes = [(event, order) for event, order in self.apply_orders(raw_orders)
+                   if str(order['id']) not in history]
+
+        await self._broadcast(changes, 'order')
+        return changes
+    # ____________________________________________________________________________ . . .
+
+    async def seed_orders(self, http_agent: httpx.AsyncClient) -> None:
+        """
+        Seeds the store with the open orders and the newest page of all orders, so the next
+        syncs start after the newest known order instead of downloading the whole history.
+        """
+        token = User.require_token()
+        open_orders = await fetch_all_pages(http_agent, token, 'ORDERS', 'orders',
+                                            self.trade.fetch_orders_page, status='open')
+
+        await endpoint_throttle('ORDERS').acquire()
+        newest_page = await self.trade.fetch_orders_page(http_agent, token, status='all')
+
+        self.apply_orders([*newest_page.get('orders', []), *open_orders])
+        self.seed_order_id = self.newest_order_id or 0
+        self.orders_synced = True
+    # ____________________________________________________________________________ . . .
+
+    async def sync_positions(self, http_agent: httpx.AsyncClient) -> list[tuple[str, dict]]:
+        """
+        Fetches the active positions and applies them. The first sync only seeds the store.
+        """
+        raw_positions = await fetch_all_pages(http_agent, User.require_token(), 'POSITIONS',
+                                              'positions', self.trade.fetch_positions,
+                                              status='active')
+
+        changes = self.apply_positions(raw_positions)
+        if not self.positions_synced:
+            self.positions_synced = True
+            return []
+
+        await self._broadcast(changes, 'position')
+        return changes
+    # ____________________________________________________________________________ . . .
+
+    async def live(self) -> None:
+        """
+        Constantly keeps orders and positions of the store in sync with the exchange.
+        """
+        async with httpx.AsyncClient() as http_agent:
+            await asyncio.gather(self._live_sync(self.sync_orders, http_agent),
+                                 self._live_sync(self.sync_positions, http_agent))
+    # ____________________________________________________________________________ . . .
+
+    async def _live_sync(self, sync, http_agent: httpx.AsyncClient) -> None:
+        while True:
+            try:
+                await sync(http_agent)
+            except Exception as err:
+                bot_logs.error(f'Inside "TradeStore.{sync.__name__}()" method: {err}')
+                await asyncio.sleep(1)
+    # ____________________________________________________________________________ . . .
+
+    async def _broadcast(self, changes: list[tuple[str, dict]], supply: str) -> None:
+        for event, record in changes:
+            bot_logs.info(f'Broadcasting "{event}" event for {supply} "{record.get("id")}" from '
+                          '"TradeStore".')
+            await self.jarchi.emit(event, **{supply: record})
+# =================================================================================================
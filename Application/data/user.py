@@ -1,10 +1,11 @@
 import sys
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.utils.load_json import load    # noqa: E402
+from Application.utils.load_json import load_cached    # noqa: E402
 
 
 
@@ -15,10 +16,22 @@ class User:
 
     TOKEN = dotenv_values('secrets.env').get(
         'TEST_TOKEN' \
-        if load(r'Application/configs/config.json')['setting'] == "TEST" \
+        if load_cached(r'Application/configs/config.json')['setting'] == "TEST" \
         else 'MAIN_TOKEN', ''
     )
 
+    @classmethod
+    def require_token(cls) -> str:
+        """
+        Returns the API token of the user.
+
+        Raises:
+            RuntimeError: If no token is set in 'secrets.env'.
+        """
+        if not cls.TOKEN:
+            raise RuntimeError('No API token is set in "secrets.env".')
+        return cls.TOKEN
+
     class Fee:
         MAKER: float = 0.1
         TAKER: float = 0.2
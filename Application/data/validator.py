@@ -7,10 +7,11 @@ import sys
 import pandas as pd
 from dotenv import load_dotenv
 
-load_dotenv('project_path.env')
-path = os.getenv('PYTHONPATH')
-if path:
-    sys.path.append(path)
+if __name__ == '__main__':
+    load_dotenv('project_path.env')
+    path = os.getenv('PYTHONPATH')
+    if path:
+        sys.path.append(path)
 
 from Application.utils.logs import get_logger                    # noqa: E402
 from Application.utils.exchange.nobitex import resolution_map    # noqa: E402
@@ -1,20 +1,26 @@
 import sys
+import time
 import httpx
 import asyncio
 import logging
 import importlib
 import pandas as pd
+from typing import NamedTuple
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application.data.user import User    # noqa: E402
-from Application.utils.load_json import load    # noqa: E402
-from Application.api.nobitex_api import Trade    # noqa: E402
+from Application.api.nobitex_api import Market, Trade    # noqa: E402
+import Application.configs.admin_config as aconfig    # noqa: E402
 from Application.utils.event_channels import Event    # noqa: E402
 from Application.api.api_service import APIService    # noqa: E402
-from Application.data.exchange import Nobitex as nb    # noqa: E402
+from Application.data.trade_store import TradeStore, fetch_all_pages    # noqa: E402
+from Application.api.rate_limits import endpoint_throttle    # noqa: E402
+from Application.data.market_info import fetch_market_info    # noqa: E402
+from Application.trading import strategy_fields as strategy    # noqa: E402
 from Application.utils.simplified_event_handler import EventHandler    # noqa: E402
 
 jarchi = EventHandler()
@@ -23,33 +29,46 @@ jarchi = EventHandler()
 
 # =================================================================================================
 jarchi.register_event(Event.RECOVERY_MECHANISM_ACCOMPLISHED, [])
+jarchi.register_event(Event.GADABOUTS_DETECTED, ['gadabouts_df'])
+
+# Keys, side and size fields used for checking SL/TP coverage of positions
+PAIR_KEYS = ['srcCurrency', 'dstCurrency']
+POSITION_SIDE_FIELD = 'side'
+POSITION_SIZE_FIELD = 'liability'
+ORDER_SIDE_FIELD = 'type'
+ORDER_SIZE_FIELD = 'unmatchedAmount'
+
+# Side of the positions which orders of each side reduce
+REDUCED_SIDES = {'sell': 'buy', 'buy': 'sell'}
 # =================================================================================================
 
 
 
 # =================================================================================================
+# Mechanisms which are carried out together by the recovery engine, from a single snapshot
+PLANNED_MECHANISMS = frozenset({'close_all_positions', 'omit_all_orders'})
+
+
 async def recovery_mechanism() -> None:
     """
-    
+    Runs the recovery mechanisms of strategy config and broadcasts the
+    'RECOVERY_MECHANISM_ACCOMPLISHED' event if all of them succeeded.
     """
     try:
         # Extract function names from strategy.json file
-        strategy_cfg = load(r'Application/configs/strategy.json')
-        strategy_mechanisms = strategy_cfg['recovery_mechanisms']
+        mechanism_names = {mechanism['name'] for mechanism in strategy.RECOVERY_MECHANISMS}
 
-        # Extract function objects from disaster_actions.py module
-        funcs_set = set()
-        for mechanism in strategy_mechanisms:
-            funcs_set.add(getattr(
-                importlib.import_module('Application.execution.actions.disaster_actions'),
-                mechanism['name']))
+        # Extract function objects of other mechanisms from disaster_actions.py module
+        module = importlib.import_module('Application.execution.actions.disaster_actions')
+        coroutines: list = [getattr(module, name)() for name in mechanism_names - PLANNED_MECHANISMS]
 
-        # Execute functions synchronously
-        # for func in funcs_set:
-        #     await func()
+        if mechanism_names & PLANNED_MECHANISMS:
+            coroutines.append(
+                _recovery_status(close_positions = 'close_all_positions' in mechanism_names,
+                                 cancel_orders   = 'omit_all_orders' in mechanism_names)
+            )
 
         # Execute functions asynchronously
-        coroutines: list = [func() for func in funcs_set]
         results = await asyncio.gather(*coroutines, return_exceptions=True)
 
         # logic to exit recovery mechanism in case all results are successful
@@ -69,107 +88,317 @@ async def recovery_mechanism() -> None:
 
 async def close_all_positions():
     """
-    
+    Closes all active positions by market price.
     """
-    trade = Trade(APIService())
-
     logging.info('Executing "close_all_positions()" recovery mechanism')
-    success = await trade.close_all_positions(User.TOKEN)    # type: ignore
-    return 'succeeded' if success == 'succeeded' else 'failed'
+    return await _recovery_status(close_positions=True, cancel_orders=False)
 # ________________________________________________________________________________ . . .
 
 
 async def omit_all_orders():
     """
-    
+    Cancels all open orders.
     """
-    trade = Trade(APIService())
-
     logging.info('Executing "omit_all_orders()" recovery mechanism')
-    success = await trade.cancel_all_orders(client=httpx.AsyncClient(), token=User.TOKEN)    # type: ignore
-    return 'succeeded' if success == 'succeeded' else 'failed'
+    return await _recovery_status(close_positions=False, cancel_orders=True)
+# ________________________________________________________________________________ . . .
+
+
+async def _recovery_status(close_positions: bool, cancel_orders: bool) -> str:
+    report = await run_recovery_engine(close_positions=close_positions, cancel_orders=cancel_orders)
+    return 'succeeded' if report.succeeded else 'failed'
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+class RecoveryPlan(NamedTuple):
+    closes        : list[dict]    # Keyword arguments of 'Trade.close_position()' per position
+    cancel_orders : bool          # Whether there are open orders to cancel
+    unpriced      : list[str]     # Ids of positions which can't be closed for lack of a price
+# ________________________________________________________________________________ . . .
+
+
+class RecoveryReport(NamedTuple):
+    elapsed          : float
+    snapshot_elapsed : float
+    closed           : list[str]
+    failed           : list[str]
+    canceled         : bool | None    # None if there was no order to cancel
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed and self.canceled is not False
+# ________________________________________________________________________________ . . .
+
+
+async def take_recovery_snapshot(
+    http_agent : httpx.AsyncClient,
+    token      : str,
+    trade      : Trade,
+    market     : Market
+) -> tuple[list[dict], list[dict], dict[str, float]]:
+    """
+    Fetches active positions, open orders and market prices of positions' pairs concurrently.
+    Prices of all pairs are fetched by a single request as soon as positions are known, while
+    the orders are still being fetched. The trading rules of the markets are fetched along the
+    prices if their cache expired, so the close prices get rounded to the tick sizes.
+
+    Returns:
+        snapshot (tuple): Lists of positions and orders, and market prices keyed by 'src-dst'.
+    """
+    positions_task = asyncio.create_task(fetch_all_pages(
+        http_agent, token, 'POSITIONS', 'positions', trade.fetch_positions, status='active'
+    ))
+    orders_task = asyncio.create_task(fetch_all_pages(
+        http_agent, token, 'ORDERS', 'orders', trade.fetch_orders_page, status='open'
+    ))
+
+    try:
+        positions = await positions_task
+
+        prices: dict[str, float] = {}
+        if positions:
+            async def fetch_prices() -> dict[str, float]:
+                await endpoint_throttle('MARKET_STATS').acquire()
+                return await market.fetch_market_prices(
+                    http_agent     = http_agent,
+                    src_currencies = [position['srcCurrency'] for position in positions],
+                    dst_currencies = [position['dstCurrency'] for position in positions]
+                )
+
+            fetched_prices, market_info = await asyncio.gather(fetch_prices(),
+                                                               fetch_market_info(http_agent),
+                                                               return_exceptions=True)
+            if isinstance(fetched_prices, BaseException):
+                raise fetched_prices
+            if isinstance(market_info, BaseException):
+                logging.error(f'Closing positions by the last known trading rules: {market_info}')
+            prices = fetched_prices
+
+        orders = await orders_task
+    finally:
+        for task in (positions_task, orders_task):
+            task.cancel() if not task.done() else None
+
+    return positions, orders, prices
 # ________________________________________________________________________________ . . .
 
 
-async def fetch_gadabouts():
+def build_recovery_plan(positions       : list[dict],
+                        orders          : list[dict],
+                        prices          : dict[str, float],
+                        *,
+                        close_positions : bool = True,
+                        cancel_orders   : bool = True) -> RecoveryPlan:
     """
-    
+    Computes the requests which bring the account to a flat state.
     """
-    gadabouts_df = pd.DataFrame()
+    closes: list[dict] = []
+    unpriced: list[str] = []
+
+    for position in positions if close_positions else ():
+        src_currency, dst_currency = position['srcCurrency'], position['dstCurrency']
+        price = prices.get(f'{src_currency}-{dst_currency}')
+        if price is None:
+            unpriced.append(str(position['id']))
+            continue
+
+        closes.append({'id'           : position['id'],
+                       'execution'    : 'market',
+                       'amount'       : position['liability'],
+                       'side'         : 'sell' if position['side'] == 'buy' else 'buy',
+                       'src_currecy'  : src_currency,
+                       'dst_currency' : dst_currency,
+                       'price'        : Trade.market_close_price(price, dst_currency,
+                                                                     src_currency)})
+
+    return RecoveryPlan(closes, cancel_orders and bool(orders), unpriced)
+# ________________________________________________________________________________ . . .
 
-    api_service = APIService()
-    trade = Trade(api_service)
 
-    # populating positions Dataframe
-    positions_df = await anext(trade.fetch_open_positions(
-        client       = httpx.AsyncClient(),
-        token        = User.TOKEN,    # type: ignore
-        req_interval = nb.Endpoint.POSITIONS_MI,
-        max_rate     = nb.Endpoint.POSITIONS_RL,
-        rate_period  = nb.Endpoint.POSITIONS_RP
-    ))
+async def execute_recovery_plan(http_agent  : httpx.AsyncClient,
+                                token       : str,
+                                trade       : Trade,
+                                plan        : RecoveryPlan,
+                                concurrency : int = aconfig.Recovery.CONCURRENCY
+                                ) -> tuple[list[str], list[str], bool | None]:
+    """
+    Cancels the open orders first, so no stop order fires on a position being closed, and then
+    closes the positions concurrently. At most 'concurrency' requests are in flight, and each one
+    waits for the shared rate limit of its endpoint.
+
+    Returns:
+        results (tuple): Ids of closed and failed positions, and whether orders got canceled.
+    """
+    canceled: bool | None = None
+    if plan.cancel_orders:
+        try:
+            await endpoint_throttle('CANCEL_ORDERS', spaced=False).acquire()
+            canceled = await trade.cancel_all_orders(client=http_agent, token=token) == 'succeeded'
+        except Exception as err:
+            logging.error(f'Failed to cancel open orders during recovery: {err}')
+            canceled = False
+
+    semaphore = asyncio.Semaphore(concurrency)
+    throttle = endpoint_throttle('CLOSE_POSITION', spaced=False)
+
+    async def close(request: dict) -> dict:
+        async with semaphore:
+            await throttle.acquire()
+            return await trade.close_position(http_agent=http_agent, token=token, **request)
+
+    results = await asyncio.gather(*(close(request) for request in plan.closes),
+                                   return_exceptions=True)
+
+    closed: list[str] = []
+    failed: list[str] = list(plan.unpriced)
+    for request, result in zip(plan.closes, results):
+        if isinstance(result, BaseException) or not result or result.get('status') != 'ok':
+            logging.error(f'Failed to close position {request["id"]}: {result}')
+            failed.append(str(request['id']))
+        else:
+            closed.append(str(request['id']))
+
+    return closed, failed, canceled
+# ________________________________________________________________________________ . . .
 
-    if not positions_df.empty:
-        pair_df = positions_df[['srcCurrency', 'dstCurrency']].drop_duplicates()
-        pairs = [tuple(pair) for pair in pair_df.to_numpy()]
-        print(pairs)
 
+async def run_recovery_engine(close_positions : bool = True,
+                              cancel_orders   : bool = True,
+                              token           : str | None = None) -> RecoveryReport:
+    """
+    Recovers the account to a flat state in a single concurrent pass and reports how long it took
+    against the recovery SLA.
+    """
+    token = token or User.require_token()
+    trade, market = Trade(APIService()), Market(APIService())
+    start = time.monotonic()
+
+    async with httpx.AsyncClient() as http_agent:
+        positions, orders, prices = await take_recovery_snapshot(http_agent, token, trade, market)
+        snapshot_elapsed = time.monotonic() - start
 
-        # populating orders DataFrame
-        orders_df = pd.DataFrame()
-        for srcCurrency, dstCurrecy in pairs:
-            this_pairs_orders_df = await anext(trade.fetch_orders(
-                client       = httpx.AsyncClient(),
-                token        = User.TOKEN,    # type: ignore
-                req_interval = nb.Endpoint.ORDERS_MI,
-                max_rate     = nb.Endpoint.ORDERS_RL,
-                rate_period  = nb.Endpoint.ORDERS_RP,
-                src_currency = srcCurrency,
-                dst_currency = dstCurrecy
-            ))
+        plan = build_recovery_plan(positions, orders, prices,
+                                   close_positions = close_positions,
+                                   cancel_orders   = cancel_orders)
+        closed, failed, canceled = await execute_recovery_plan(http_agent, token, trade, plan)
 
-            orders_df = pd.concat([orders_df, this_pairs_orders_df])
+    report = RecoveryReport(time.monotonic() - start, snapshot_elapsed, closed, failed, canceled)
 
+    logging.info(f'Recovery finished in {report.elapsed:.2f}s (snapshot {snapshot_elapsed:.2f}s, '
+                 f'SLA {aconfig.Recovery.SLA}s): {len(closed)} positions closed, {len(failed)} '
+                 f'failed, {len(orders)} open orders, canceled: {canceled}.')
+    if report.elapsed > aconfig.Recovery.SLA:
+        logging.warning(f'Recovery took {report.elapsed:.2f}s, exceeding its '
+                        f'{aconfig.Recovery.SLA}s SLA.')
 
-        # In case there is no orders at all, then all positions are gadabout
-        if orders_df.empty:
-            gadabouts_df = positions_df
-            return gadabouts_df
-        # ________________________________________________________________________ . . .
+    return report
+# ________________________________________________________________________________ . . .
 
 
-        # In case there are orders for some of positions, positions that has no order are gadabouts
-        orders_pairs_set = set(zip(orders_df['srcCurrency'], orders_df['dstCurrency']))
-        poss_unq_pairs = [pair for pair in pairs if pair not in orders_pairs_set]
+async def fetch_gadabouts() -> pd.DataFrame:
+    """
+    Fetches active positions and open orders concurrently and returns the gadabouts among the
+    positions, see 'find_gadabouts()'.
+    """
+    trade, token = Trade(APIService()), User.require_token()
 
-        gadabouts_df = positions_df[
-            positions_df[['srcCurrency', 'dstCurrency']].apply(tuple, axis=1).isin(poss_unq_pairs)
-        ]
-        # ________________________________________________________________________ . . .
+    async with httpx.AsyncClient() as http_agent:
+        positions, orders = await asyncio.gather(
+            fetch_all_pages(http_agent, token, 'POSITIONS', 'positions', trade.fetch_positions,
+                            status='active'),
+            fetch_all_pages(http_agent, token, 'ORDERS', 'orders', trade.fetch_orders_page,
+                            status='open')
+        )
 
+    return find_gadabouts(pd.DataFrame(positions), pd.DataFrame(orders))
+# ________________________________________________________________________________ . . .
 
-        # In case of remaining positions, check whether available orders are valid for them or not
-        remaining_pairs = [pair for pair in pairs if pair in orders_pairs_set]
-        for srcCurrency, dstCurrency in remaining_pairs:
-            pair_orders_df = orders_df[(orders_df['srcCurrency'] == srcCurrency) & 
-                                       (orders_df['dstCurrency'] == dstCurrency)]
 
-            position_df = positions_df[(positions_df['srcCurrency'] == srcCurrency) & 
-                                       (positions_df['dstCurrency'] == dstCurrency)]
+def find_gadabouts(positions_df: pd.DataFrame, orders_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Finds gadabouts, the positions of pairs whose open stop orders (SL) or limit orders (TP) don't
+    cover the total size of their positions on the same side.
 
-            # Calculate total position size
-            total_position_size = position_df['size'].sum()
+    Only reduce-side orders count as coverage, sell orders for long positions and buy orders for
+    short ones, so pending entries don't mask positions without protection. Orders are aggregated
+    per pair, covered side and kind with a single groupby, and joined to the positions on
+    (srcCurrency, dstCurrency, side) once, so all positions are flagged in one vectorized pass.
 
-            # Calculate SL and TP coverage
-            sl_coverage = pair_orders_df[pair_orders_df['type'] == 'stop_loss']['size'].sum()
-            tp_coverage = pair_orders_df[pair_orders_df['type'] == 'take_profit']['size'].sum()
+    Returns:
+        gadabouts_df (DataFrame): The under-protected positions along with their pair's and side's
+                                  'position_total', 'sl_coverage' and 'tp_coverage' columns.
+    """
+    if positions_df.empty:
+        return pd.DataFrame()
+
+    keys = [*PAIR_KEYS, POSITION_SIDE_FIELD]
+    positions = positions_df.assign(
+        position_total = pd.to_numeric(positions_df[POSITION_SIZE_FIELD], errors='coerce')
+                           .fillna(0)
+                           .groupby([positions_df[key] for key in keys])
+                           .transform('sum')
+    )
+
+    # Orders are keyed by the side of the positions they reduce, other orders are dropped
+    orders = orders_df
+    if not orders.empty:
+        orders = orders.assign(**{POSITION_SIDE_FIELD: orders[ORDER_SIDE_FIELD].map(REDUCED_SIDES)})
+        orders = orders.dropna(subset=[POSITION_SIDE_FIELD])
+
+    if orders.empty:
+        coverage = pd.DataFrame(columns=[*keys, 'sl_coverage', 'tp_coverage'])
+    else:
+        coverage = (
+            orders.assign(
+                kind = orders['execution'].astype(str).str.lower().str.startswith('stop')
+                                          .map({True: 'sl_coverage', False: 'tp_coverage'}),
+                size = pd.to_numeric(orders[ORDER_SIZE_FIELD], errors='coerce').fillna(0)
+            )
+            .pivot_table(index=keys, columns='kind', values='size', aggfunc='sum', fill_value=0)
+            .reindex(columns=['sl_coverage', 'tp_coverage'], fill_value=0)
+            .reset_index()
+        )
+
+    merged = positions.merge(coverage, on=keys, how='left')
+    merged[['sl_coverage', 'tp_coverage']] = (merged[['sl_coverage', 'tp_coverage']]
+                                              .astype(float).fillna(0))
+
+    under_protected = (merged['sl_coverage'] < merged['position_total']) | \
+                      (merged['tp_coverage'] < merged['position_total'])
+
+    return merged[under_protected.to_numpy()].reset_index(drop=True)
+# ________________________________________________________________________________ . . .
 
-            if sl_coverage < total_position_size or tp_coverage < total_position_size:
-                gadabouts_df = pd.concat([gadabouts_df, position_df])
-        # ________________________________________________________________________ . . .
 
-    
-    return gadabouts_df   
+async def gadabout_monitor(interval: float = aconfig.Recovery.MONITOR_INTERVAL) -> None:
+    """
+    Constantly checks open positions for SL/TP coverage, from the 'TradeStore' which the orders
+    engine keeps in sync, and broadcasts the 'GADABOUTS_DETECTED' event whenever the set of
+    gadabouts changes.
+    """
+    store = TradeStore()
+    reported: set[str] = set()
+
+    while True:
+        await asyncio.sleep(interval)
+        if not (store.orders_synced and store.positions_synced):
+            continue
+
+        try:
+            gadabouts_df = find_gadabouts(store.positions_df(), pd.DataFrame(store.open_orders()))
+            gadabouts = set(gadabouts_df['id'].astype(str)) if not gadabouts_df.empty else set()
+
+            if gadabouts and gadabouts != reported:
+                logging.warning(f'There are {len(gadabouts)} positions without enough SL/TP '
+                                f'coverage: {sorted(gadabouts)}')
+                await jarchi.emit(Event.GADABOUTS_DETECTED, gadabouts_df=gadabouts_df)
+            reported = gadabouts
+
+        except Exception as err:
+            logging.error(f'Inside gadabout_monitor() function: {err}')
 # ________________________________________________________________________________ . . .
 
 # =================================================================================================
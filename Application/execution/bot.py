@@ -4,8 +4,9 @@ import asyncio
 import importlib
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import bot_logs                       # noqa: E402
 from Application.utils.logs import finish_logs         # noqa: E402
@@ -1,12 +1,13 @@
 import sys
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.utils.load_json import load                           # noqa: E402
 from Application.utils.logs import get_logger                          # noqa: E402
 from Application.utils.event_channels import Event                     # noqa: E402
+from Application.trading import strategy_fields as strategy            # noqa: E402
 from Application.utils.simplified_event_handler import EventHandler    # noqa: E402
 
 bot_logs = get_logger(logger_name='bot_logs')
@@ -21,8 +22,7 @@ async def watch_transitions():
     """
     Watches for active time transitions and emits on corresponding event channel.
     """
-    strategy_cfg = load(r'Application/configs/strategy.json')
-    activity_setup = strategy_cfg['active_times']
+    activity_setup = strategy.ACTIVE_TIMES
 
     if activity_setup == 247:
         bot_logs.info(f'Broadcasting "{Event.START_ACTIVITY}" event from'\
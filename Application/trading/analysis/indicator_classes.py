@@ -51,6 +51,12 @@ class Supertrend(Indicator):
         if window <= 0:
             raise ValueError("Window most be positive")
 
+class ATR(Indicator):
+    def __init__(self, period):
+        super().__init__('ATR', period)
+        if period <= 0:
+            raise ValueError("Period must be positive")
+
 # Example of an indicator without parameters
 class Volume(Indicator):
     def __init__(self):
@@ -1,12 +1,17 @@
 import sys
+import numpy as np
 import pandas as pd
-import pandas_ta as ta    # type: ignore
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import trade_logs # noqa: E402
+from Application.utils.lazy_import import lazy_import # noqa: E402
+from Application.trading.analysis import kernels # noqa: E402
+
+ta = lazy_import('pandas_ta')    # Imported on first indicator computation
 
 
 
@@ -45,4 +50,136 @@ async def pandas_supertrend(kline_df: pd.DataFrame, properties: dict) -> pd.Data
 
 
 # Definition of other indicator functions ...
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+# Native indicator functions, computed by the kernels of 'kernels.py' on the NumPy arrays of kline
+def _column(kline_df: pd.DataFrame, name: str) -> np.ndarray:
+    return kline_df[name].to_numpy(dtype=np.float64)
+# ________________________________________________________________________________ . . .
+
+
+def _native_df(kline_df: pd.DataFrame, name: str, compute) -> pd.DataFrame:
+    """
+    Builds the indicator DataFrame from the columns returned by 'compute()', logging errors like
+    'pandas_supertrend()' does.
+    """
+    try:
+        return pd.DataFrame(compute(), index=kline_df.index)
+    except Exception as err:
+        trade_logs.error(f'Error while calculating \'{name}\' indicator values: {err}')
+        return pd.DataFrame()
+# ________________________________________________________________________________ . . .
+
+
+async def native_sma(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    Simple moving average of close prices over 'window' candles, in the 'sma_<window>' column.
+    """
+    window = int(properties.get('window', 10))
+    return _native_df(kline_df, 'native_sma', lambda: {
+        f'sma_{window}': kernels.sma(_column(kline_df, 'close'), window)
+    })
+# ________________________________________________________________________________ . . .
+
+
+async def native_ema(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    Exponential moving average of close prices over 'window' candles, in the 'ema_<window>' column.
+    """
+    window = int(properties.get('window', 10))
+    return _native_df(kline_df, 'native_ema', lambda: {
+        f'ema_{window}': kernels.ema(_column(kline_df, 'close'), window)
+    })
+# ________________________________________________________________________________ . . .
+
+
+async def native_rsi(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    Relative strength index of close prices over 'window' candles, in the 'rsi_<window>' column.
+    """
+    window = int(properties.get('window', 14))
+    return _native_df(kline_df, 'native_rsi', lambda: {
+        f'rsi_{window}': kernels.rsi(_column(kline_df, 'close'), window)
+    })
+# ________________________________________________________________________________ . . .
+
+
+async def native_atr(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    Average true range over 'window' candles, in the 'atr_<window>' column.
+    """
+    window = int(properties.get('window', 14))
+    return _native_df(kline_df, 'native_atr', lambda: {
+        f'atr_{window}': kernels.atr(_column(kline_df, 'high'),
+                                     _column(kline_df, 'low'),
+                                     _column(kline_df, 'close'),
+                                     window)
+    })
+# ________________________________________________________________________________ . . .
+
+
+async def native_bbands(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    Bollinger Bands of 'window' candles and 'std' standard deviations, in the 'bb_lower',
+    'bb_mid' and 'bb_upper' columns.
+    """
+    window = int(properties.get('window', 5))
+    std = float(properties.get('std', 2.0))
+
+    def compute():
+        lower, mid, upper = kernels.bbands(_column(kline_df, 'close'), window, std)
+        return {'bb_lower': lower, 'bb_mid': mid, 'bb_upper': upper}
+
+    return _native_df(kline_df, 'native_bbands', compute)
+# ________________________________________________________________________________ . . .
+
+
+async def native_macd(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    MACD of the 'fast' and 'slow' EMAs with a 'signal' EMA, in the 'macd', 'macd_signal' and
+    'macd_hist' columns.
+    """
+    fast = int(properties.get('fast', 12))
+    slow = int(properties.get('slow', 26))
+    signal = int(properties.get('signal', 9))
+
+    def compute():
+        line, signal_line, histogram = kernels.macd(_column(kline_df, 'close'), fast, slow, signal)
+        return {'macd': line, 'macd_signal': signal_line, 'macd_hist': histogram}
+
+    return _native_df(kline_df, 'native_macd', compute)
+# ________________________________________________________________________________ . . .
+
+
+async def native_supertrend(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    Drop-in replacement of 'pandas_supertrend()' with the same 'window' and 'factor' properties
+    and the same 'supertrend' and 'supertrend_side' columns.
+    """
+    window = int(properties.get('window', 7))
+    factor = float(properties.get('factor', 3.0))
+
+    def compute():
+        trend, side = kernels.supertrend(_column(kline_df, 'high'),
+                                         _column(kline_df, 'low'),
+                                         _column(kline_df, 'close'),
+                                         window,
+                                         factor)
+        return {'supertrend': trend, 'supertrend_side': side}
+
+    return _native_df(kline_df, 'native_supertrend', compute)
+# ________________________________________________________________________________ . . .
+
+
+async def native_obv(kline_df: pd.DataFrame, properties: dict) -> pd.DataFrame:
+    """
+    On-balance volume, in the 'obv' column.
+    """
+    return _native_df(kline_df, 'native_obv', lambda: {
+        'obv': kernels.obv(_column(kline_df, 'close'), _column(kline_df, 'volume'))
+    })
 # =================================================================================================
\ No newline at end of file
@@ -0,0 +1,288 @@
+import sys
+import functools
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Iterable, NamedTuple
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.trading.analysis import kernels    # noqa: E402
+
+
+# A node is keyed by its primitive and parameters (e.g. ('atr', 14)), a reference points to a node
+# and to one of its outputs when the node returns several arrays (e.g. (('supertrend', 14, 3.0), 1))
+NodeKey = tuple
+Ref = tuple[NodeKey, int | None]
+
+
+
+
+# =================================================================================================
+class Primitive(NamedTuple):
+    """
+    A shared computation of the indicator graph.
+
+    Attributes:
+        dependencies (Callable): Maps the node parameters to the keys of its input nodes.
+        compute (Callable): Computes the node from the input arrays followed by its parameters.
+    """
+    dependencies : Callable[..., tuple[NodeKey, ...]]
+    compute      : Callable[..., Any]
+# ________________________________________________________________________________ . . .
+
+
+def _column(name: str) -> NodeKey:
+    return ('column', name)
+
+HIGH, LOW, CLOSE, VOLUME = _column('high'), _column('low'), _column('close'), _column('volume')
+
+
+PRIMITIVES: dict[str, Primitive] = {
+    'true_range'  : Primitive(lambda: (HIGH, LOW, CLOSE), kernels.true_range),
+    'sma'         : Primitive(lambda length: (CLOSE,), kernels.sma),
+    'ema'         : Primitive(lambda length: (CLOSE,), kernels.ema),
+    'rsi'         : Primitive(lambda length: (CLOSE,), kernels.rsi),
+    'obv'         : Primitive(lambda: (CLOSE, VOLUME), kernels.obv),
+    'atr'         : Primitive(lambda length: (('true_range',),), kernels.atr_from_true_range),
+
+    'rolling_std' : Primitive(lambda length, ddof: (CLOSE, ('sma', length)), kernels.rolling_std),
+
+    'bbands'      : Primitive(lambda length, std, ddof: (('sma', length),
+                                                         ('rolling_std', length, ddof)),
+                              lambda mid, deviation, length, std, ddof: (mid - std * deviation,
+                                                                         mid,
+                                                                         mid + std * deviation)),
+
+    'macd'        : Primitive(lambda fast, slow, signal: (('ema', fast), ('ema', slow)),
+                              lambda fast_ema, slow_ema, fast, slow, signal:
+                                  kernels.macd_from_emas(fast_ema, slow_ema, slow, signal)),
+
+    'supertrend'  : Primitive(lambda length, multiplier: (HIGH, LOW, CLOSE, ('atr', length)),
+                              kernels.supertrend_from_atr),
+}
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+# Decompositions of the indicator functions of 'indicator_functions.py' into named columns of
+# primitive nodes, their defaults are the ones of the indicator functions
+def _supertrend_columns(properties: dict) -> dict[str, Ref]:
+    window = int(properties.get('window', 7))
+    node = ('supertrend', window, float(properties.get('factor', 3.0)))
+
+    return {'supertrend'       : (node, 0),
+            'supertrend_side'  : (node, 1),
+            'supertrend_value' : (node, 0),
+            'atr_value'        : (('atr', window), None)}
+# ________________________________________________________________________________ . . .
+
+
+def _bbands_columns(properties: dict) -> dict[str, Ref]:
+    window = int(properties.get('window', 5))
+    node = ('bbands', window, float(properties.get('std', 2.0)), 1)
+
+    return {'bb_lower': (node, 0), 'bb_mid': (('sma', window), None), 'bb_upper': (node, 2)}
+# ________________________________________________________________________________ . . .
+
+
+def _macd_columns(properties: dict) -> dict[str, Ref]:
+    fast, slow = int(properties.get('fast', 12)), int(properties.get('slow', 26))
+    node = ('macd', min(fast, slow), max(fast, slow), int(properties.get('signal', 9)))
+
+    return {'macd': (node, 0), 'macd_signal': (node, 1), 'macd_hist': (node, 2)}
+# ________________________________________________________________________________ . . .
+
+
+def _windowed_columns(kind: str, default: int) -> Callable[[dict], dict[str, Ref]]:
+    def columns(properties: dict) -> dict[str, Ref]:
+        window = int(properties.get('window', default))
+        return {f'{kind}_{window}': ((kind, window), None)}
+
+    return columns
+# ________________________________________________________________________________ . . .
+
+
+DECOMPOSITIONS: dict[str, Callable[[dict], dict[str, Ref]]] = {
+    'pandas_supertrend' : _supertrend_columns,
+    'native_supertrend' : _supertrend_columns,
+    'native_bbands'     : _bbands_columns,
+    'native_macd'       : _macd_columns,
+    'native_sma'        : _windowed_columns('sma', 10),
+    'native_ema'        : _windowed_columns('ema', 10),
+    'native_rsi'        : _windowed_columns('rsi', 14),
+    'native_atr'        : _windowed_columns('atr', 14),
+    'native_obv'        : lambda properties: {'obv': (('obv',), None)},
+}
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+def topological_order(roots: Iterable[NodeKey]) -> list[NodeKey]:
+    """
+    Returns the nodes needed by 'roots', each one after all of its dependencies.
+    """
+    order: list[NodeKey] = []
+    done: set[NodeKey] = set()
+    visiting: set[NodeKey] = set()
+
+    def visit(key: NodeKey) -> None:
+        if key in done:
+            return
+        if key in visiting:
+            raise ValueError(f'Indicator graph has a cycle through "{key}".')
+
+        visiting.add(key)
+        if key[0] != 'column':
+            for dependency in PRIMITIVES[key[0]].dependencies(*key[1:]):
+                visit(dependency)
+        visiting.discard(key)
+
+        done.add(key)
+        order.append(key)
+
+    for key in roots:
+        visit(key)
+
+    return order
+# ________________________________________________________________________________ . . .
+
+
+class IndicatorPlan:
+    """
+    Execution plan of the indicators of one or more trading systems.
+
+    Indicators with a decomposition are turned into named columns of shared primitive nodes, which
+    are computed once, in topological order, no matter how many indicators need them (e.g. the ATR
+    of a Supertrend and the 'atr_value' of its stop-loss).
+    """
+    def __init__(self, columns: dict[str, Ref]):
+        self.columns = columns
+        self.order   = topological_order(node for node, _ in columns.values())
+    # ____________________________________________________________________________ . . .
+
+    def compute(self,
+                kline_df : pd.DataFrame,
+                values   : dict[NodeKey, Any] | None = None,
+                previous : dict[NodeKey, Any] | None = None) -> pd.DataFrame:
+        """
+        Computes the planned columns.
+
+        Parameters:
+            kline_df (DataFrame): kline DataFrame.
+            values (dict): Nodes already computed for this kline, which are reused and extended.
+            previous (dict): Nodes computed on a previous kline, a node is reused as long as its
+                             inputs are the very same arrays, which holds for the kline columns
+                             whose values did not change.
+
+        Returns:
+            indicators_df (DataFrame): The planned columns indexed like kline_df.
+        """
+        values = {} if values is None else values
+        previous = {} if previous is None else previous
+
+        for key in self.order:
+            if key[0] == 'column':
+                column = values.get(key)
+                if column is None:
+                    column = kline_df[key[1]].to_numpy(dtype=np.float64)
+
+                unchanged = previous.get(key)
+                values[key] = unchanged if unchanged is not None and \
+                                           np.array_equal(column, unchanged, equal_nan=True) \
+                                        else column
+                continue
+
+            if key in values:
+                continue
+
+            dependencies = PRIMITIVES[key[0]].dependencies(*key[1:])
+            if key in previous and all(values[dependency] is previous.get(dependency)
+                                       for dependency in dependencies):
+                values[key] = previous[key]
+            else:
+                inputs = [values[dependency] for dependency in dependencies]
+                values[key] = PRIMITIVES[key[0]].compute(*inputs, *key[1:])
+
+        return pd.DataFrame({column: values[node] if output is None else values[node][output]
+                             for column, (node, output) in self.columns.items()},
+                            index=kline_df.index)
+# ________________________________________________________________________________ . . .
+
+
+def _signature(systems: Iterable[list]) -> tuple:
+    return tuple((indicator['name'], tuple(sorted(indicator.get('properties', {}).items())))
+                 for system in systems
+                 for setup in system
+                 for indicator in setup.get('indicators', [])
+                 if indicator)
+# ________________________________________________________________________________ . . .
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_plan(signature: tuple) -> IndicatorPlan:
+    columns: dict[str, Ref] = {}
+
+    for name, properties in signature:
+        decompose = DECOMPOSITIONS.get(name)
+        if decompose is None:
+            continue
+
+        for column, ref in decompose(dict(properties)).items():
+            if columns.setdefault(column, ref) != ref:
+                raise ValueError(f'Column "{column}" of indicator "{name}" is already produced by '
+                                 'another indicator with different properties.')
+
+    return IndicatorPlan(columns)
+# ________________________________________________________________________________ . . .
+
+
+def plan_indicators(*systems: list) -> IndicatorPlan:
+    """
+    Returns the (cached) execution plan of the decomposable indicators of the given trading
+    systems.
+    """
+    return _cached_plan(_signature(systems))
+# ________________________________________________________________________________ . . .
+
+
+def opaque_indicators(*systems: list) -> list[dict]:
+    """
+    Returns the configs of the indicators without a decomposition, which have to be executed by
+    their own indicator functions.
+    """
+    return [indicator for system in systems for setup in system
+            for indicator in setup.get('indicators', [])
+            if indicator and indicator['name'] not in DECOMPOSITIONS]
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+_shared: dict[str, Any] = {'frame': None, 'token': None, 'values': {}}
+
+
+def tick_values(kline_df: pd.DataFrame) -> dict[NodeKey, Any]:
+    """
+    Returns the primitive values computed so far for this kline, so the plans of different
+    systems computed on the same tick (e.g. entry and validation indicators) share them.
+
+    Values are kept for the very same DataFrame object only (it is referenced, so its id can not
+    be reused), as long as its length and last candle did not change in place.
+    """
+    token = (len(kline_df),
+             kline_df.index[-1] if len(kline_df) else None,
+             tuple(kline_df.iloc[-1]) if len(kline_df) else None)
+
+    if kline_df is not _shared['frame'] or token != _shared['token']:
+        _shared.update(frame=kline_df, token=token, values={})
+
+    return _shared['values']
+# =================================================================================================
@@ -3,13 +3,22 @@ import asyncio
 import pandas as pd
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import trade_logs # noqa: E402
+from Application.utils.tracing import traced # noqa: E402
+from Application.trading.analysis.indicator_planner import tick_values,\
+                                                            plan_indicators,\
+                                                            opaque_indicators # noqa: E402
 
+# Primitive nodes of the last computed kline per caller, to recompute only the nodes whose input
+# columns changed since then
+_previous_values: dict[str, dict] = {}
 
 # =================================================================================================
+@traced('validation_indicators')
 async def compute_validation_indicators(validation_system: list, kline_df: pd.DataFrame):
     """
     Computes validation indicator functions asynchronously.
@@ -18,51 +27,18 @@ async def compute_validation_indicators(validation_system: list, kline_df: pd.Da
         validation_system (list): List of market validation setups.
         kline_df (DataFrame): kline DataFrame.
 
+    Validation runs on every kline until the market is valid, so only the planned indicators whose
+    input columns changed since the last call are recomputed.
+
     Retrns:
         v_indicators_df (DataFrame): A pandas Dataframe containing validation indicators values.
     """
-    # Initialize coroutines
-    coroutines_set = set()
-
-    # Add indicator functions and their properties to coroutines
-    for setup in validation_system:
-        for indicator_config in setup.get("indicators", []):
-            # Handle the case where there is no indicator to be computed
-            if not indicator_config:
-                return pd.DataFrame()
-            coroutines_set.add(
-                indicator_config["function"](properties = indicator_config["properties"],
-                                             kline_df   = kline_df)
-            )
-
-            trade_logs.info(f'Indicator {indicator_config["name"]} has been added to validation '\
-                         'indicators.')
-
-    # Executing coroutine objects
-    try:
-        if coroutines_set:
-            results = await asyncio.gather(*coroutines_set)
-        else:
-            results = []
-    except asyncio.CancelledError:
-            trade_logs.error("An indicator compution task got canceled in "\
-                          "'compute_validation_indicators()' function.")
-    except Exception as err:
-        trade_logs.error(f'Inside "compute_validation_indicators()": {err}')
-
-    # Extract and merging indicator dataframes together
-    indicators_df = pd.DataFrame(index=kline_df.index)
-    if results:
-        for result in results:
-            if not result.empty:
-                indicators_df = indicators_df.merge(
-                    result, left_index=True, right_index=True, how='left'
-                )
-
-    return indicators_df
+    return await _compute_system(validation_system, kline_df, 'compute_validation_indicators',
+                                 incremental=True)
 # ________________________________________________________________________________ . . .
 
 
+@traced('indicators')
 async def compute_indicators(trading_system: list, kline_df: pd.DataFrame):
     """
     Computes indicator functions of given system asynchronously.
@@ -74,38 +50,56 @@ async def compute_indicators(trading_system: list, kline_df: pd.DataFrame):
     Returns:
         indicators_df (DataFrame): A pandas Dataframe containing indicators values.
     """
-    coroutines_set = set()
+    return await _compute_system(trading_system, kline_df, 'compute_indicators')
+# ________________________________________________________________________________ . . .
 
-    for setup in trading_system:
-        for indicator_config in setup.get("indicators", []):
-            # Handle the case where there is no indicator to be computed
-            if not indicator_config:
-                return pd.DataFrame()
-            coroutines_set.add(
-                indicator_config["function"](properties = indicator_config["properties"],
-                                             kline_df   = kline_df)
-            )
 
-            trade_logs.info(f'Indicator "{indicator_config["name"]}" has been added to Indicators.')
+async def _compute_system(system      : list,
+                          kline_df    : pd.DataFrame,
+                          caller      : str,
+                          incremental : bool = False) -> pd.DataFrame:
+    """
+    Computes the planned indicators of a system from primitives shared by every system computed
+    on the same kline, then executes the indicator functions which have no decomposition.
+
+    When 'incremental', the planned nodes of the previous call whose inputs did not change are
+    reused.
+    """
+    try:
+        values = tick_values(kline_df)
+        previous = _previous_values.get(caller) if incremental else None
+
+        indicators_df = plan_indicators(system).compute(kline_df, values, previous)
+        if incremental:
+            _previous_values[caller] = values
+    except Exception as err:
+        trade_logs.error(f'Inside "{caller}()" while computing planned indicators: {err}')
+        indicators_df = pd.DataFrame(index=kline_df.index)
+
+    coroutines_set = set()
+    for indicator_config in opaque_indicators(system):
+        coroutines_set.add(
+            indicator_config["function"](properties = indicator_config["properties"],
+                                         kline_df   = kline_df)
+        )
 
+        trade_logs.info(f'Indicator "{indicator_config["name"]}" has been added to Indicators.')
+
+    results = []
     try:
         if coroutines_set:
             results = await asyncio.gather(*coroutines_set)
-        else:
-            results = []
     except asyncio.CancelledError:
             trade_logs.error("An indicator compution task got canceled in "\
-                          "'compute_indicators()' function.")
+                          f"'{caller}()' function.")
     except Exception as err:
-        trade_logs.error(f'Inside "compute_indicators()": {err}')
-
-    indicators_df = pd.DataFrame(index=kline_df.index)
-    if results:
-        for result in results:
-            if not result.empty:
-                indicators_df = indicators_df.merge(
-                    result, left_index=True, right_index=True, how='left'
-                )
+        trade_logs.error(f'Inside "{caller}()": {err}')
+
+    for result in results:
+        if not result.empty:
+            indicators_df = indicators_df.merge(
+                result, left_index=True, right_index=True, how='left'
+            )
 
     return indicators_df
 # =================================================================================================
@@ -0,0 +1,554 @@
+"""
+Native kernels of the core indicators.
+
+Batch kernels are array-in/array-out functions over float64 NumPy arrays, which reproduce the
+values of 'pandas_ta' with its default settings (presma seeded EMA/ATR, RMA smoothed RSI and ATR,
+ddof=1 Bollinger Bands).
+
+Numba is an optional accelerator, not a dependency of the project. When it is installed (and
+'NUMBA_DISABLE_JIT' is not set) it compiles the loops of the kernels. Otherwise, loops which
+would run in the interpreter are replaced by vectorized NumPy equivalents and pandas 'ewm()'. Only
+the Supertrend recursion stays a Python loop. 'JIT' tells which of the two is running, and each
+has its own baseline in 'benchmarks/results'.
+
+Every kernel has an incremental counterpart, a small state object whose 'update()' consumes one
+candle in O(1) and returns the latest value(s), so live candles do not recompute the history.
+"""
+import math
+import numpy as np
+import pandas as pd
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit, config    # type: ignore
+    JIT: bool = not config.DISABLE_JIT
+except ImportError:
+    JIT = False
+
+    def njit(**options):
+        return lambda function: function
+
+NAN = math.nan
+
+
+
+
+# =================================================================================================
+@njit(cache=True)
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean like 'Series.ewm(alpha=alpha, adjust=False).mean()', for arrays
+    whose only NaNs are leading.
+    """
+    result = np.empty(values.size)
+    mean = np.nan
+    for i in range(values.size):
+        if np.isnan(mean):
+            mean = values[i]
+        elif not np.isnan(values[i]):
+            mean = (1.0 - alpha) * mean + alpha * values[i]
+        result[i] = mean
+
+    return result
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def _presma(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Replaces the first 'length' values by NaNs and their mean, as 'pandas_ta' seeds EMA and ATR.
+    """
+    seeded = values.copy()
+    seeded[:length - 1] = np.nan
+    seeded[length - 1] = np.nanmean(values[:length])
+
+    return seeded
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def sma(close: np.ndarray, length: int) -> np.ndarray:
+    result = np.full(close.size, np.nan)
+    if close.size < length:
+        return result
+
+    window_sum = 0.0
+    for i in range(close.size):
+        window_sum += close[i]
+        if i >= length:
+            window_sum -= close[i - length]
+        if i >= length - 1:
+            result[i] = window_sum / length
+
+    return result
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def ema(close: np.ndarray, length: int) -> np.ndarray:
+    if close.size < length:
+        return np.full(close.size, np.nan)
+
+    return _ewm(_presma(close, length), 2.0 / (length + 1))
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def rma(values: np.ndarray, length: int) -> np.ndarray:
+    if values.size < length:
+        return np.full(values.size, np.nan)
+
+    return _ewm(values, 1.0 / length)
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def rsi(close: np.ndarray, length: int) -> np.ndarray:
+    if close.size < length + 1:
+        return np.full(close.size, np.nan)
+
+    positive = np.full(close.size, np.nan)
+    negative = np.full(close.size, np.nan)
+    for i in range(1, close.size):
+        change = close[i] - close[i - 1]
+        positive[i] = max(change, 0.0)
+        negative[i] = min(change, 0.0)
+
+    positive_avg = rma(positive, length)
+    negative_avg = rma(negative, length)
+
+    return 100.0 * positive_avg / (positive_avg + np.abs(negative_avg))
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    result = np.empty(close.size)
+    for i in range(close.size):
+        result[i] = high[i] - low[i]
+        if i > 0:
+            result[i] = max(result[i], abs(high[i] - close[i - 1]), abs(close[i - 1] - low[i]))
+
+    return result
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> np.ndarray:
+    return atr_from_true_range(true_range(high, low, close), length)
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def atr_from_true_range(true_ranges: np.ndarray, length: int) -> np.ndarray:
+    if true_ranges.size < length + 1:
+        return np.full(true_ranges.size, np.nan)
+
+    return rma(_presma(true_ranges, length), length)
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def rolling_std(close: np.ndarray, mean: np.ndarray, length: int, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviation of 'length' values around their precomputed rolling 'mean'.
+    """
+    deviation = np.full(close.size, np.nan)
+    for i in range(length - 1, close.size):
+        window = close[i - length + 1:i + 1]
+        deviation[i] = np.sqrt(np.sum((window - mean[i]) ** 2) / (length - ddof))
+
+    return deviation
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def bbands(close  : np.ndarray,
+           length : int,
+           std    : float = 2.0,
+           ddof   : int = 1) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        lower, mid, upper (ndarray): Bands of the SMA and the rolling standard deviation.
+    """
+    mid = sma(close, length)
+    deviation = rolling_std(close, mid, length, ddof)
+
+    return mid - std * deviation, mid, mid + std * deviation
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def macd(close  : np.ndarray,
+         fast   : int = 12,
+         slow   : int = 26,
+         signal : int = 9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        macd, signal, histogram (ndarray): The MACD line, its EMA and their difference.
+    """
+    if slow < fast:
+        fast, slow = slow, fast
+
+    return macd_from_emas(ema(close, fast), ema(close, slow), slow, signal)
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def macd_from_emas(fast_ema : np.ndarray,
+                   slow_ema : np.ndarray,
+                   slow     : int,
+                   signal   : int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    line = fast_ema - slow_ema
+    signal_line = np.full(line.size, np.nan)
+    if line.size >= slow + signal - 1:
+        signal_line[slow - 1:] = ema(line[slow - 1:], signal)
+
+    return line, signal_line, line - signal_line
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def supertrend(high       : np.ndarray,
+               low        : np.ndarray,
+               close      : np.ndarray,
+               length     : int = 7,
+               multiplier : float = 3.0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        trend, direction (ndarray): Supertrend line and its side, 1 for up and -1 for down trends.
+    """
+    return supertrend_from_atr(high, low, close, atr(high, low, close, length), length, multiplier)
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def supertrend_from_atr(high       : np.ndarray,
+                        low        : np.ndarray,
+                        close      : np.ndarray,
+                        atr_values : np.ndarray,
+                        length     : int,
+                        multiplier : float) -> tuple[np.ndarray, np.ndarray]:
+    size = close.size
+    trend = np.full(size, np.nan)
+    direction = np.full(size, np.nan)
+    if size < length + 1:
+        return trend, direction
+
+    offset = multiplier * atr_values
+    lower = (high + low) / 2 - offset
+    upper = (high + low) / 2 + offset
+
+    side = 1.0
+    for i in range(1, size):
+        if close[i] > upper[i - 1]:
+            side = 1.0
+        elif close[i] < lower[i - 1]:
+            side = -1.0
+        else:
+            if side > 0 and lower[i] < lower[i - 1]:
+                lower[i] = lower[i - 1]
+            if side < 0 and upper[i] > upper[i - 1]:
+                upper[i] = upper[i - 1]
+
+        trend[i] = lower[i] if side > 0 else upper[i]
+        if i >= length:
+            direction[i] = side
+
+    return trend, direction
+# ________________________________________________________________________________ . . .
+
+
+@njit(cache=True)
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    result = np.empty(close.size)
+    total = 0.0
+    for i in range(close.size):
+        total += volume[i] if i == 0 else np.sign(close[i] - close[i - 1]) * volume[i]
+        result[i] = total
+
+    return result
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+# Vectorized variants of the loop kernels, which replace them when they are not compiled
+def _vectorized_ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+# ________________________________________________________________________________ . . .
+
+
+def _vectorized_sma(close: np.ndarray, length: int) -> np.ndarray:
+    result = np.full(close.size, np.nan)
+    if close.size < length:
+        return result
+
+    sums = np.cumsum(close)
+    result[length - 1:] = sums[length - 1:]
+    result[length:] -= sums[:-length]
+
+    return result / length
+# ________________________________________________________________________________ . . .
+
+
+def _vectorized_rsi(close: np.ndarray, length: int) -> np.ndarray:
+    if close.size < length + 1:
+        return np.full(close.size, np.nan)
+
+    change = np.concatenate(([np.nan], np.diff(close)))
+    positive_avg = rma(np.maximum(change, 0.0), length)
+    negative_avg = rma(np.minimum(change, 0.0), length)
+
+    return 100.0 * positive_avg / (positive_avg + np.abs(negative_avg))
+# ________________________________________________________________________________ . . .
+
+
+def _vectorized_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    result = high - low
+    if close.size > 1:
+        previous = close[:-1]
+        result[1:] = np.maximum(result[1:], np.maximum(np.abs(high[1:] - previous),
+                                                       np.abs(previous - low[1:])))
+
+    return result
+# ________________________________________________________________________________ . . .
+
+
+def _vectorized_rolling_std(close  : np.ndarray,
+                            mean   : np.ndarray,
+                            length : int,
+                            ddof   : int = 1) -> np.ndarray:
+    deviation = np.full(close.size, np.nan)
+    if close.size < length:
+        return deviation
+
+    # Deviations from the window's own mean, so no precision is lost like by cumulative sums
+    windows = sliding_window_view(close, length)
+    squares = np.square(windows - mean[length - 1:, np.newaxis]).sum(axis=1)
+    deviation[length - 1:] = np.sqrt(squares / (length - ddof))
+
+    return deviation
+# ________________________________________________________________________________ . . .
+
+
+def _vectorized_obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    signed = np.empty(close.size)
+    signed[:1] = volume[:1]
+    signed[1:] = np.sign(np.diff(close)) * volume[1:]
+
+    return np.cumsum(signed)
+# ________________________________________________________________________________ . . .
+
+
+if not JIT:
+    _ewm, sma, rsi, true_range, rolling_std, obv = (_vectorized_ewm, _vectorized_sma,
+                                                    _vectorized_rsi, _vectorized_true_range,
+                                                    _vectorized_rolling_std, _vectorized_obv)
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+class SMAState:
+    __slots__ = ('length', 'window', 'window_sum')
+
+    def __init__(self, length: int):
+        self.length     = length
+        self.window     : deque[float] = deque(maxlen=length)
+        self.window_sum = 0.0
+
+    def update(self, close: float) -> float:
+        if len(self.window) == self.length:
+            self.window_sum -= self.window[0]
+        self.window.append(close)
+        self.window_sum += close
+
+        return self.window_sum / self.length if len(self.window) == self.length else NAN
+# ________________________________________________________________________________ . . .
+
+
+class EMAState:
+    """
+    Seeded by the SMA of its first 'length' values, then smoothed by 'alpha'.
+    """
+    __slots__ = ('length', 'alpha', 'count', 'seed_sum', 'value')
+
+    def __init__(self, length: int, alpha: float | None = None):
+        self.length   = length
+        self.alpha    = alpha if alpha is not None else 2.0 / (length + 1)
+        self.count    = 0
+        self.seed_sum = 0.0
+        self.value    = NAN
+
+    def update(self, close: float) -> float:
+        self.count += 1
+        if self.count < self.length:
+            self.seed_sum += close
+        elif self.count == self.length:
+            self.value = (self.seed_sum + close) / self.length
+        else:
+            self.value = (1.0 - self.alpha) * self.value + self.alpha * close
+
+        return self.value
+# ________________________________________________________________________________ . . .
+
+
+class RMAState:
+    """
+    Wilder's smoothing, starting from the first value.
+    """
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, length: int):
+        self.alpha = 1.0 / length
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        self.value = value if math.isnan(self.value) else \
+                     (1.0 - self.alpha) * self.value + self.alpha * value
+
+        return self.value
+# ________________________________________________________________________________ . . .
+
+
+class RSIState:
+    __slots__ = ('previous', 'positive', 'negative')
+
+    def __init__(self, length: int = 14):
+        self.previous = NAN
+        self.positive = RMAState(length)
+        self.negative = RMAState(length)
+
+    def update(self, close: float) -> float:
+        change, self.previous = close - self.previous, close
+        if math.isnan(change):
+            return NAN
+
+        positive = self.positive.update(max(change, 0.0))
+        negative = self.negative.update(min(change, 0.0))
+        if positive + abs(negative) == 0:
+            return NAN
+
+        return 100.0 * positive / (positive + abs(negative))
+# ________________________________________________________________________________ . . .
+
+
+class ATRState:
+    __slots__ = ('length', 'previous_close', 'average')
+
+    def __init__(self, length: int = 14):
+        self.length         = length
+        self.previous_close = NAN
+        self.average        = EMAState(length, alpha=1.0 / length)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if not math.isnan(self.previous_close):
+            true_range = max(true_range,
+                             abs(high - self.previous_close),
+                             abs(self.previous_close - low))
+        self.previous_close = close
+
+        return self.average.update(true_range)
+# ________________________________________________________________________________ . . .
+
+
+class BBandsState:
+    __slots__ = ('length', 'std', 'ddof', 'window')
+
+    def __init__(self, length: int = 5, std: float = 2.0, ddof: int = 1):
+        self.length = length
+        self.std    = std
+        self.ddof   = ddof
+        self.window : deque[float] = deque(maxlen=length)
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        self.window.append(close)
+        if len(self.window) < self.length:
+            return NAN, NAN, NAN
+
+        mid = sum(self.window) / self.length
+        deviation = math.sqrt(sum((value - mid) ** 2 for value in self.window) /
+                              (self.length - self.ddof))
+
+        return mid - self.std * deviation, mid, mid + self.std * deviation
+# ________________________________________________________________________________ . . .
+
+
+class MACDState:
+    __slots__ = ('fast', 'slow', 'signal')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        fast, slow  = min(fast, slow), max(fast, slow)
+        self.fast   = EMAState(fast)
+        self.slow   = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        line = self.fast.update(close) - self.slow.update(close)
+        if math.isnan(line):
+            return NAN, NAN, NAN
+
+        signal = self.signal.update(line)
+        return line, signal, line - signal
+# ________________________________________________________________________________ . . .
+
+
+class SupertrendState:
+    __slots__ = ('length', 'multiplier', 'count', 'atr', 'side', 'lower', 'upper')
+
+    def __init__(self, length: int = 7, multiplier: float = 3.0):
+        self.length     = length
+        self.multiplier = multiplier
+        self.count      = 0
+        self.atr        = ATRState(length)
+        self.side       = 1.0
+        self.lower      = NAN
+        self.upper      = NAN
+
+    def update(self, high: float, low: float, close: float) -> tuple[float, float]:
+        offset = self.multiplier * self.atr.update(high, low, close)
+        lower, upper = (high + low) / 2 - offset, (high + low) / 2 + offset
+
+        self.count += 1
+        if self.count == 1:
+            self.lower, self.upper = lower, upper
+            return NAN, NAN
+
+        if close > self.upper:
+            self.side = 1.0
+        elif close < self.lower:
+            self.side = -1.0
+        else:
+            if self.side > 0 and lower < self.lower:
+                lower = self.lower
+            if self.side < 0 and upper > self.upper:
+                upper = self.upper
+
+        self.lower, self.upper = lower, upper
+        trend = lower if self.side > 0 else upper
+
+        return trend, self.side if self.count > self.length else NAN
+# ________________________________________________________________________________ . . .
+
+
+class OBVState:
+    __slots__ = ('previous', 'total')
+
+    def __init__(self):
+        self.previous = NAN
+        self.total    = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if math.isnan(self.previous):
+            self.total += volume
+        elif close != self.previous:
+            self.total += volume if close > self.previous else -volume
+        self.previous = close
+
+        return self.total
+# =================================================================================================
@@ -4,10 +4,11 @@ import pandas as pd
 from dotenv import load_dotenv
 from typing import Coroutine, Callable
 
-load_dotenv('project_path.env')
-path = os.getenv('PYTHONPATH')
-if path:
-    sys.path.append(path)
+if __name__ == '__main__':
+    load_dotenv('project_path.env')
+    path = os.getenv('PYTHONPATH')
+    if path:
+        sys.path.append(path)
 
 import Application.trading.analysis.indicator_functions as indicators    # noqa: E402
 from Application.trading.analysis.indicator_classes import Supertrend    # noqa: E402
@@ -1,12 +1,15 @@
 import sys
 import asyncio
 import pandas as pd
+from typing import Any
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import trade_logs                                  # noqa: E402
+from Application.utils.tracing import traced                        # noqa: E402
 from Application.utils.event_channels import Event                  # noqa: E402
 from Application.trading import strategy_fields as strategy         # noqa: E402
 from Application.utils.simplified_event_handler import EventHandler # noqa: E402
@@ -16,34 +19,98 @@ jarchi.register_event(Event.MARKET_IS_VALID, [])
 
 
 
+# Verdicts of the market validators on the last candle, a verdict holds until the candle closes
+_verdicts: dict[str, Any] = {'candle': None, 'verdicts': {}}
+
+
+def _candle_verdicts(kline_df: pd.DataFrame) -> dict[str, bool]:
+    candle = kline_df.index[-1] if len(kline_df) else None
+
+    if candle != _verdicts['candle']:
+        _verdicts.update(candle=candle, verdicts={})
+
+    return _verdicts['verdicts']
+# ________________________________________________________________________________ . . .
+
+
+def _validator_key(setup: dict) -> str:
+    return f"{setup['name']}{sorted(setup['properties'].items())}"
+# ________________________________________________________________________________ . . .
+
+
+def market_verdict(kline_df: pd.DataFrame) -> bool | None:
+    """
+    Returns the verdict of the market validation on the last candle of the kline if it is already
+    known, so the validation indicators do not need to be computed again.
+
+    Returns:
+        verdict (bool | None): False if a validator rejected the candle, True if all of them
+                               accepted it, None otherwise.
+    """
+    verdicts = _candle_verdicts(kline_df)
+    setup_verdicts = [verdicts.get(_validator_key(setup))
+                      for setup in strategy.MARKET_VALIDATION_SYSTEM]
+
+    if False in setup_verdicts:
+        return False
+    if None in setup_verdicts:
+        return None
+    return True
+# ________________________________________________________________________________ . . .
+
+
+@traced('market_validation')
 async def execute_validator_functions(kline_df                 : pd.DataFrame,
                                       validation_indicators_df : pd.DataFrame):
     """
     Executes validator functions Asynchronously and emits on MARKET_IS_VALID event channel.
 
+    Validators run concurrently, the first one which rejects the market cancels the others. The
+    verdicts are cached per candle, so only the validators without a verdict on the last candle
+    are executed.
+
     Parameters:
-        validator_functions (set): The set of market validator functions to be executed.
+        kline_df (DataFrame): kline DataFrame.
+        validation_indicators_df (DataFrame): Indicators of the market validation system.
     """
+    tasks: dict[asyncio.Task, str] = {}
     try:
-        coroutines = set()
+        verdicts = _candle_verdicts(kline_df)
+
         for setup in strategy.MARKET_VALIDATION_SYSTEM:
-            coroutines.add(setup["function"](
+            key = _validator_key(setup)
+            if verdicts.get(key) is False:
+                trade_logs.info(f'Market validator "{setup["name"]}" already rejected this candle.')
+                return
+            if key in verdicts:
+                continue
+
+            tasks[asyncio.create_task(setup["function"](
                 kline_df                 = kline_df,
                 validation_indicators_df = validation_indicators_df,
                 properties               = setup['properties']
-            ))
+            ))] = key
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
 
-        results = await asyncio.gather(*coroutines)
+            for task in done:
+                verdicts[tasks[task]] = task.result() == 'valid'
+                if not verdicts[tasks[task]]:
+                    trade_logs.info(f'Market got rejected by "{tasks[task]}" validator.')
+                    return
 
-        if all(result=='valid' for result in results):
-            trade_logs.info('Market validated successfully.')
-            trade_logs.info(f'Broadcasting "{Event.MARKET_IS_VALID}" event from '\
-                        '"trading.market.validator.execute_validator_functions()" function.')
-            
-            await jarchi.emit(Event.MARKET_IS_VALID)
+        trade_logs.info('Market validated successfully.')
+        trade_logs.info(f'Broadcasting "{Event.MARKET_IS_VALID}" event from '\
+                    '"trading.market.validator.execute_validator_functions()" function.')
+
+        await jarchi.emit(Event.MARKET_IS_VALID)
 
     except Exception as err:
         trade_logs.error('Inside "trading.market.validator.execute_validator_functions()": ',
                         err)
+    finally:
+        for task in tasks:
+            task.cancel()
 # ____________________________________________________________________________ . . .
-
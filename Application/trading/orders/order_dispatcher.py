@@ -0,0 +1,195 @@
+import sys
+import uuid
+import httpx
+import asyncio
+import itertools
+from enum import IntEnum
+from typing import Any
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application import trade_logs                              # noqa: E402
+from Application.utils import tracing                           # noqa: E402
+from Application.data.user import User                          # noqa: E402
+from Application.api.nobitex_api import Trade                   # noqa: E402
+import Application.configs.admin_config as aconfig              # noqa: E402
+from Application.api.api_service import APIService              # noqa: E402
+from Application.api.rate_limits import endpoint_throttle       # noqa: E402
+
+
+
+
+# =================================================================================================
+class OrderPriority(IntEnum):
+    """
+    Dispatch priority of order intents, lower values are submitted first.
+    """
+    PROTECTIVE = 0    # Stop-loss (stop_limit, stop_market and oco) orders of open positions
+    ENTRY      = 1    # Orders opening or scaling into a trade
+    EXIT       = 2    # Take-profit orders
+# ________________________________________________________________________________ . . .
+
+
+class OrderIntent:
+    """
+    An order to be placed by the dispatcher, along with the future of its exchange result.
+    """
+    __slots__ = ('environment', 'side', 'src_currency', 'dst_currency', 'amount', 'priority',
+                 'client_oid', 'params', 'future', 'trace')
+
+    def __init__(self,
+                 environment  : str,
+                 side         : str,
+                 src_currency : str,
+                 dst_currency : str,
+                 amount       : float,
+                 priority     : OrderPriority | None = None,
+                 client_oid   : str | None = None,
+                 **params):
+        """
+        Parameters:
+            environment (str): 'spot' or 'futures'.
+            side (str): Order side ('buy' or 'sell').
+            src_currency (str): Source currency.
+            dst_currency (str): Destination currency.
+            amount (float): Amount to trade.
+            priority (OrderPriority): Dispatch priority, derived from the order type if not given.
+            client_oid (str): Idempotency key of the order, generated if not given. The same key is
+                              sent on every retry so a retried order can not be filled twice.
+            params: 'execution' or 'mode', 'price', 'stop_price', 'stop_limit_price', 'leverage'
+                    as accepted by 'Trade._base_place_order()'.
+
+        The trace of the tick which produced the intent is captured, so its placement is measured
+        from the arrival of that tick.
+        """
+        self.environment  = environment
+        self.side         = side
+        self.src_currency = src_currency
+        self.dst_currency = dst_currency
+        self.amount       = amount
+        self.params       = params
+        self.client_oid   = client_oid or uuid.uuid4().hex
+        self.priority     = priority if priority is not None else self._default_priority()
+        self.future       : asyncio.Future | None = None
+        self.trace        = tracing.current_trace()
+    # ____________________________________________________________________________ . . .
+
+    def _default_priority(self) -> OrderPriority:
+        if self.params.get('mode') == 'oco' or \
+           self.params.get('execution') in {'stop_limit', 'stop_market'}:
+            return OrderPriority.PROTECTIVE
+
+        return OrderPriority.ENTRY
+# ________________________________________________________________________________ . . .
+
+
+class OrderDispatcher:
+    """
+    Dispatch queue of order intents.
+
+    Intents are submitted concurrently by a pool of workers in order of their priority, so
+    protective stop orders of open positions overtake pending entries. The stop-loss of a new
+    trade is not dispatched along its entry, it follows the entry fill (see
+    'OrderStateMachine.place_bracket()').
+
+    Each placement waits for the shared rate limit of its endpoint, which is shared with every
+    other caller of the endpoint.
+    """
+    def __init__(self,
+                 trade   : Trade | None = None,
+                 token   : str | None = None,
+                 workers : int = aconfig.Trade.Place.Dispatch.WORKERS):
+        self.trade = trade or Trade(APIService())
+        self.token = token or User.TOKEN
+        self.workers = workers
+
+        self._queue: asyncio.PriorityQueue | None = None
+        self._sequence = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+        self._http_agent: httpx.AsyncClient | None = None
+    # ____________________________________________________________________________ . . .
+
+    def submit(self, intent: OrderIntent) -> asyncio.Future:
+        """
+        Queues an order intent for placement.
+
+        Returns:
+            future (asyncio.Future): Resolves to the exchange response of the order, or to the
+                                     exception raised while placing it.
+        """
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+
+        intent.future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((intent.priority, next(self._sequence), intent))
+
+        return intent.future
+    # ____________________________________________________________________________ . . .
+
+    async def start(self) -> None:
+        """
+        Starts the dispatch workers.
+        """
+        if self._tasks:
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+
+        self._http_agent = httpx.AsyncClient()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        trade_logs.info(f'"OrderDispatcher" started with {self.workers} workers.')
+    # ____________________________________________________________________________ . . .
+
+    async def stop(self) -> None:
+        """
+        Waits for the queued intents to be dispatched and stops the workers.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._http_agent is not None:
+            await self._http_agent.aclose()
+            self._http_agent = None
+    # ____________________________________________________________________________ . . .
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, intent = await self._queue.get()    # type: ignore
+            try:
+                if not intent.future.done():
+                    with tracing.resume(intent.trace):
+                        intent.future.set_result(await self._place(intent))
+            except asyncio.CancelledError:
+                intent.future.cancel()
+                raise
+            except Exception as err:
+                trade_logs.error(f'Placing order "{intent.client_oid}" failed: {err}')
+                if not intent.future.done():
+                    intent.future.set_exception(err)
+            finally:
+                self._queue.task_done()    # type: ignore
+    # ____________________________________________________________________________ . . .
+
+    async def _place(self, intent: OrderIntent) -> dict[str, Any]:
+        endpoint_name = 'PLACE_SPOT_ORDER' if intent.environment == 'spot' else 'PLACE_FUTURES_ORDER'
+        await endpoint_throttle(endpoint_name, spaced=False).acquire()
+
+        return await self.trade._base_place_order(http_agent   = self._http_agent,
+                                                  token        = self.token,
+                                                  environment  = intent.environment,
+                                                  side         = intent.side,
+                                                  src_currency = intent.src_currency,
+                                                  dst_currency = intent.dst_currency,
+                                                  amount       = intent.amount,
+                                                  client_oid   = intent.client_oid,
+                                                  **intent.params)
+# =================================================================================================
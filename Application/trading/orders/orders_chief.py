@@ -1,11 +1,25 @@
 import sys
+import json
+import time
+import httpx
+import asyncio
+from enum import IntEnum
+from typing import Any, Iterable
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
+from Application import trade_logs    # noqa: E402
+import Application.configs.admin_config as aconfig    # noqa: E402
 from Application.utils.event_channels import Event    # noqa: E402
+from Application.data.trade_store import TradeStore    # noqa: E402
+from Application.api.retry_policy import CircuitOpenError    # noqa: E402
 from Application.utils.simplified_event_handler import EventHandler    # noqa: E402
+from Application.trading.orders.order_dispatcher import OrderDispatcher,\
+                                                        OrderIntent,\
+                                                        OrderPriority    # noqa: E402
 from Application.trading.orders.order_executioner import stop_loss_executioner,\
                                                          trade_entry_executioner,\
                                                          combo_tp_sl_executioner,\
@@ -13,22 +27,379 @@ from Application.trading.orders.order_executioner import stop_loss_executioner,\
 
 jarchi = EventHandler()
 
+_engine: dict[str, Any] = {'machine': None, 'store_task': None}
 
 
-async def start_orders_engine():
+
+async def start_orders_engine() -> 'OrderStateMachine':
     """
-    Starts the orders engine.
+    Starts the orders engine, the live sync of the 'TradeStore' which the engine follows, the
+    state machine which tracks every order placed by the bot and the executioners of the valid
+    signals. Starting it again returns the running state machine.
     """
+    machine = order_state_machine()
+    if machine is not None:
+        return machine
+
+    _engine['store_task'] = asyncio.create_task(TradeStore().live())
+    _engine['machine'] = machine = await orders_state_machine()
+
     jarchi.attach(stop_loss_executioner, Event.VALID_SL_SIGNAL)
     jarchi.attach(take_profit_executioner, Event.VALID_TP_SIGNAL)
     jarchi.attach(combo_tp_sl_executioner, Event.VALID_TP_SL_SIGNAL)
     jarchi.attach(trade_entry_executioner, Event.VALID_ENTRY_SIGNAL)
+
+    return machine
+# ________________________________________________________________________________ . . .
+
+
+def order_state_machine() -> 'OrderStateMachine | None':
+    """
+    Returns the state machine of the running orders engine, which the executioners place their
+    orders through.
+    """
+    return _engine['machine']
 # ________________________________________________________________________________ . . .
 
 
-async def orders_state_machine():
+async def orders_state_machine(dispatcher: OrderDispatcher | None = None) -> 'OrderStateMachine':
     """
     Manages state of orders.
+
+    Starts the dispatcher and the order state machine, which follows the order events of the
+    'TradeStore' and periodically reconciles the tracked orders against its polled state.
+    """
+    dispatcher = dispatcher or OrderDispatcher()
+    await dispatcher.start()
+
+    machine = OrderStateMachine(dispatcher)
+    machine.attach()
+    machine.reconcile_task = asyncio.create_task(machine.live_reconcile())
+
+    return machine
+# ________________________________________________________________________________ . . .
+
+
+
+
+# =================================================================================================
+class OrderState(IntEnum):
+    """
+    Lifecycle states of an order, terminal states have the highest values.
+    """
+    NEW              = 0    # Tracked, not yet accepted by the exchange
+    UNKNOWN          = 1    # Placement timed out or failed in transport, it may have been accepted
+    ACKNOWLEDGED     = 2    # Accepted by the exchange, nothing filled yet
+    PARTIALLY_FILLED = 3
+    FILLED           = 4
+    CANCELED         = 5
+    REJECTED         = 6
+# ________________________________________________________________________________ . . .
+
+
+TERMINAL_STATES = frozenset({OrderState.FILLED, OrderState.CANCELED, OrderState.REJECTED})
+
+FOLLOW_UP_ROLES = {OrderPriority.PROTECTIVE : 'stop_loss',
+                   OrderPriority.ENTRY      : 'entry',
+                   OrderPriority.EXIT       : 'take_profit'}
+
+
+class OrderRecord:
+    """
+    Compact state record of an order placed by the bot.
+    """
+    __slots__ = ('client_oid', 'order_id', 'role', 'amount', 'filled', 'state', 'follow_ups',
+                 'updated_at')
+
+    def __init__(self,
+                 client_oid : str,
+                 role       : str,
+                 amount     : float,
+                 follow_ups : tuple[OrderIntent, ...] = ()):
+        self.client_oid = client_oid
+        self.order_id   : str | None = None
+        self.role       = role
+        self.amount     = amount
+        self.filled     : float = 0.0
+        self.state      = OrderState.NEW
+        self.follow_ups = follow_ups
+        self.updated_at = time.monotonic()
+
+    def __repr__(self) -> str:
+        return (f'OrderRecord({self.client_oid!r}, {self.role!r}, {self.state.name}, '
+                f'{self.filled}/{self.amount})')
+# ________________________________________________________________________________ . . .
+
+
+def exchange_order_state(order: dict[str, Any], amount: float) -> tuple[OrderState, float]:
+    """
+    Maps an order of the exchange API to its lifecycle state and filled amount.
+    """
+    filled = float(order.get('matchedAmount') or 0)
+    status = order.get('status')
+
+    if status == 'Canceled':
+        return OrderState.CANCELED, filled
+    if status == 'Done' or (filled > 0 and filled >= amount):
+        return OrderState.FILLED, filled
+    if filled > 0:
+        return OrderState.PARTIALLY_FILLED, filled
+
+    return OrderState.ACKNOWLEDGED, filled
+# ________________________________________________________________________________ . . .
+
+
+class OrderStateMachine:
+    """
+    Event driven state machine of the orders placed by the bot.
+
+    Every order goes NEW -> ACKNOWLEDGED -> PARTIALLY_FILLED -> FILLED | CANCELED | REJECTED.
+    Transitions only move forward, so stale or repeated updates of the polled exchange state are
+    harmless. An order whose placement timed out is UNKNOWN until the reconciliation finds it by
+    its client order id, or rejects it once it has not shown up for 'UNKNOWN_TIMEOUT' seconds.
+
+    When an order gets filled, or canceled after a partial fill, its follow-up intents (e.g. the
+    stop-loss and take-profit of an entry) are submitted to the dispatcher for the filled amount
+    and tracked as well.
+
+    Updates are applied to plain slotted records found through dict lookups, so the machine keeps
+    up with thousands of updates per second without touching any DataFrame.
     """
-    pass
-# ________________________________________________________________________________ . . .
\ No newline at end of file
+    def __init__(self, dispatcher: OrderDispatcher, store: TradeStore | None = None):
+        self.dispatcher = dispatcher
+        self.store      = store
+        self.records    : dict[str, OrderRecord] = {}
+        self.order_ids  : dict[str, str] = {}
+        self.reconcile_task: asyncio.Task | None = None
+    # ____________________________________________________________________________ . . .
+
+    def attach(self) -> None:
+        """
+        Follows the order events of the 'TradeStore'.
+        """
+        self.store = self.store or TradeStore()
+        for event in (Event.ORDER_FILLED, Event.ORDER_CANCELED, Event.ORDER_PARTIALLY_FILLED):
+            jarchi.attach(self.on_order_event, event)
+    # ____________________________________________________________________________ . . .
+
+    def track(self,
+              intent    : OrderIntent,
+              role      : str = 'entry',
+              follow_up : OrderIntent | tuple[OrderIntent, ...] | None = None) -> OrderRecord:
+        """
+        Starts tracking an order intent from the NEW state.
+
+        Parameters:
+            intent (OrderIntent): The order to track.
+            role (str): Role of the order in its trade, e.g. 'entry', 'stop_loss', 'take_profit'.
+            follow_up (OrderIntent | tuple): Order(s) to submit once this one gets filled, their
+                                             amount is set to the filled amount.
+        """
+        follow_ups = (follow_up,) if isinstance(follow_up, OrderIntent) else (follow_up or ())
+        record = OrderRecord(intent.client_oid, role, intent.amount, follow_ups)
+        self.records[intent.client_oid] = record
+
+        return record
+    # ____________________________________________________________________________ . . .
+
+    def place(self,
+              intent    : OrderIntent,
+              role      : str = 'entry',
+              follow_up : OrderIntent | tuple[OrderIntent, ...] | None = None) -> OrderRecord:
+        """
+        Tracks and submits an order intent, its record gets acknowledged or rejected as soon as
+        the exchange responds, or gets UNKNOWN if the exchange did not respond.
+        """
+        record = self.track(intent, role, follow_up)
+        future = self.dispatcher.submit(intent)
+        future.add_done_callback(lambda future: self._acknowledge(record, future))
+
+        return record
+    # ____________________________________________________________________________ . . .
+
+    def place_bracket(self,
+                      entry       : OrderIntent,
+                      stop_loss   : OrderIntent | None = None,
+                      take_profit : OrderIntent | None = None) -> OrderRecord:
+        """
+        Places the entry of a trade, its stop-loss and take-profit are placed once it gets filled,
+        since they can not protect a position that does not exist yet.
+
+        Returns:
+            record (OrderRecord): The record of the entry order.
+        """
+        if stop_loss:
+            stop_loss.priority = OrderPriority.PROTECTIVE
+        if take_profit:
+            take_profit.priority = OrderPriority.EXIT
+
+        follow_ups = tuple(intent for intent in (stop_loss, take_profit) if intent)
+        return self.place(entry, role='entry', follow_up=follow_ups)
+    # ____________________________________________________________________________ . . .
+
+    def get(self, client_oid: str) -> OrderRecord | None:
+        return self.records.get(client_oid)
+    # ____________________________________________________________________________ . . .
+
+    def active(self) -> list[OrderRecord]:
+        return [record for record in self.records.values() if record.state not in TERMINAL_STATES]
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    def update(self, order: dict[str, Any]) -> OrderState | None:
+        """
+        Applies an order of the exchange API to the record of it, if it is tracked.
+
+        Returns:
+            state (OrderState | None): The new state if the record transitioned, else None.
+        """
+        record = self._find(order)
+        if record is None:
+            return None
+
+        if record.order_id is None and order.get('id') is not None:
+            record.order_id = str(order['id'])
+            self.order_ids[record.order_id] = record.client_oid
+
+        state, filled = exchange_order_state(order, record.amount)
+        return self._transition(record, state, filled)
+    # ____________________________________________________________________________ . . .
+
+    def reconcile(self, orders: Iterable[dict[str, Any]]) -> int:
+        """
+        Applies a batch of polled exchange orders.
+
+        Returns:
+            transitions (int): Number of records which changed state.
+        """
+        return sum(self.update(order) is not None for order in orders)
+    # ____________________________________________________________________________ . . .
+
+    async def on_order_event(self, order: dict[str, Any]) -> None:
+        self.update(order)
+    # ____________________________________________________________________________ . . .
+
+    async def live_reconcile(self,
+                             interval: float = aconfig.Trade.Lifecycle.RECONCILE_INTERVAL) -> None:
+        """
+        Periodically reconciles the active records against the orders polled by the store, in case
+        an update event got missed.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            transitions = self.reconcile_store()
+            if transitions:
+                trade_logs.info(f'Order reconciliation moved {transitions} orders forward.')
+    # ____________________________________________________________________________ . . .
+
+    def reconcile_store(self,
+                        unknown_timeout: float = aconfig.Trade.Lifecycle.UNKNOWN_TIMEOUT) -> int:
+        """
+        Reconciles the active records against the orders of the store by their client order id.
+        UNKNOWN records which have not shown up within 'unknown_timeout' seconds never reached the
+        exchange, and get rejected.
+
+        Returns:
+            transitions (int): Number of records which changed state.
+        """
+        if self.store is None:
+            return 0
+
+        transitions, now = 0, time.monotonic()
+        for record in self.active():
+            order = self.store.order_by_client_id(record.client_oid)
+            if order is not None:
+                transitions += self.update(order) is not None
+            elif record.state == OrderState.UNKNOWN and now - record.updated_at > unknown_timeout:
+                trade_logs.error(f'Order "{record.client_oid}" ({record.role}) did not reach the '
+                                 f'exchange, it got rejected.')
+                transitions += self._transition(record, OrderState.REJECTED, record.filled) \
+                               is not None
+
+        return transitions
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    def _find(self, order: dict[str, Any]) -> OrderRecord | None:
+        client_oid = order.get('clientOrderId')
+        if client_oid is None and order.get('id') is not None:
+            client_oid = self.order_ids.get(str(order['id']))
+
+        return self.records.get(client_oid) if client_oid else None
+    # ____________________________________________________________________________ . . .
+
+    def _transition(self,
+                    record : OrderRecord,
+                    state  : OrderState,
+                    filled : float) -> OrderState | None:
+        if record.state in TERMINAL_STATES:
+            return None
+
+        grew = filled > record.filled
+        record.filled = max(record.filled, filled)
+        if state < record.state or (state == record.state and not grew):
+            return None
+
+        record.state      = state
+        record.updated_at = time.monotonic()
+        trade_logs.info(f'Order "{record.client_oid}" ({record.role}) is {state.name} '
+                        f'({record.filled}/{record.amount}).')
+
+        if state == OrderState.FILLED or (state == OrderState.CANCELED and record.filled > 0):
+            self._follow_up(record)
+
+        return state
+    # ____________________________________________________________________________ . . .
+
+    def _acknowledge(self, record: OrderRecord, future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        response: dict[str, Any] = {} if error else (future.result() or {})
+
+        # Without a response the order may still have been accepted, the reconciliation resolves it
+        if (error is None and not response) or _may_have_reached_exchange(error):
+            trade_logs.warning(f'Order "{record.client_oid}" ({record.role}) got no response, its '
+                               f'placement is unknown: {error!r}')
+            self._transition(record, OrderState.UNKNOWN, record.filled)
+            return
+
+        if error is not None or response.get('status') != 'ok':
+            reason = error or response.get('message')
+            trade_logs.error(f'Order "{record.client_oid}" ({record.role}) got rejected: {reason}')
+            self._transition(record, OrderState.REJECTED, record.filled)
+            return
+
+        order = dict(response.get('order') or {})
+        order.setdefault('clientOrderId', record.client_oid)
+        self.update(order)
+    # ____________________________________________________________________________ . . .
+
+    def _follow_up(self, record: OrderRecord) -> None:
+        intents, record.follow_ups = record.follow_ups, ()
+
+        for intent in intents:
+            intent.amount = record.filled or record.amount
+            trade_logs.info(f'Order "{record.client_oid}" is {record.state.name} '
+                            f'({record.filled}), placing its follow-up order "{intent.client_oid}".')
+            self.place(intent, role=FOLLOW_UP_ROLES[intent.priority])
+# ________________________________________________________________________________ . . .
+
+
+def _may_have_reached_exchange(error: BaseException | None) -> bool:
+    """
+    Whether a failed placement may still have been sent to the exchange, i.e. it timed out, failed
+    in transport or its response could not be read. An open circuit never sends the request.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+
+    return isinstance(error, (httpx.HTTPError, json.JSONDecodeError))
+# =================================================================================================
@@ -1,20 +1,33 @@
 import sys
+import math
 import httpx
 import asyncio
+from typing import NamedTuple
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application.data.user import User             # noqa: E402
-from Application.utils.load_json import load       # noqa: E402
 from Application.api.nobitex_api import Market     # noqa: E402
 from Application.api.nobitex_api import Account    # noqa: E402
+from Application.data.data_hub import DataHub      # noqa: E402
+from Application.utils.logs import get_logger      # noqa: E402
 from Application.api.api_service import APIService # noqa: E402
+from Application.data.trade_store import TradeStore # noqa: E402
+import Application.configs.admin_config as aconfig # noqa: E402
+from Application.trading import strategy_fields as strategy # noqa: E402
 
 account = Account(APIService())
 market = Market(APIService())
 
+bot_logs = get_logger(logger_name='bot_logs')
+
+POSITION_SIZE_FIELD = 'liability'
+STOP_SIZE_FIELD = 'unmatchedAmount'
+USD_RATE_PAIR = 'usdt-rls'
+
 
 
 # =================================================================================================
@@ -50,12 +63,314 @@ async def get_allowed_exposure():
     Returns:
         allowed_exposure (float): The allowed_exposure balance in 'USD'.
     """
-    strategy_cfg = load(r'Application/configs/strategy.json')
-    _, usd_portfolio_balance = await fetch_portfolio_balance()
+    balance = PortfolioRiskEngine().balance
+    _, usd_portfolio_balance = balance if balance else await fetch_portfolio_balance()
 
-    allowed_exposure = usd_portfolio_balance * strategy_cfg['portfolio_exposure']
+    allowed_exposure = usd_portfolio_balance * strategy.PORTFOLIO_EXPOSURE
     return allowed_exposure
-    
+
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+class PairRisk(NamedTuple):
+    """
+    Risk of the open positions of a pair, or of the whole portfolio, in 'USD'.
+
+    Attributes:
+        exposure (float): Value of the positions at the market price.
+        open_risk (float): Loss of the positions if their stop losses get hit, positions without
+                           stop loss risk their whole value.
+        margin (float): Collateral locked by the positions.
+    """
+    exposure  : float = 0.0
+    open_risk : float = 0.0
+    margin    : float = 0.0
+# ________________________________________________________________________________ . . .
+
+
+def _number(record: dict, field: str, default: float = 0.0) -> float:
+    value = record.get(field)
+    return float(value) if value not in (None, '') else default
+# ________________________________________________________________________________ . . .
+
+
+def _is_stop(order: dict) -> bool:
+    return str(order.get('execution', '')).lower().startswith('stop')
+# ________________________________________________________________________________ . . .
+
+
+def _side_risk(size: float, price: float, stop_amount: float, stop_value: float,
+               direction: int) -> float:
+    """
+    Loss of one side of a pair at its stop losses, the part of the size which is not covered by
+    any stop order risks its whole value.
+    """
+    if size <= 0:
+        return 0.0
+
+    covered = min(size, stop_amount)
+    stop_price = stop_value / stop_amount if stop_amount > 0 else price
+
+    return covered * max(0.0, direction * (price - stop_price)) + (size - covered) * price
+# ________________________________________________________________________________ . . .
+
+
+class PortfolioRiskEngine:
+    """
+    Maintains exposure, open risk to stop and margin usage of the open positions, per pair and in
+    total, and answers whether a new trade fits the risk limits of the portfolio without any HTTP
+    call.
+
+    The engine follows the positions and open orders of the 'TradeStore' and the price table of
+    the 'DataHub' incrementally. The store replaces the record of every changed position or order,
+    so records are compared by identity and only the pairs whose records or prices changed get
+    revalued.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super(PortfolioRiskEngine, cls).__new__(cls)
+            cls._instance._initialize_data()
+
+        return cls._instance
+    # ____________________________________________________________________________ . . .
+
+    def _initialize_data(self) -> None:
+        self.store      : TradeStore | None          = None
+        self.hub        : DataHub | None             = None
+        self.balance    : tuple[float, float] | None = None
+        self.records    : dict[str, dict]            = {}
+        self.books      : dict[str, dict[str, dict]] = {}
+        self.prices     : dict[str, float | None]    = {}
+        self.pair_risks : dict[str, PairRisk]        = {}
+        self.unvalued   : set[str]                   = set()
+        self.total      : PairRisk                   = PairRisk()
+
+        bot_logs.info('"PortfolioRiskEngine" has initialized data values.')
+    # ____________________________________________________________________________ . . .
+
+    def set_balance(self, portfolio_balance: tuple[float, float]) -> None:
+        """
+        Sets the portfolio balance as a (rials, usd) tuple, like the ones which
+        'Account.live_fetch_portfolio_balance()' yields. Without a rate in the price table, the
+        'Rial' pairs are valued by the rate which is implied by the balance.
+        """
+        self.balance = portfolio_balance
+
+        if not self.prices.get(USD_RATE_PAIR):
+            for pair in [pair for pair in self.books if pair.endswith('-rls')]:
+                self._revalue(pair)
+            self._sum_total()
+    # ____________________________________________________________________________ . . .
+
+    def pair_risk(self, src_currency: str, dst_currency: str) -> PairRisk:
+        self.refresh()
+        return self.pair_risks.get(f'{src_currency}-{dst_currency}', PairRisk())
+    # ____________________________________________________________________________ . . .
+
+    def total_risk(self) -> PairRisk:
+        self.refresh()
+        return self.total
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    def refresh(self) -> None:
+        """
+        Applies the changed positions, stop orders and prices since the last refresh.
+        """
+        self.store = self.store or TradeStore()
+        self.hub = self.hub or DataHub()
+
+        orders = self.store.orders
+        records = dict(self.store.positions)
+        records.update((f'order-{order_id}', orders[order_id])
+                       for order_id in self.store.open_order_ids if _is_stop(orders[order_id]))
+
+        changed = {self._drop(record_id) for record_id in self.records.keys() - records.keys()}
+        for record_id, record in records.items():
+            if self.records.get(record_id) is not record:
+                if record_id in self.records:
+                    changed.add(self._drop(record_id))
+                changed.add(self._put(record_id, record))
+
+        prices = self.hub.market_prices
+        if prices.get(USD_RATE_PAIR) != self.prices.get(USD_RATE_PAIR):
+            self.prices[USD_RATE_PAIR] = prices.get(USD_RATE_PAIR)
+            changed.update(pair for pair in self.books if pair.endswith('-rls'))
+
+        for pair in self.books:
+            price = prices.get(pair)
+            if price is not None and price != self.prices.get(pair):
+                self.prices[pair] = price
+                changed.add(pair)
+
+        for pair in changed:
+            self._revalue(pair)
+        if changed:
+            self._sum_total()
+    # ____________________________________________________________________________ . . .
+
+    def _put(self, record_id: str, record: dict) -> str:
+        pair = f'{record.get("srcCurrency")}-{record.get("dstCurrency")}'
+        self.records[record_id] = record
+        self.books.setdefault(pair, {})[record_id] = record
+        return pair
+    # ____________________________________________________________________________ . . .
+
+    def _drop(self, record_id: str) -> str:
+        record = self.records.pop(record_id)
+        pair = f'{record.get("srcCurrency")}-{record.get("dstCurrency")}'
+        self.books[pair].pop(record_id, None)
+        return pair
+    # ____________________________________________________________________________ . . .
+
+    def _usd_rate(self, dst_currency: str) -> float | None:
+        """
+        Returns the price of 'USD' in the destination currency, the rate of the price table or the
+        one implied by the portfolio balance.
+        """
+        if dst_currency == 'usdt':
+            return 1.0
+
+        if dst_currency == 'rls':
+            rate = self.prices.get(USD_RATE_PAIR)
+            if rate:
+                return float(rate)
+            if self.balance and self.balance[1]:
+                return self.balance[0] / self.balance[1]
+
+        return None
+    # ____________________________________________________________________________ . . .
+
+    def _revalue(self, pair: str) -> None:
+        self.unvalued.discard(pair)
+
+        if self.books.get(pair):
+            self.pair_risks[pair] = self._pair_risk(pair, self.books[pair])
+        else:
+            for table in (self.books, self.prices, self.pair_risks):
+                table.pop(pair, None)
+    # ____________________________________________________________________________ . . .
+
+    def _sum_total(self) -> None:
+        self.total = PairRisk(*(math.fsum(values) for values in zip(*self.pair_risks.values()))) \
+                     if self.pair_risks else PairRisk()
+    # ____________________________________________________________________________ . . .
+
+    def _pair_risk(self, pair: str, book: dict[str, dict]) -> PairRisk:
+        long_size = short_size = entry_value = margin = 0.0
+        # Sell stops protect the long positions and buy stops the short ones
+        stops = {'sell': [0.0, 0.0], 'buy': [0.0, 0.0]}
+
+        for record in book.values():
+            if 'execution' in record:
+                amount = _number(record, STOP_SIZE_FIELD)
+                stop_price = _number(record, 'stopPrice') or _number(record, 'param1')
+                side = stops.get(record.get('type', ''))
+                if side is not None and stop_price > 0:
+                    side[0] += amount
+                    side[1] += amount * stop_price
+                continue
+
+            size = _number(record, POSITION_SIZE_FIELD)
+            entry_price = _number(record, 'entryPrice')
+            if record.get('side') == 'sell':
+                short_size += size
+            else:
+                long_size += size
+
+            entry_value += size * entry_price
+            margin += _number(record, 'collateral',
+                              size * entry_price / _number(record, 'leverage', 1.0))
+
+        size = long_size + short_size
+        price = self.prices.get(pair) or (entry_value / size if size else 0.0)
+        rate = self._usd_rate(pair.rsplit('-', 1)[-1])
+        if rate is None:
+            self.unvalued.add(pair)
+            return PairRisk()
+
+        (long_stop_amount, long_stop_value), (short_stop_amount, short_stop_value) = \
+            stops['sell'], stops['buy']
+        open_risk = _side_risk(long_size, price, long_stop_amount, long_stop_value, direction=1) \
+                    + _side_risk(short_size, price, short_stop_amount, short_stop_value,
+                                 direction=-1)
+
+        return PairRisk(exposure  = size * price / rate,
+                        open_risk = open_risk / rate,
+                        margin    = margin / rate)
+    # ____________________________________________________________________________ . . .
+
+
+
+
+
+    def rejection_reason(self,
+                         src_currency    : str,
+                         dst_currency    : str,
+                         size            : float,
+                         entry_price     : float,
+                         stop_loss_price : float,
+                         leverage        : float = 1.0) -> str | None:
+        """
+        Checks a new trade against the risk limits of the portfolio.
+
+        Parameters:
+            src_currency (str): Source currency of the pair (e.g. 'btc').
+            dst_currency (str): Destination currency of the pair (e.g. 'usdt').
+            size (float): Position size in the source currency.
+            entry_price (float): Entry price of the position.
+            stop_loss_price (float): Stop loss price of the position.
+            leverage (float): Leverage of the position.
+
+        Returns:
+            reason (str | None): The limit the trade would break, None if it fits all of them.
+        """
+        self.refresh()
+
+        if not self.balance or not self.balance[1]:
+            return 'portfolio balance is unknown'
+        if self.unvalued:
+            return f'risk of {sorted(self.unvalued)} can not be valued in USD'
+
+        rate = self._usd_rate(dst_currency)
+        if rate is None:
+            return f'"{dst_currency}" can not be valued in USD'
+
+        capital = self.balance[1]
+        value = size * entry_price / rate
+
+        if self.total.exposure + value > capital * strategy.PORTFOLIO_EXPOSURE:
+            return 'exposure limit'
+        if self.total.open_risk + size * abs(entry_price - stop_loss_price) / rate \
+           > capital * aconfig.PortfolioRisk.MAX_OPEN_RISK:
+            return 'open risk limit'
+        if self.total.margin + value / leverage > capital * aconfig.PortfolioRisk.MAX_MARGIN_USAGE:
+            return 'margin limit'
+
+        return None
+    # ____________________________________________________________________________ . . .
+
+    def can_open(self,
+                 src_currency    : str,
+                 dst_currency    : str,
+                 size            : float,
+                 entry_price     : float,
+                 stop_loss_price : float,
+                 leverage        : float = 1.0) -> bool:
+        """
+        Returns whether a new trade fits the risk limits of the portfolio, see
+        'rejection_reason()'.
+        """
+        return self.rejection_reason(src_currency, dst_currency, size, entry_price,
+                                     stop_loss_price, leverage) is None
 # =================================================================================================
 
 
@@ -65,4 +380,4 @@ if __name__ == '__main__':
     # print(rls, usd)
 
     a = asyncio.run(get_allowed_exposure())
-    print(a)
\ No newline at end of file
+    print(a)
@@ -1,17 +1,26 @@
 import sys
+import inspect
 import pandas as pd
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application.data.user import User                      # noqa: E402
+from Application.utils.logs import get_logger               # noqa: E402
+from Application.data.market_info import fetch_pair_info    # noqa: E402
+from Application.utils.tracing import traced                # noqa: E402
 from Application.trading.slippage import compute_slippage   # noqa: E402
 from Application.trading import strategy_fields as strategy # noqa: E402
+from Application.trading.portfolio_manager import PortfolioRiskEngine # noqa: E402
+
+bot_logs = get_logger(logger_name='bot_logs')
 
 
 
 # =================================================================================================
+@traced('position_sizing')
 async def compute_position_margin_size(portfolio_balance : tuple[float, float],
                                        entry_price       : float,
                                        stop_loss_price   : float,
@@ -21,6 +30,11 @@ async def compute_position_margin_size(portfolio_balance : tuple[float, float],
     """
     Executes the chosen position sizing function to return the position size.
 
+    Sizing functions accepting an 'order_book' estimate the slippage from its depth at once,
+    otherwise the size is adjusted by the slippage until it stays within the tolerance.
+
+    The size is 0 if the trade would break a risk limit of the 'PortfolioRiskEngine'.
+
     Parameters:
         portfolio_balance (float):
         entry_price (float):
@@ -39,6 +53,13 @@ async def compute_position_margin_size(portfolio_balance : tuple[float, float],
               'src_currency'       : strategy.TRADING_PAIR['src_currency'],
               'dst_currency'       : strategy.TRADING_PAIR['dst_currency']}
 
+    # Refreshes the trading rules of the market which bound the size, if they expired
+    await fetch_pair_info(strategy.TRADING_PAIR['symbol'])
+
+    if 'order_book' in inspect.signature(position_sizing_func).parameters:
+        size = await position_sizing_func(**params, order_book=order_book)
+        return _within_risk_limits(size, entry_price, stop_loss_price)
+
     tolerance_pct = strategy.POSITION_SIZING_APPROACH[
         'properties'
     ]['slippage_adjusted_position_size_tolerace_pct']
@@ -55,7 +76,30 @@ async def compute_position_margin_size(portfolio_balance : tuple[float, float],
 
         final_size = await position_sizing_func(**params)
 
-    return final_size
+    return _within_risk_limits(final_size, entry_price, stop_loss_price)
+# ________________________________________________________________________________ . . .
+
+
+def _within_risk_limits(size: float, entry_price: float, stop_loss_price: float) -> float:
+    """
+    Returns the size if the trade fits the risk limits of the portfolio, otherwise logs the
+    broken limit and returns 0 so that no entry is placed.
+    """
+    if not size:
+        return size
+
+    reason = PortfolioRiskEngine().rejection_reason(
+        src_currency    = strategy.TRADING_PAIR['src_currency'],
+        dst_currency    = strategy.TRADING_PAIR['dst_currency'],
+        size            = size,
+        entry_price     = entry_price,
+        stop_loss_price = stop_loss_price
+    )
+    if reason is None:
+        return size
+
+    bot_logs.warning(f'Next trade of size {size} is rejected: {reason}.')
+    return 0.0
 # ________________________________________________________________________________ . . .
 
 
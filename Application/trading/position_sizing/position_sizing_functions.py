@@ -1,4 +1,14 @@
+import sys
 import asyncio
+import pandas as pd
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.data.market_info import pair_info, pair_symbol            # noqa: E402
+from Application.trading.position_sizing.sizing_engine import size_positions # noqa: E402
 
 
 # =================================================================================================
@@ -60,44 +70,38 @@ async def risk_adjusted_position_sizing(portfolio_balance  : tuple[float, float]
                                         src_currency       : str,
                                         dst_currency       : str,
                                         slippage           : float | None = None,
-                                        funding_rate_fee   : float | None = None):
+                                        funding_rate_fee   : float | None = None,
+                                        order_book         : tuple[pd.DataFrame,
+                                                                   pd.DataFrame,
+                                                                   float] | None = None):
     """
     Calculates position size in a way that the total risk dosn't exceed the pre defined resk per
     trade value.
 
+    The size is bounded by the trading rules of the market (see 'market_info.py'), and with an
+    order book the slippage of the stop loss is estimated from its depth.
+
     Parameters:
+        order_book (tuple): (asks_df, bids_df, mid_price), overrides 'slippage' if given.
 
     Returns:
-        position_size (float): 
+        position_size (float): 0 if no size within the market bounds keeps the risk within the
+                               budget (e.g. the minimum order of the market risks too much).
     """
     capital_rial, capital_usd = portfolio_balance
-    if dst_currency == 'usdt':
-        max_risk_per_trade_value = risk_per_trade_pct * capital_usd
-    elif dst_currency == 'rls':
-        max_risk_per_trade_value = risk_per_trade_pct * capital_rial
-
-    fee_factors = (maker_fee * entry_price) + (taker_fee * stop_loss_price)
-    if slippage:
-        stop_loss_distance = abs(entry_price - stop_loss_price) + slippage
-    else:
-        stop_loss_distance = abs(entry_price - stop_loss_price)
-
-    position_size_by_risk = max_risk_per_trade_value / (stop_loss_distance + fee_factors)
-
-    # Define the minimum position size for pair
-    min_position_size = 5
-
-    # Define the maximum position size for pair
-    max_position_size = 50
-    
-    if min_position_size < position_size_by_risk < max_position_size:
-        position_size = position_size_by_risk
-    elif position_size_by_risk <= min_position_size:
-        position_size = min_position_size
-    else:
-        position_size = max_position_size
-
-    return position_size
+    capital = capital_usd if dst_currency == 'usdt' else capital_rial
+
+    result = size_positions(capital            = capital,
+                            risk_per_trade_pct = risk_per_trade_pct,
+                            entry_price        = entry_price,
+                            stop_loss_price    = stop_loss_price,
+                            maker_fee          = maker_fee,
+                            taker_fee          = taker_fee,
+                            slippage           = slippage or 0.0,
+                            order_book         = order_book,
+                            pair               = pair_info(pair_symbol(src_currency, dst_currency)))
+
+    return float(result.size) if result.feasible else 0.0
 # ________________________________________________________________________________ . . .
 
 
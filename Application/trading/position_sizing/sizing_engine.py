@@ -0,0 +1,193 @@
+import sys
+import numpy as np
+import pandas as pd
+from typing import NamedTuple
+from numpy.typing import ArrayLike
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application.data.market_info import PairInfo    # noqa: E402
+
+
+OrderBook = tuple[pd.DataFrame, pd.DataFrame, float]
+
+
+
+
+# =================================================================================================
+class SizingResult(NamedTuple):
+    """
+    Sizes of the candidate trades, every attribute is an array with one value per candidate.
+
+    Attributes:
+        size (ndarray): Position size in the source currency, within the bounds of the market.
+        margin (ndarray): Margin of the position in the destination currency.
+        risk (ndarray): Loss of the position if its stop loss gets hit, fees and slippage included.
+        slippage (ndarray): Expected slippage of the stop loss exit per unit of size.
+        feasible (ndarray): Whether the size keeps the risk within the budget and fits the bounds.
+    """
+    size     : np.ndarray
+    margin   : np.ndarray
+    risk     : np.ndarray
+    slippage : np.ndarray
+    feasible : np.ndarray
+# ________________________________________________________________________________ . . .
+
+
+def book_side(order_book: OrderBook, side: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the (prices, volumes) of a side of the order book ('asks' or 'bids') from the best
+    price to the worst one.
+    """
+    book_df = order_book[0] if side == 'asks' else order_book[1]
+    prices = book_df['price'].to_numpy(dtype=np.float64)
+    volumes = book_df['volume'].to_numpy(dtype=np.float64)
+
+    order = np.argsort(prices) if side == 'asks' else np.argsort(-prices)
+    return prices[order], volumes[order]
+# ________________________________________________________________________________ . . .
+
+
+def depth_slippage(prices: np.ndarray, volumes: np.ndarray, sizes: ArrayLike) -> np.ndarray:
+    """
+    Expected slippage per unit of filling the given sizes with a market order at once, as the
+    distance between the average fill price and the best price of the book side. The part of a
+    size beyond the depth of the book is assumed to be filled at its worst price.
+
+    Parameters:
+        prices (ndarray): Prices of the book side from the best to the worst one.
+        volumes (ndarray): Volumes of the price levels.
+        sizes (ArrayLike): Sizes to fill.
+
+    Returns:
+        slippage (ndarray): Slippage of each size, in price units.
+    """
+    sizes = np.asarray(sizes, dtype=np.float64)
+    if not len(prices):
+        return np.zeros_like(sizes)
+
+    cumulative_volume = np.cumsum(volumes)
+    cumulative_value = np.cumsum(prices * volumes)
+
+    # The level where the fill of each size ends
+    level = np.minimum(np.searchsorted(cumulative_volume, sizes), len(prices) - 1)
+    filled_volume = cumulative_volume[level] - volumes[level]
+    filled_value = cumulative_value[level] - prices[level] * volumes[level]
+
+    value = filled_value + (sizes - filled_volume) * prices[level]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average_price = np.where(sizes > 0, value / sizes, prices[0])
+
+    return np.abs(average_price - prices[0])
+# ________________________________________________________________________________ . . .
+
+
+def size_positions(capital            : ArrayLike,
+                   risk_per_trade_pct : ArrayLike,
+                   entry_price        : ArrayLike,
+                   stop_loss_price    : ArrayLike,
+                   leverage           : ArrayLike = 1.0,
+                   maker_fee          : ArrayLike = 0.0,
+                   taker_fee          : ArrayLike = 0.0,
+                   slippage           : ArrayLike = 0.0,
+                   order_book         : OrderBook | None = None,
+                   pair               : PairInfo = PairInfo(),
+                   tolerance_pct      : float = 0.01,
+                   max_iterations     : int = 10) -> SizingResult:
+    """
+    Sizes many candidate trades at once, so that the loss of each one at its stop loss does not
+    exceed the risk budget. Every parameter broadcasts against the others (e.g. one entry price
+    with an array of stop losses and an array of leverages).
+
+    The slippage of the stop loss exit depends on the size, so with an order book the sizes and
+    their slippages are computed again until no size changes more than 'tolerance_pct'.
+
+    Parameters:
+        capital (ArrayLike): Capital in the destination currency.
+        risk_per_trade_pct (ArrayLike): Part of the capital allowed to be lost on a trade.
+        entry_price (ArrayLike): Entry prices, a stop loss below the entry means a long position.
+        stop_loss_price (ArrayLike): Stop loss prices.
+        leverage (ArrayLike): Leverages, the margin of a position can not exceed the capital.
+        maker_fee (ArrayLike): Fee rate of the entry order.
+        taker_fee (ArrayLike): Fee rate of the stop loss order.
+        slippage (ArrayLike): Slippage per unit of the stop loss exit, used without order book.
+        order_book (tuple): (asks_df, bids_df, mid_price) to estimate the slippage from its depth.
+        pair (PairInfo): Trading rules of the market, bounding the sizes.
+        tolerance_pct (float): Convergence tolerance of the slippage adjusted sizes.
+        max_iterations (int): Maximum number of slippage adjustments.
+
+    Returns:
+        result (SizingResult): Sizes of the candidates.
+    """
+    capital, risk_pct, entry, stop_loss, leverage, maker_fee, taker_fee, slippage = \
+        np.broadcast_arrays(*(np.asarray(value, dtype=np.float64)
+                              for value in (capital, risk_per_trade_pct, entry_price,
+                                            stop_loss_price, leverage, maker_fee, taker_fee,
+                                            slippage)))
+
+    budget = risk_pct * capital
+    unit_loss = np.abs(entry - stop_loss) + (maker_fee * entry) + (taker_fee * stop_loss)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lower = np.maximum(pair.min_notional / entry, pair.amount_step)
+        upper = np.minimum(pair.max_notional, capital * leverage) / entry
+
+    def bounded(size: np.ndarray) -> np.ndarray:
+        return np.minimum(np.maximum(size, lower), upper)
+
+    def exit_slippage(size: np.ndarray) -> np.ndarray:
+        if order_book is None:
+            return slippage
+
+        # Long positions exit by selling into the bids, short ones by buying from the asks
+        return np.where(stop_loss < entry,
+                        depth_slippage(*book_side(order_book, 'bids'), size),
+                        depth_slippage(*book_side(order_book, 'asks'), size))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        size_by_risk = budget / (unit_loss + exit_slippage(np.zeros_like(budget)))
+
+        for _ in range(max_iterations if order_book is not None else 0):
+            adjusted = budget / (unit_loss + exit_slippage(bounded(size_by_risk)))
+            converged = np.all(np.abs(adjusted - size_by_risk) <= tolerance_pct * adjusted)
+            size_by_risk = adjusted
+            if converged:
+                break
+
+    size = bounded(size_by_risk)
+    final_slippage = exit_slippage(size)
+    risk = size * (unit_loss + final_slippage)
+
+    return SizingResult(size     = size,
+                        margin   = size * entry / leverage,
+                        risk     = risk,
+                        slippage = np.broadcast_to(final_slippage, size.shape),
+                        feasible = (lower <= upper) & (risk <= budget * (1 + tolerance_pct)))
+# ________________________________________________________________________________ . . .
+
+
+def best_candidate(result            : SizingResult,
+                   entry_price       : ArrayLike,
+                   take_profit_price : ArrayLike | None = None) -> int | None:
+    """
+    Returns the index of the optimal feasible candidate, the one with the highest reward at its
+    take profit net of its risk, or the biggest one without take profit prices.
+
+    Returns:
+        index (int | None): Flat index of the candidate, None if no candidate is feasible.
+    """
+    if take_profit_price is None:
+        score = result.size
+    else:
+        score = result.size * np.abs(np.asarray(take_profit_price) - np.asarray(entry_price)) \
+                - result.risk
+
+    score = np.where(result.feasible, score, -np.inf).ravel()
+    if not score.size or score.max() == -np.inf:
+        return None
+
+    return int(np.argmax(score))
+# =================================================================================================
@@ -0,0 +1,300 @@
+import re
+import sys
+import functools
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, NamedTuple
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+
+
+# =================================================================================================
+# Grammar of the rules, from the lowest to the highest precedence:
+#
+#   rule       := or_rule
+#   or_rule    := and_rule ('or' and_rule)*
+#   and_rule   := not_rule ('and' not_rule)*
+#   not_rule   := 'not' not_rule | comparison
+#   comparison := sum (('<' | '<=' | '>' | '>=' | '==' | '!=' |
+#                       'crosses_above' | 'crosses_below') sum)?
+#   sum        := product (('+' | '-') product)*
+#   product    := unary (('*' | '/') unary)*
+#   unary      := '-' unary | NUMBER | COLUMN | '(' rule ')'
+#
+# e.g. "supertrend_side crosses_above 0 and rsi_14 < 70", where columns are the ones of the
+# indicators DataFrame, or of the kline DataFrame (e.g. 'close').
+_TOKEN = re.compile(r'\s*(?:(?P<number>\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+)'
+                    r'|(?P<name>[A-Za-z_]\w*)'
+                    r'|(?P<operator><=|>=|==|!=|[<>+\-*/()]))')
+
+_KEYWORDS = frozenset({'and', 'or', 'not', 'crosses_above', 'crosses_below'})
+_COMPARISONS = frozenset({'<', '<=', '>', '>=', '==', '!=', 'crosses_above', 'crosses_below'})
+
+
+class RuleSyntaxError(ValueError):
+    """
+    Raised when a rule of a setup can not be parsed.
+    """
+# ________________________________________________________________________________ . . .
+
+
+def _tokenize(text: str) -> list[tuple[str, Any, int]]:
+    tokens, position = [], 0
+
+    while text[position:].strip():
+        match = _TOKEN.match(text, position)
+        if not match or match.lastgroup is None:
+            raise RuleSyntaxError(f'Unexpected character at position {position} of rule "{text}".')
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'number':
+            value = float(value)
+        elif kind == 'name' and value in _KEYWORDS:
+            kind = 'operator'
+
+        tokens.append((kind, value, match.start(kind)))
+        position = match.end()
+
+    return tokens
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+# Nodes are hash-consed into integer ids, so an expression appearing in several places, in one or
+# in many rules, is one node which is computed once per tick.
+_node_ids: dict[tuple, int] = {}
+
+
+def _node(op: str, *args) -> int:
+    return _node_ids.setdefault((op, *args), len(_node_ids))
+# ________________________________________________________________________________ . . .
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text     = text
+        self.tokens   = _tokenize(text)
+        self.position = 0
+        self.nodes: list[tuple[int, str, tuple]] = []    # (id, op, args) in evaluation order
+        self.seen: set[int] = set()
+    # ____________________________________________________________________________ . . .
+
+    def _peek(self) -> Any:
+        return self.tokens[self.position][1] if self.position < len(self.tokens) else None
+
+    def _take(self) -> tuple[str, Any, int]:
+        if self.position >= len(self.tokens):
+            raise RuleSyntaxError(f'Unexpected end of rule "{self.text}".')
+
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+    def _emit(self, op: str, *args) -> int:
+        node_id = _node(op, *args)
+        if node_id not in self.seen:
+            self.seen.add(node_id)
+            self.nodes.append((node_id, op, args))
+
+        return node_id
+    # ____________________________________________________________________________ . . .
+
+    def parse(self) -> int:
+        root = self._or()
+        if self.position != len(self.tokens):
+            _, value, at = self.tokens[self.position]
+            raise RuleSyntaxError(f'Unexpected "{value}" at position {at} of rule "{self.text}".')
+
+        return root
+
+    def _binary(self, operand: Callable[[], int], operators: set[str] | frozenset[str]) -> int:
+        left = operand()
+        while self._peek() in operators:
+            op = self._take()[1]
+            left = self._emit(op, left, operand())
+
+        return left
+
+    def _or(self) -> int:
+        return self._binary(self._and, {'or'})
+
+    def _and(self) -> int:
+        return self._binary(self._not, {'and'})
+
+    def _not(self) -> int:
+        if self._peek() == 'not':
+            self._take()
+            return self._emit('not', self._not())
+
+        return self._comparison()
+
+    def _comparison(self) -> int:
+        left = self._sum()
+        if self._peek() in _COMPARISONS:
+            op = self._take()[1]
+            return self._emit(op, left, self._sum())
+
+        return left
+
+    def _sum(self) -> int:
+        return self._binary(self._product, {'+', '-'})
+
+    def _product(self) -> int:
+        return self._binary(self._unary, {'*', '/'})
+
+    def _unary(self) -> int:
+        kind, value, at = self._take()
+
+        if kind == 'number':
+            return self._emit('const', value)
+        if kind == 'name':
+            return self._emit('column', value)
+        if value == '-':
+            return self._emit('neg', self._unary())
+        if value == '(':
+            node_id = self._or()
+            if self._take()[1] != ')':
+                raise RuleSyntaxError(f'Missing ")" in rule "{self.text}".')
+            return node_id
+
+        raise RuleSyntaxError(f'Unexpected "{value}" at position {at} of rule "{self.text}".')
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+def _previous(values: Any) -> Any:
+    if np.ndim(values) == 0:
+        return values
+
+    previous = np.empty(len(values), dtype=np.float64)
+    previous[:1] = np.nan
+    previous[1:] = values[:-1]
+    return previous
+# ________________________________________________________________________________ . . .
+
+
+def _crosses_above(left: Any, right: Any) -> Any:
+    return (left > right) & (_previous(left) <= _previous(right))
+
+
+def _crosses_below(left: Any, right: Any) -> Any:
+    return (left < right) & (_previous(left) >= _previous(right))
+# ________________________________________________________________________________ . . .
+
+
+_OPERATIONS: dict[str, Callable[..., Any]] = {
+    'or'            : np.logical_or,
+    'and'           : np.logical_and,
+    'not'           : np.logical_not,
+    '<'             : np.less,
+    '<='            : np.less_equal,
+    '>'             : np.greater,
+    '>='            : np.greater_equal,
+    '=='            : np.equal,
+    '!='            : np.not_equal,
+    'crosses_above' : _crosses_above,
+    'crosses_below' : _crosses_below,
+    '+'             : np.add,
+    '-'             : np.subtract,
+    '*'             : np.multiply,
+    '/'             : np.divide,
+    'neg'           : np.negative,
+}
+# ________________________________________________________________________________ . . .
+
+
+class Rule(NamedTuple):
+    """
+    A compiled rule.
+
+    Attributes:
+        text (str): Source of the rule.
+        root (int): Id of the node of the whole rule.
+        nodes (tuple): The (id, op, args) of the nodes of the rule, each one after its operands.
+    """
+    text  : str
+    root  : int
+    nodes : tuple[tuple[int, str, tuple], ...]
+
+    def evaluate(self,
+                 kline_df     : pd.DataFrame,
+                 indicator_df : pd.DataFrame,
+                 values       : dict[int, Any] | None = None) -> np.ndarray:
+        """
+        Evaluates the rule on every candle.
+
+        Parameters:
+            kline_df (DataFrame): kline DataFrame.
+            indicator_df (DataFrame): Indicators DataFrame, its columns shadow the kline ones.
+            values (dict): Nodes already evaluated on these DataFrames, reused and extended.
+
+        Returns:
+            matches (ndarray): Boolean array of the candles matching the rule.
+        """
+        values = {} if values is None else values
+
+        for node_id, op, args in self.nodes:
+            if node_id in values:
+                continue
+
+            if op == 'const':
+                values[node_id] = args[0]
+            elif op == 'column':
+                frame = indicator_df if args[0] in indicator_df.columns else kline_df
+                values[node_id] = frame[args[0]].to_numpy(dtype=np.float64)
+            else:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[node_id] = _OPERATIONS[op](*(values[arg] for arg in args))
+
+        return np.broadcast_to(np.asarray(values[self.root], dtype=bool), (len(kline_df),))
+# ________________________________________________________________________________ . . .
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_rule(text: str) -> Rule:
+    """
+    Parses the rule once and compiles it into vectorized NumPy operations, sharing common
+    subexpressions with all the other compiled rules.
+
+    Raises:
+        RuleSyntaxError: If the rule is not valid.
+    """
+    parser = _Parser(text)
+    root = parser.parse()
+
+    return Rule(text, root, tuple(parser.nodes))
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+_shared: dict[str, Any] = {'frames': None, 'token': None, 'values': {}}
+
+
+def tick_values(kline_df: pd.DataFrame, indicator_df: pd.DataFrame) -> dict[int, Any]:
+    """
+    Returns the rule nodes evaluated so far on these DataFrames, so the rules of all setups of a
+    tick share their common subexpressions.
+
+    Values are kept for the very same DataFrame objects only (they are referenced, so their ids
+    can not be reused), as long as their lengths did not change in place.
+    """
+    frames = _shared['frames']
+
+    if frames is None or frames[0] is not kline_df or frames[1] is not indicator_df \
+            or _shared['token'] != (len(kline_df), len(indicator_df)):
+        _shared.update(frames=(kline_df, indicator_df),
+                       token=(len(kline_df), len(indicator_df)),
+                       values={})
+
+    return _shared['values']
+# =================================================================================================
@@ -1,46 +1,80 @@
 import sys
+import numpy as np
 import pandas as pd
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import trade_logs # noqa: E402
+from Application.trading.signals.rules import compile_rule, tick_values # noqa: E402
 
 
 
 # =================================================================================================
 async def supertrend_setupfunc(
-    kline_df: pd.DataFrame, indicator_df: pd.DataFrame, properties: dict
-) -> pd.DataFrame:
+    kline_df: pd.DataFrame, indicator_df: pd.DataFrame, properties: dict, signals: np.ndarray
+) -> None:
 
     """
     Generate trading signals based on indicator DataFrame for single_supertrend setup.
 
+    A long (1) or short (-1) signal is written on every candle where the side of the supertrend
+    flips.
+
     Parameters:
         kline_df (pd.DataFrame): DataFrame containing kline data.
         indicator_df (pd.DataFrame): DataFrame containing indicator data.
-
-    Returns:
-        pd.DataFrame: DataFrame containing the generated signals.
+        signals (np.ndarray): Column of the setup in the signal matrix, filled in place.
     """
-    print(kline_df)
-    print(indicator_df)
     try:
-        signal_df = pd.DataFrame(index=indicator_df.index)
-        signal_df['supertrend'] = 0
-
-        _supertrend = indicator_df['supertrend_side']
-        _prev_supertrend = indicator_df['supertrend_side'].shift(1)
+        side = indicator_df['supertrend_side'].to_numpy(dtype=np.float64)
+        current, previous = side[1:], side[:-1]
 
-        signal_df.loc[(_supertrend == 1) & (_prev_supertrend == -1), 'supertrend'] = 1
-        signal_df.loc[(_supertrend == -1) & (_prev_supertrend == 1), 'supertrend'] = -1
+        signals[:1] = 0
+        signals[1:] = np.where(current * previous == -1, current, 0)
 
-        print(signal_df)
-        return signal_df
+        trade_logs.debug('supertrend_setupfunc() signals: %s', signals[-5:])
     except Exception as err:
         trade_logs.error(f"Error while generating signals in supertrend_setupfunc() func: {err}")
-        return pd.DataFrame()
+        signals[:] = 0
+# ________________________________________________________________________________ . . .
+
+
+async def rule_setupfunc(
+    kline_df: pd.DataFrame, indicator_df: pd.DataFrame, properties: dict, signals: np.ndarray
+) -> None:
+
+    """
+    Generate trading signals of a setup declared by rules in the strategy config, e.g.:
+
+        {"name": "rule_setupfunc",
+         "properties": {"label": "supertrend_rsi",
+                        "long": "supertrend_side crosses_above 0 and rsi_14 < 70",
+                        "short": "supertrend_side crosses_below 0 and rsi_14 > 30"}}
+
+    Rules are compiled once, and the subexpressions they share with the rules of the other setups
+    are evaluated once per tick. A candle matching both rules gets no signal.
+
+    Parameters:
+        kline_df (pd.DataFrame): DataFrame containing kline data.
+        indicator_df (pd.DataFrame): DataFrame containing indicator data.
+        properties (dict): The 'long' and/or 'short' rules, and the 'label' of the setup.
+        signals (np.ndarray): Column of the setup in the signal matrix, filled in place.
+    """
+    try:
+        values = tick_values(kline_df, indicator_df)
+        signals[:] = 0
+
+        if 'long' in properties:
+            signals += compile_rule(properties['long']).evaluate(kline_df, indicator_df, values)
+        if 'short' in properties:
+            signals -= compile_rule(properties['short']).evaluate(kline_df, indicator_df, values)
+    except Exception as err:
+        trade_logs.error(f"Error while generating signals of rule setup "\
+                         f"'{properties.get('label')}' in rule_setupfunc() func: {err}")
+        signals[:] = 0
 # ________________________________________________________________________________ . . .
 
 
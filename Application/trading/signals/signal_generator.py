@@ -1,64 +1,213 @@
 import sys
 import asyncio
+import inspect
+import functools
 import pandas as pd
+from typing import Any, Hashable
+from collections import OrderedDict
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import trade_logs                          # noqa: E402
+from Application.utils.tracing import traced               # noqa: E402
+from Application.utils.event_channels import Event         # noqa: E402
+import Application.configs.admin_config as aconfig          # noqa: E402
+from Application.trading.signals.signal_matrix import SignalMatrix  # noqa: E402
 from Application.trading import strategy_fields as strategy # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler # noqa: E402
 
+jarchi = EventHandler()
+jarchi.register_event(Event.VALID_ENTRY_SIGNAL, [])
 
 
+
+@functools.cache
+def _writes_signals(setup_function) -> bool:
+    """
+    Whether the setup function fills its column of the signal matrix through a 'signals' argument,
+    instead of returning a signals DataFrame.
+    """
+    return 'signals' in inspect.signature(setup_function).parameters
+# ________________________________________________________________________________ . . .
+
+
+def _fill_column(column, result: pd.DataFrame | None, index: pd.Index) -> None:
+    # Setups returning a DataFrame put their signals in its first column
+    if isinstance(result, pd.DataFrame) and not result.empty:
+        column[:] = result.iloc[:, 0].reindex(index).fillna(0).to_numpy()
+# ________________________________________________________________________________ . . .
+
+
+def setup_label(setup: dict) -> str:
+    """
+    Returns the name of the signals of the setup, its 'label' property if it has one (e.g. for
+    several setups of the same setup function), otherwise its name.
+    """
+    return setup['properties'].get('label', setup['name'])
+# ________________________________________________________________________________ . . .
+
+
+@traced('signals')
 async def generate_signals(trading_system : list,
                            kline_df       : pd.DataFrame,
-                           indicators_df  : pd.DataFrame):
+                           indicators_df  : pd.DataFrame) -> SignalMatrix:
     """
-    Executes setup functions from given trading system asynchronously.
+    Executes setup functions from given trading system asynchronously, each one writing the
+    signals of its setup into its own column of the signal matrix.
+
+    Parameters:
+        trading_system (list): Setups of the trading system.
+        kline_df (DataFrame): kline DataFrame.
+        indicators_df (DataFrame): Indicators of the trading system.
+
+    Returns:
+        signals (SignalMatrix): Signals of all the setups, one column per setup label.
     """
-    coroutines_set = set()
+    signals = SignalMatrix(kline_df.index, [setup_label(setup) for setup in trading_system])
+    coroutines = []
 
     for setup in trading_system:
-        coroutines_set.add(setup['function'](kline_df     = kline_df,
-                                             indicator_df = indicators_df,
-                                             properties   = setup['properties']))
+        kwargs = {'signals': signals.column(setup_label(setup))} \
+                 if _writes_signals(setup['function']) else {}
 
-        trade_logs.info(f'Setup "{setup['name']}" has been added to signal setups.')
+        coroutines.append(setup['function'](kline_df     = kline_df,
+                                            indicator_df = indicators_df,
+                                            properties   = setup['properties'],
+                                            **kwargs))
 
     try:
-        results = await asyncio.gather(*coroutines_set)
+        results = await asyncio.gather(*coroutines)
     except asyncio.CancelledError:
-            trade_logs.error("An signal generation task got canceled in "\
-                          "'signal_generator.generate_signals()' function.")
+        trade_logs.error("An signal generation task got canceled in "\
+                         "'signal_generator.generate_signals()' function.")
+        return signals
     except Exception as err:
         trade_logs.error(f'Inside "signal_generator.generate_signals()": {err}')
+        return signals
+
+    for setup, result in zip(trading_system, results):
+        if not _writes_signals(setup['function']):
+            _fill_column(signals.column(setup_label(setup)), result, kline_df.index)
+
+    return signals
+# ________________________________________________________________________________ . . .
+
+
+# Verdicts of the validations per (setup label, signal candle), as tasks so a signal which is
+# validated once more while its validation is running awaits the same verdict
+_verdicts: OrderedDict[tuple[str, Hashable], asyncio.Task] = OrderedDict()
+_emitted: set[tuple[str, Hashable]] = set()
+
 
-    signal_df = pd.DataFrame(index=kline_df.index)
-    for result in results:
-            if not result.empty:
-                signal_df = signal_df.merge(
-                    result, left_index=True, right_index=True, how='left'
-                )
+async def _run_validator(validator     : dict,
+                         kline_df      : pd.DataFrame,
+                         indicators_df : pd.DataFrame,
+                         setup_name    : str) -> bool:
+    """
+    Runs the validator within its time budget, a validator which fails or times out rejects the
+    signal.
+    """
+    try:
+        coroutine = validator['function'](kline_df      = kline_df,
+                                          indicators_df = indicators_df,
+                                          setup_name    = setup_name,
+                                          properties    = validator['properties'])
 
-    return signal_df
+        verdict = await asyncio.wait_for(coroutine, timeout=aconfig.SignalValidation.TIMEOUT)
+        return verdict == 'valid'
+
+    except TimeoutError:
+        trade_logs.warning(f'Signal validator "{validator['name']}" of setup "{setup_name}" timed '\
+                           f'out after {aconfig.SignalValidation.TIMEOUT}s, the signal is rejected.')
+    except Exception as err:
+        trade_logs.error(f'Signal validator "{validator['name']}" of setup "{setup_name}" failed, '\
+                         f'the signal is rejected: {err}')
+    return False
+# ________________________________________________________________________________ . . .
+
+
+async def _validate(validators    : list[dict],
+                    kline_df      : pd.DataFrame,
+                    indicators_df : pd.DataFrame,
+                    setup_name    : str) -> bool:
+    """
+    Runs the validators concurrently, the first rejection cancels the remaining ones.
+    """
+    tasks = [asyncio.create_task(_run_validator(validator, kline_df, indicators_df, setup_name))
+             for validator in validators]
+    try:
+        for verdict in asyncio.as_completed(tasks):
+            if not await verdict:
+                return False
+        return True
+    finally:
+        for task in tasks:
+            task.cancel()
 # ________________________________________________________________________________ . . .
 
 
-async def validate_signals(kline_df      : pd.DataFrame,
-                           indicators_df : pd.DataFrame,
-                           setup_name    : pd.DataFrame):
+@traced('signal_validation')
+async def validate_signals(kline_df     : pd.DataFrame,
+                           indicator_df : pd.DataFrame,
+                           setup_name   : str,
+                           signal_time  : Any = None) -> bool:
     """
-    Executes signal validation functions from given trading system asynchronously.
+    Validates the signal of the given setup by its validators and emits on "VALID_ENTRY_SIGNAL"
+    event channel if all of them accept it.
+
+    The verdict is cached per signal candle, so a signal emitted again on the next ticks (e.g. as a
+    late signal) is neither validated nor broadcast again.
+
+    Parameters:
+        kline_df (DataFrame): kline DataFrame.
+        indicator_df (DataFrame): Indicators of the entry system.
+        setup_name (str): Label of the setup which generated the signal.
+        signal_time (Any): Index of the signal candle, the last candle by default.
+
+    Returns:
+        is_valid (bool): Whether the signal has been validated.
     """
-    coroutines_set = set()
-
-    for setup in strategy.ENTRY_SYSTEM:
-        for validator in setup.get("validators", []):
-            coroutines_set.add(setup['function'](kline_df      = kline_df,
-                                                 indicators_df = indicators_df,
-                                                 setup_name    = setup_name,
-                                                 properties    = validator['properties']))             
+    setups = {setup_label(setup): setup for setup in strategy.ENTRY_SYSTEM}
+    if setup_name not in setups:
+        trade_logs.error(f'Inside "signal_generator.validate_signals()": There is no entry setup '\
+                         f'named "{setup_name}".')
+        return False
+
+    key = (setup_name, kline_df.index[-1] if signal_time is None else signal_time)
+    task = _verdicts.get(key)
+
+    if task is None or task.cancelled():
+        task = asyncio.create_task(_validate(setups[setup_name].get('validators', []),
+                                             kline_df, indicator_df, setup_name))
+        _verdicts[key] = task
+        while len(_verdicts) > aconfig.SignalValidation.CACHE_SIZE:
+            _emitted.discard(_verdicts.popitem(last=False)[0])
+    else:
+        _verdicts.move_to_end(key)
+
+    try:
+        is_valid = task.result() if task.done() else await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+        trade_logs.error(f'Validation of the signal of setup "{setup_name}" got canceled.')
+        return False
+
+    if is_valid and key not in _emitted:
+        _emitted.add(key)
+        trade_logs.info(f'Broadcasting "{Event.VALID_ENTRY_SIGNAL}" event from '\
+                        '"signal_generator.validate_signals()" function.')
+
+        await jarchi.emit(Event.VALID_ENTRY_SIGNAL,
+                          kline_df     = kline_df,
+                          indicator_df = indicator_df,
+                          setup_name   = setup_name,
+                          signal_time  = key[1])
+
+    return is_valid
 # ________________________________________________________________________________ . . .
 
 
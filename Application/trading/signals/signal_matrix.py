@@ -0,0 +1,61 @@
+import sys
+import numpy as np
+import pandas as pd
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+
+
+# =================================================================================================
+class SignalMatrix:
+    """
+    Signals of all the setups of a trading system over the kline, held in one preallocated int8
+    matrix of shape (candles, setups).
+
+    Each setup owns one column, in which 1 marks a long signal, -1 a short signal and 0 no signal
+    on that candle. The columns are contiguous (Fortran order), so the setups fill their own column
+    in place.
+    """
+    def __init__(self, index: pd.Index, setups: list[str]):
+        self.index  = index
+        self.setups = list(setups)
+        self.values = np.zeros((len(index), len(self.setups)), dtype=np.int8, order='F')
+    # ____________________________________________________________________________ . . .
+
+    def column(self, setup: str) -> np.ndarray:
+        """
+        Returns the writable view of the signals column of the given setup.
+        """
+        return self.values[:, self.setups.index(setup)]
+    # ____________________________________________________________________________ . . .
+
+    def latest(self) -> tuple[list[str], list[str]]:
+        """
+        Extracts the setups with a signal on the last two candles, for all the setups at once.
+
+        Returns:
+            new_signals (list): Setups with a signal on the last candle.
+            late_signals (list): Setups with a signal on the second last candle only.
+        """
+        if not len(self.values):
+            return [], []
+
+        last = self.values[-1]
+        previous = self.values[-2] if len(self.values) > 1 else np.zeros_like(last)
+
+        new = last != 0
+        late = ~new & (previous != 0)
+
+        setups = np.asarray(self.setups, dtype=object)
+        return setups[new].tolist(), setups[late].tolist()
+    # ____________________________________________________________________________ . . .
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Returns the signals as a DataFrame indexed like the kline, sharing the matrix memory.
+        """
+        return pd.DataFrame(self.values, index=self.index, columns=self.setups, copy=False)
+# =================================================================================================
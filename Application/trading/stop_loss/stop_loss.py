@@ -3,10 +3,11 @@ import pandas as pd
 from typing import Callable
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.trading.strategy_fields import STATIC_SL_APPROACH # noqa: E402
+from Application.trading import strategy_fields as strategy # noqa: E402
 
 
 def trailing_order():
@@ -27,8 +28,8 @@ def declare_static_sl_price(trade_side: str, indicators_df: pd.DataFrame):
     """
     
     """
-    func: Callable = STATIC_SL_APPROACH['function']
-    properties = STATIC_SL_APPROACH['properties']
+    func: Callable = strategy.STATIC_SL_APPROACH['function']
+    properties = strategy.STATIC_SL_APPROACH['properties']
 
     stop_loss_price = func(trade_side=trade_side, indicators_df=indicators_df, **properties)
     return stop_loss_price
\ No newline at end of file
@@ -1,77 +1,181 @@
+"""
+Fields of the strategy config file.
+
+Fields are resolved lazily on first access (e.g. `strategy.ENTRY_SYSTEM`), so setup function
+modules are imported only when a setup is first used. The config file is parsed once, validated,
+frozen and re-read only when it gets modified; every resolved field is dropped whenever a
+modified config is loaded, so changes of 'strategy.json' apply without restarting the bot.
+
+Access fields through the module (`strategy.X`) instead of `from ... import X`, otherwise the
+imported name keeps the value of import time.
+"""
 import sys
+from typing import Any, Callable, Mapping
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.utils.load_json import load                                # noqa: E402
+from Application.utils.logs import get_logger                               # noqa: E402
+from Application.utils.load_json import load_cached                         # noqa: E402
+from Application.utils.exchange.nobitex import resolution_seconds           # noqa: E402
 from Application.data.data_tools import extract_field_value,\
                                         extract_singular_strategy_setup,\
                                         extract_non_singular_strategy_setup # noqa: E402
 
-strategy_config = load(r'Application/configs/strategy.json')
+bot_logs = get_logger(logger_name='bot_logs')
+
+STRATEGY_CONFIG_PATH = r'Application/configs/strategy.json'
+
+
 
 
-# try @memoization or caching these constants...
 # =================================================================================================
-TRADING_PAIR: dict = {
-    'symbol'       : extract_field_value('trading_pair')['symbol'],
-    'src_currency' : extract_field_value('trading_pair')['src_currency'],
-    'dst_currency' : extract_field_value('trading_pair')['dst_currency']
-}
+def _trading_pair(config: Mapping) -> dict:
+    trading_pair = extract_field_value('trading_pair', config=config)
+
+    return {'symbol'       : trading_pair['symbol'],
+            'src_currency' : trading_pair['src_currency'],
+            'dst_currency' : trading_pair['dst_currency']}
 # ________________________________________________________________________________ . . .
 
 
-TRADING_TIMEFRAME: str = extract_field_value('trading_timeframe')
+def _trading_timeframe(config: Mapping) -> str:
+    timeframe = extract_field_value('trading_timeframe', config=config)
+    resolution_seconds(timeframe)
+
+    return timeframe
 # ________________________________________________________________________________ . . .
 
 
-COMPUTION_SIZE: int = extract_field_value('candles_compution_size')
+def _compution_size(config: Mapping) -> int:
+    size = extract_field_value('candles_compution_size', config=config)
+    if not isinstance(size, int) or size <= 0:
+        raise ValueError(f"'candles_compution_size' must be a positive integer, got '{size}'.")
+
+    return size
 # ________________________________________________________________________________ . . .
 
 
-ENTRY_SYSTEM: list = extract_non_singular_strategy_setup(
-    setup_name                      = 'entry_signal_setups',
-    config                          = strategy_config,
-    setup_functions_module_path     = 'Application.trading.signals.setup_functions',
-    indicator_functions_module_path = 'Application.trading.analysis.indicator_functions',
-    validator_functions_module_path = 'Application.trading.signals.signal_validation_functions'
-)
-# ________________________________________________________________________________ . . .
+def _risk_per_trade(config: Mapping) -> float:
+    risk = extract_field_value('risk_per_trade', config=config)
+    if not isinstance(risk, (int, float)) or not 0 < risk <= 1:
+        raise ValueError(f"'risk_per_trade' must be a number in (0, 1], got '{risk}'.")
 
+    return risk
+# =================================================================================================
 
-STATIC_SL_APPROACH: dict = extract_singular_strategy_setup(
-    setup_name                  = 'static_stop_loss_setup',
-    config                      = strategy_config,
-    setup_functions_module_path = 'Application.trading.stop_loss.setup_functions'
-)
-# ________________________________________________________________________________ . . .
 
 
-RISK_PER_TRADE: float = extract_field_value('risk_per_trade')
-# ________________________________________________________________________________ . . .
 
+# =================================================================================================
+_FIELDS: dict[str, Callable[[Mapping], Any]] = {
+    'strategy_config': lambda config: config,
+
+    'TRADING_PAIR': _trading_pair,
+
+    'TRADING_TIMEFRAME': _trading_timeframe,
+
+    'COMPUTION_SIZE': _compution_size,
+
+    'WATCHED_PAIRS': lambda config: config.get('watched_pairs', ()),
+
+    'ACTIVE_TIMES': lambda config: extract_field_value('active_times', config=config),
 
-POSITION_SIZING_APPROACH: dict = extract_singular_strategy_setup(
-    setup_name                  = 'position_sizing_approach',
-    config                      = strategy_config,
-    setup_functions_module_path = 'Application.trading.position_sizing.position_sizing_functions'
-)
+    'RECOVERY_MECHANISMS': lambda config: config.get('recovery_mechanisms', ()),
+
+    'PORTFOLIO_EXPOSURE': lambda config: extract_field_value('portfolio_exposure', config=config),
+
+    'ENTRY_SYSTEM': lambda config: extract_non_singular_strategy_setup(
+        setup_name                      = 'entry_signal_setups',
+        config                          = config,
+        setup_functions_module_path     = 'Application.trading.signals.setup_functions',
+        indicator_functions_module_path = 'Application.trading.analysis.indicator_functions',
+        validator_functions_module_path = 'Application.trading.signals.signal_validation_functions'
+    ),
+
+    'STATIC_SL_APPROACH': lambda config: extract_singular_strategy_setup(
+        setup_name                  = 'static_stop_loss_setup',
+        config                      = config,
+        setup_functions_module_path = 'Application.trading.stop_loss.setup_functions'
+    ),
+
+    'RISK_PER_TRADE': _risk_per_trade,
+
+    'POSITION_SIZING_APPROACH': lambda config: extract_singular_strategy_setup(
+        setup_name                  = 'position_sizing_approach',
+        config                      = config,
+        setup_functions_module_path = 'Application.trading.position_sizing.position_sizing_functions'
+    ),
+
+    'MARKET_VALIDATION_SYSTEM': lambda config: extract_non_singular_strategy_setup(
+        setup_name                      = 'market_validation',
+        config                          = config,
+        setup_functions_module_path     = 'Application.trading.market.validation_functions',
+        indicator_functions_module_path = 'Application.trading.analysis.indicator_functions'
+    ),
+
+    'TRADING_FLOW_APPROACH': lambda config: extract_singular_strategy_setup(
+        setup_name                  = 'trading_workflow_approach',
+        config                      = config,
+        setup_functions_module_path = 'Application.trading.trading_flow_functions'
+    )
+}
+
+# Fields which are validated on every load of the config file
+_VALIDATED_FIELDS = ('TRADING_PAIR', 'TRADING_TIMEFRAME', 'COMPUTION_SIZE', 'RISK_PER_TRADE')
+
+_state: dict[str, Any] = {'config': None, 'fields': {}, 'rejected': None}
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+def _current_fields() -> dict[str, Any]:
+    """
+    Returns the resolved fields of the current config, and validates the config file if it got
+    modified since the last call. An invalid modification is rejected once and the previous
+    config keeps serving until the file gets modified again.
+
+    Raises:
+        ValueError: If the config file is invalid on its first load.
+    """
+    config = load_cached(STRATEGY_CONFIG_PATH)
+    if config is _state['config'] or config is _state['rejected']:
+        return _state['fields']
+
+    try:
+        fields = {name: _FIELDS[name](config) for name in _VALIDATED_FIELDS}
+    except (ValueError, KeyError, TypeError) as err:
+        if _state['config'] is None:
+            raise ValueError(f"Invalid 'strategy.json' config file: {err}") from err
+
+        bot_logs.error(f"Ignored the modified 'strategy.json' config file since it is invalid: {err}")
+        _state['rejected'] = config
+        return _state['fields']
+
+    if _state['config'] is not None:
+        bot_logs.info("Strategy fields are reset since 'strategy.json' config file got modified.")
+
+    _state['config'], _state['fields'] = config, fields
+    return fields
 # ________________________________________________________________________________ . . .
 
 
-MARKET_VALIDATION_SYSTEM = extract_non_singular_strategy_setup(
-    setup_name                      = 'market_validation',
-    config                          = strategy_config,
-    setup_functions_module_path     = 'Application.trading.market.validation_functions',
-    indicator_functions_module_path = 'Application.trading.analysis.indicator_functions'
-)
+def __getattr__(name: str) -> Any:
+    if name not in _FIELDS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    fields = _current_fields()
+    if name not in fields:
+        fields[name] = _FIELDS[name](_state['config'])
+
+    return fields[name]
 # ________________________________________________________________________________ . . .
 
 
-TRADING_FLOW_APPROACH = extract_singular_strategy_setup(
-    setup_name                  = 'trading_workflow_approach',
-    config                      = strategy_config,
-    setup_functions_module_path = 'Application.trading.trading_flow_functions'
-)
-# =================================================================================================
\ No newline at end of file
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_FIELDS))
+# =================================================================================================
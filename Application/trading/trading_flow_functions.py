@@ -2,8 +2,9 @@
 import sys
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application.utils.simplified_event_handler import EventHandler                         # noqa: E402
 from Application.trading.orders.order_executioner import stop_loss_executioner,\
@@ -1,10 +1,11 @@
 import sys
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
-from Application.trading.strategy_fields import TRADING_FLOW_APPROACH # noqa: E402
+from Application.trading import strategy_fields as strategy # noqa: E402
 
 
 
@@ -12,4 +13,5 @@ def start_live_trading_flow():
     """
     Executes the chosen trading approach.
     """
-    return TRADING_FLOW_APPROACH['function'](properties=TRADING_FLOW_APPROACH['properties'])
\ No newline at end of file
+    approach = strategy.TRADING_FLOW_APPROACH
+    return approach['function'](properties=approach['properties'])
\ No newline at end of file
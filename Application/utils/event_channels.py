@@ -7,6 +7,8 @@ class Event:
     SUCCESS_FETCH  = 'successfully fetched data'
     START_ACTIVITY = 'active time is started'
     NEW_KLINE_DATA = 'new kline data arrived'
+    NEW_SYMBOL_KLINE_DATA = 'new kline data arrived for a symbol and resolution'
+    SYMBOL_CANDLE_CLOSED  = 'a candle got closed for a symbol and resolution'
     VALID_TP_SIGNAL   = 'there is a valid tp signal'
     VALID_SL_SIGNAL   = 'there is a valid sl signal'
     MARKET_IS_VALID   = 'market is valid'
@@ -18,6 +20,12 @@ class Event:
     LATE_TRADING_SIGNAL  = 'there are late trading signals available'
     NEW_INDICATORS_DATA  = 'new indicators data arrived'
     OPEN_POSITIONS_EXIST = 'there are open positions available'
+    ORDER_FILLED           = 'an order got completely filled'
+    ORDER_CANCELED         = 'an order got canceled'
+    ORDER_PARTIALLY_FILLED = 'an order got partially filled'
+    POSITION_OPENED        = 'a position got opened'
+    POSITION_CLOSED        = 'a position got closed'
+    GADABOUTS_DETECTED     = 'there are positions without enough sl or tp coverage'
     SUCCESS_AUTHORIZATION           = 'Authorization to the trading platform granted successfully.'
     NEW_VALIDATION_INDICATOR_DATA   = 'there are new data available for validation indicators'
     RECOVERY_MECHANISM_ACCOMPLISHED = 'recovery mechanism is done successfully'
\ No newline at end of file
@@ -32,4 +32,32 @@ def resolution_map(resolution: str) -> str:
     except ValueError as err:
         logging.error(f'Inside "resolution_map()" function of "utils.exchange.nobitex.py" module: {err}')
         return '0'
-    # ____________________________________________________________________________ . . .
\ No newline at end of file
+    # ____________________________________________________________________________ . . .
+
+def resolution_seconds(resolution: str) -> int:
+    """
+    Maps resolution string to the length of its candles in seconds.
+
+    Raises:
+        ValueError: If the resolution is not one of Nobitex's approved resolutions.
+    """
+    seconds_dict: dict[str, int] = {
+        '1'  : 60,
+        '5'  : 300,
+        '15' : 900,
+        '30' : 1_800,
+        '60' : 3_600,
+        '180': 10_800,
+        '240': 14_400,
+        '360': 21_600,
+        '720': 43_200,
+        'D'  : 86_400,
+        '2D' : 172_800,
+        '3D' : 259_200,
+    }
+    if resolution not in seconds_dict:
+        raise ValueError(f'Provided resolution (timeframe) {resolution} is not in Nobitex\'s '\
+                         'approved resolutions.')
+
+    return seconds_dict[resolution]
+    # ____________________________________________________________________________ . . .
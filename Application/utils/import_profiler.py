@@ -0,0 +1,96 @@
+"""
+Startup profiler which reports the import-time cost of a module and of everything it imports,
+based on the '-X importtime' option of the interpreter.
+
+Usage:
+    python -m Application.utils.import_profiler [module] [--top N]
+
+e.g. 'python -m Application.utils.import_profiler Application.execution.bot --top 30'
+"""
+import sys
+import argparse
+import subprocess
+from typing import NamedTuple
+
+
+
+
+# =================================================================================================
+class ImportRecord(NamedTuple):
+    module     : str
+    self_us    : int    # Import time of the module itself, in microseconds
+    cumulative : int    # Import time of the module including its imports, in microseconds
+    depth      : int    # Nesting level of the import
+# ________________________________________________________________________________ . . .
+
+
+def measure_imports(module_name: str) -> list[ImportRecord]:
+    """
+    Imports the module in a fresh interpreter and returns the import time of every module that
+    got imported.
+
+    Raises:
+        RuntimeError: If the module can not be imported.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                             capture_output = True,
+                             text           = True)
+
+    if process.returncode != 0:
+        raise RuntimeError(f'Importing "{module_name}" failed:\n{process.stderr[-2000:]}')
+
+    records = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative, name = line.removeprefix('import time:').split('|')
+        records.append(ImportRecord(module     = name.strip(),
+                                    self_us    = int(self_us),
+                                    cumulative = int(cumulative),
+                                    depth      = (len(name) - len(name.lstrip()) - 1) // 2))
+
+    return records
+# ________________________________________________________________________________ . . .
+
+
+def import_time_report(module_name: str, top: int = 20) -> str:
+    """
+    Returns a human readable report of import times of the module.
+
+    Parameters:
+        module_name (str): Name of the module to profile.
+        top (int): Number of the most expensive modules to list.
+
+    Returns:
+        report (str): The report text.
+    """
+    records = measure_imports(module_name)
+    total = max((record.cumulative for record in records), default=0)
+
+    lines = [f'Import time of "{module_name}": {total / 1000:.1f} ms ({len(records)} modules)', '',
+             f'Top {top} modules by cumulative time:']
+
+    for record in sorted(records, key=lambda record: record.cumulative, reverse=True)[:top]:
+        lines.append(f'  {record.cumulative / 1000:9.1f} ms  {"  " * record.depth}{record.module}')
+
+    lines += ['', f'Top {top} modules by self time:']
+    for record in sorted(records, key=lambda record: record.self_us, reverse=True)[:top]:
+        lines.append(f'  {record.self_us / 1000:9.1f} ms  {record.module}')
+
+    application_total = sum(record.self_us
+                            for record in records if record.module.startswith('Application'))
+    lines += ['', f'Self time of "Application" modules: {application_total / 1000:.1f} ms']
+
+    return '\n'.join(lines)
+# =================================================================================================
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reports the import-time cost of a module.')
+    parser.add_argument('module', nargs='?', default='Application.execution.bot')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    print(import_time_report(args.module, args.top))
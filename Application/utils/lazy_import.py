@@ -0,0 +1,64 @@
+"""
+This module contains a lazy import mechanism to defer the import cost of heavy modules (e.g.
+'pandas_ta') until they are actually used, which keeps startup of the bot and imports in tests and
+worker processes cheap.
+"""
+import sys
+import types
+import importlib
+import threading
+
+
+
+
+# =================================================================================================
+class LazyModule(types.ModuleType):
+    """
+    Placeholder of a module which imports the real module on first attribute access and then
+    takes over its namespace, so later accesses cost as much as a normal module attribute.
+    """
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+    # ____________________________________________________________________________ . . .
+
+    def _load(self) -> types.ModuleType:
+        with self.__dict__['_lazy_lock']:
+            module = sys.modules.get(self.__name__)
+            if module is None or module is self:
+                module = importlib.import_module(self.__name__)
+
+            self.__dict__.update(module.__dict__)
+            return module
+    # ____________________________________________________________________________ . . .
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+    # ____________________________________________________________________________ . . .
+
+    def __dir__(self):
+        return dir(self._load())
+# ________________________________________________________________________________ . . .
+
+
+def lazy_import(module_name: str) -> types.ModuleType:
+    """
+    Returns the module if it is already imported, otherwise a placeholder which imports it on
+    first use.
+
+    Parameters:
+        module_name (str): Absolute name of the module (e.g. 'pandas_ta').
+
+    Returns:
+        module (ModuleType): The module or its lazy placeholder.
+    """
+    module = sys.modules.get(module_name)
+    return module if module is not None else LazyModule(module_name)
+# =================================================================================================
+
+
+
+if __name__ == '__main__':
+    ta = lazy_import('pandas_ta')
+    print('pandas_ta' in sys.modules, ta)
+    print(ta.supertrend, 'pandas_ta' in sys.modules)
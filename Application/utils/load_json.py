@@ -1,14 +1,23 @@
+import os
 import sys
 import json
+import time
+from types import MappingProxyType
 from dotenv import dotenv_values
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application.utils.logs import get_logger # noqa: E402
 
 bot_logs = get_logger(logger_name='bot_logs')
 
+RELOAD_CHECK_INTERVAL: float = 1.0    # Minimum seconds between checks of a file for changes
+
+# file_path -> [modification time, frozen config, monotonic time of last check]
+_cache: dict[str, list] = {}
+
 
 
 # =================================================================================================
@@ -26,6 +35,65 @@ def load(file_path: str) -> dict:
     except Exception as err:
         bot_logs.error(f"Unexpected error loading .json file: {err}")
         raise
+# ________________________________________________________________________________ . . .
+
+
+def freeze(value):
+    """
+    Recursively turns dicts of a loaded json value into read-only mappings and lists into tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+
+    return value
+# ________________________________________________________________________________ . . .
+
+
+def load_cached(file_path: str, check_interval: float = RELOAD_CHECK_INTERVAL) -> MappingProxyType:
+    """
+    Returns the parsed and frozen content of a .json file which is read from disk only once and
+    re-read whenever the file gets modified.
+
+    Parameters:
+        file_path (str): Path of the .json file.
+        check_interval (float): Minimum seconds between two checks of the file for changes.
+
+    Returns:
+        config (MappingProxyType): The read-only content of the .json file. The same object is
+                                   returned as long as the file does not change.
+
+    Raises:
+        FileNotFoundError, JSONDecodeError: Only if the file has never been loaded successfully,
+                                            later failures keep serving the last loaded content.
+    """
+    now = time.monotonic()
+    cached = _cache.get(file_path)
+
+    if cached and now - cached[2] < check_interval:
+        return cached[1]
+
+    try:
+        modified_time = os.stat(file_path).st_mtime_ns
+        if cached and cached[0] == modified_time:
+            cached[2] = now
+            return cached[1]
+
+        config = freeze(load(file_path))
+    except Exception as err:
+        if not cached:
+            raise
+
+        bot_logs.error(f'Keeping the previous content of "{file_path}", reloading it failed: {err}')
+        cached[2] = now
+        return cached[1]
+
+    if cached:
+        bot_logs.info(f'Reloaded the modified .json file at "{file_path}".')
+
+    _cache[file_path] = [modified_time, config, now]
+    return config
 # =================================================================================================
 
 
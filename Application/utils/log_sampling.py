@@ -0,0 +1,126 @@
+"""
+This module contains the logging filter of hot paths, which keeps console and file I/O of loggers
+that log on every tick from scaling with the tick rate.
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable, Mapping
+
+
+
+
+# =================================================================================================
+class _CallSite:
+    __slots__ = ('count', 'tokens', 'refilled_at', 'last_message', 'last_passed_at', 'repeated',
+                 'suppressed')
+
+    def __init__(self, burst: float, now: float):
+        self.count          : int        = 0
+        self.tokens         : float      = burst
+        self.refilled_at    : float      = now
+        self.last_message   : str | None = None
+        self.last_passed_at : float      = now
+        self.repeated       : int        = 0
+        self.suppressed     : int        = 0
+# ________________________________________________________________________________ . . .
+
+
+class HotPathFilter(logging.Filter):
+    """
+    Per call-site (file and line of the logging call) filter which applies, in order:
+        - Deduplication: A message identical to the last passed one of its call site is dropped
+          within 'dedup_window' seconds.
+        - Sampling: Only one of every 'sample_every' records of a call site passes.
+        - Rate limiting: A token bucket of 'burst' records refilled by 'rate_per_second'.
+
+    Records above 'max_level' (warnings and errors by default) always pass. The next passed record
+    of a call site gets the number of repeated and suppressed records appended to its message.
+    """
+    def __init__(self,
+                 max_level       : int = logging.INFO,
+                 sample_every    : int = 1,
+                 rate_per_second : float = 0.0,
+                 burst           : float = 1.0,
+                 dedup_window    : float = 0.0,
+                 clock           : Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            max_level (int): Highest level that gets filtered.
+            sample_every (int): Pass one of every n records of a call site, 1 disables sampling.
+            rate_per_second (float): Records per second allowed for a call site, 0 disables it.
+            burst (float): Records a call site can emit at once before being rate limited.
+            dedup_window (float): Seconds within which repeated messages are dropped, 0 disables it.
+            clock (Callable): Source of monotonic time in seconds.
+        """
+        super().__init__()
+        self.max_level       = max_level
+        self.sample_every    = max(1, sample_every)
+        self.rate_per_second = rate_per_second
+        self.burst           = max(1.0, burst)
+        self.dedup_window    = dedup_window
+        self.clock           = clock
+
+        self._sites: dict[tuple[str, int], _CallSite] = {}
+        self._lock = threading.Lock()
+    # ____________________________________________________________________________ . . .
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+
+        with self._lock:
+            now = self.clock()
+            site = self._sites.get((record.pathname, record.lineno))
+            if site is None:
+                site = self._sites[(record.pathname, record.lineno)] = _CallSite(self.burst, now)
+
+            message = record.getMessage() if self.dedup_window else None
+            if message is not None and message == site.last_message and \
+               now - site.last_passed_at < self.dedup_window:
+                site.repeated += 1
+                return False
+
+            site.count += 1
+            if (site.count - 1) % self.sample_every:
+                site.suppressed += 1
+                return False
+
+            if self.rate_per_second:
+                site.tokens = min(self.burst,
+                                  site.tokens + (now - site.refilled_at) * self.rate_per_second)
+                site.refilled_at = now
+
+                if site.tokens < 1:
+                    site.suppressed += 1
+                    return False
+                site.tokens -= 1
+
+            if site.repeated or site.suppressed:
+                notes = []
+                if site.repeated:
+                    notes.append(f'previous message repeated {site.repeated} times')
+                if site.suppressed:
+                    notes.append(f'{site.suppressed} messages suppressed')
+
+                record.msg, record.args = f'{record.getMessage()} [{"; ".join(notes)}]', None
+                site.repeated = site.suppressed = 0
+
+            site.last_message = message
+            site.last_passed_at = now
+            return True
+# ________________________________________________________________________________ . . .
+
+
+def build_hot_path_filter(config: Mapping[str, Any]) -> HotPathFilter:
+    """
+    Creates a HotPathFilter out of the 'hot_path_sampling' field of 'logs_config.json'.
+    """
+    return HotPathFilter(
+        max_level       = logging.getLevelNamesMapping()[config.get('max_level', 'INFO')],
+        sample_every    = config.get('sample_every', 1),
+        rate_per_second = config.get('rate_per_second', 0.0),
+        burst           = config.get('burst', 1.0),
+        dedup_window    = config.get('dedup_window_seconds', 0.0)
+    )
+# =================================================================================================
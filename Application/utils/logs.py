@@ -4,31 +4,58 @@ import pytz
 import json
 import queue
 import logging
+import operator
+import functools
+import threading
 import traceback
 import logging.config
 import logging.handlers
 from zoneinfo import ZoneInfo
 from datetime import date, datetime
-from typing import Mapping, Any, Literal, override
+from typing import Mapping, Any, Callable, Literal, override
 from logging.handlers import TimedRotatingFileHandler
-from persiantools.jdatetime import JalaliDate, JalaliDateTime # type: ignore
 
+from Application.utils.lazy_import import lazy_import
+from Application.utils.log_sampling import build_hot_path_filter
 
-with open(r'Application/configs/config.json', 'r') as config_file:
-    config = json.load(config_file)
+jdatetime = lazy_import('persiantools.jdatetime')
 
-LOCAL_TIME_ZONE_NAME = config.get('local_time_zone_name', None)
-CAPTURE_THIRD_PARTIES_AS_ROOT = config.get('capture_third_parties_as_root', True)
+
+@functools.cache
+def _read_config(path: str) -> dict:
+    """
+    Reads a config file once, so no config file is read at import time or read again later.
+    """
+    with open(path, 'r') as file:
+        return json.load(file)
 # ________________________________________________________________________________ . . .
 
 
-def extract_log_configs(field : str) -> Any:
-    path = r'Application/configs/logs_config.json'
+def _local_time_zone_name() -> str:
+    # Log times fall back to UTC when no local time zone is configured
+    return _read_config(r'Application/configs/config.json').get('local_time_zone_name') or 'UTC'
+# ________________________________________________________________________________ . . .
 
-    with open(path, 'r') as file:
-                json_dict = json.load(file)
 
-    value = json_dict.get(field, None)
+def _capture_third_parties_as_root() -> bool:
+    return _read_config(r'Application/configs/config.json').get('capture_third_parties_as_root',
+                                                                True)
+# ________________________________________________________________________________ . . .
+
+
+def __getattr__(name: str) -> Any:
+    # Former import-time constants, resolved on access
+    if name == 'LOCAL_TIME_ZONE_NAME':
+        return _local_time_zone_name()
+    if name == 'CAPTURE_THIRD_PARTIES_AS_ROOT':
+        return _capture_third_parties_as_root()
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+# ________________________________________________________________________________ . . .
+
+
+def extract_log_configs(field : str) -> Any:
+    value = _read_config(r'Application/configs/logs_config.json').get(field, None)
 
     if not value:
         raise ValueError(f"Can not find value of '{field}' field 'strategy.json' config file, "\
@@ -59,10 +86,11 @@ def get_log_level(
         "CRITICAL": logging.CRITICAL,
     }
 
-    log_level = levels_map.get(
-        extract_log_configs(f"{logger_or_handler}_log_level"),
-        logging.INFO,
+    # Loggers without a configured level (e.g. 'bot_logs') fall back to 'INFO'
+    level_name: str = _read_config(r'Application/configs/logs_config.json').get(
+        f"{logger_or_handler}_log_level", "INFO"
     )
+    log_level = levels_map.get(level_name, logging.INFO)
 
     return log_level
 # =================================================================================================
@@ -119,7 +147,7 @@ class FormatterWithTimeZone(logging.Formatter):
         Override of the 'formatTime' method to use the provided timezone.
         """
         dt = (
-            JalaliDateTime.fromtimestamp(record.created, self.timezone)
+            jdatetime.JalaliDateTime.fromtimestamp(record.created, self.timezone)
             if self.calendar_type == "Jalali"
             else datetime.fromtimestamp(record.created, self.timezone)
         )
@@ -340,7 +368,7 @@ class JSONWithTimezoneFormatter(logging.Formatter):
         """
         # Use timezone if specified
         if self.calendar_type == "Jalali":
-            dt = JalaliDateTime.fromtimestamp(record.created, self.timezone)
+            dt = jdatetime.JalaliDateTime.fromtimestamp(record.created, self.timezone)
         else:
             dt = datetime.fromtimestamp(record.created, self.timezone)
 
@@ -423,6 +451,151 @@ class JSONWithTimezoneFormatter(logging.Formatter):
 # =================================================================================================
 
 
+# Attributes of every LogRecord, anything else on a record comes from the 'extra' argument
+STANDARD_RECORD_FIELDS = frozenset(logging.LogRecord('', 0, '', 0, '', None, None).__dict__) | \
+                         frozenset(['message', 'asctime'])
+
+_dumps: Callable[[dict], str]
+try:
+    import orjson    # type: ignore
+
+    def _orjson_dumps(log_record: dict) -> str:
+        return orjson.dumps(log_record, default=str).decode()
+
+    _dumps = _orjson_dumps
+except ImportError:
+    _dumps = json.JSONEncoder(default=str, ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _record_attribute(attr: str, record: logging.LogRecord) -> Any:
+    return record.__dict__.get(attr)
+
+
+class FastJSONFormatter(logging.Formatter):
+    """
+    JSON lines formatter for hot paths, producing the same fields as 'JSONWithTimezoneFormatter'
+    in JSON mode.
+
+    The configured json_fields are compiled once into a list of field getters, the formatted time
+    is computed once per second and reused, extra fields are found by a set difference instead of
+    probing every value, and non serializable values are turned into strings by the encoder itself.
+    'orjson' is used as encoder when it is installed.
+    """
+    def __init__(
+        self,
+        datefmt: str | None = None,
+        timezone: str | None = None,
+        json_fields: Mapping[str, str] | None = None,
+        calendar_type: Literal["Gregorian", "Jalali"] = "Gregorian",
+    ):
+        """
+        Parameters:
+            datefmt (str): Datetime format string, ISO 8601 is used if not given.
+            timezone (str): Timezone name (e.g., 'America/New_York').
+            json_fields (Mapping[str, str]): Keys of JSON log record mapped to record attributes.
+            calendar_type (Literal['Gregorian', 'Jalali']): Weather to use Jalali DateTime or not.
+        """
+        super().__init__(datefmt=datefmt)
+        self.timezone = ZoneInfo(timezone) if timezone else ZoneInfo("UTC")
+        self.calendar_type = calendar_type
+        self.json_fields = json_fields or {
+            "level": "levelname",
+            "time": "asctime",
+            "time_stamp": "created",
+            "logger": "name",
+            "message": "message",
+        }
+        self._plan = self._compile_plan(self.json_fields)
+        self._time_cache: tuple[int, str] = (-1, "")
+
+    # ____________________________________________________________________________ . . .
+
+    def _compile_plan(
+        self, json_fields: Mapping[str, str]
+    ) -> list[tuple[str, Callable[[logging.LogRecord], Any]]]:
+        """
+        Compiles the json_fields into a list of (key, getter) pairs, each getter returns the value
+        of its key out of a log record. Attributes which every record has are read by an
+        'attrgetter', others (e.g. extras) are None on records which lack them.
+        """
+        plan: list[tuple[str, Callable[[logging.LogRecord], Any]]] = []
+        for key, attr in json_fields.items():
+            getter: Callable[[logging.LogRecord], Any]
+            if attr == "asctime":
+                getter = self.formatTime
+            elif attr == "message":
+                getter = logging.LogRecord.getMessage
+            elif attr in STANDARD_RECORD_FIELDS:
+                getter = operator.attrgetter(attr)
+            else:
+                getter = functools.partial(_record_attribute, attr)
+
+            plan.append((key, getter))
+
+        return plan
+
+    # ____________________________________________________________________________ . . .
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {key: getter(record) for key, getter in self._plan}
+
+        # Handle any extra fields passed to the logger
+        # A record without extras has at most the standard attributes plus 'message'
+        attributes = record.__dict__
+        if len(attributes) > len(STANDARD_RECORD_FIELDS) - 1:
+            for key in attributes.keys() - STANDARD_RECORD_FIELDS:
+                log_record[key] = attributes[key]
+
+        # Add exception info if it exists
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_record["exception"] = record.exc_text
+
+        if record.stack_info:
+            log_record["stack_info"] = record.stack_info
+
+        return _dumps(log_record)
+
+    # ____________________________________________________________________________ . . .
+
+    @override
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        """
+        Returns the time of record, the formatted time is cached per second when datefmt has no
+        sub-second directive.
+        """
+        datefmt = datefmt or self.datefmt
+        if not datefmt or "%f" in datefmt:
+            return self._convert_time(record.created, datefmt)
+
+        second = int(record.created)
+        cached_second, formatted_time = self._time_cache
+        if second != cached_second:
+            formatted_time = self._convert_time(second, datefmt)
+            self._time_cache = (second, formatted_time)
+
+        return formatted_time
+
+    # ____________________________________________________________________________ . . .
+
+    def _convert_time(self, timestamp: float, datefmt: str | None) -> str:
+        if self.calendar_type == "Jalali":
+            dt = jdatetime.JalaliDateTime.fromtimestamp(timestamp, self.timezone)
+        else:
+            dt = datetime.fromtimestamp(timestamp, self.timezone)
+
+        return dt.strftime(datefmt) if datefmt else dt.isoformat()
+
+    # ____________________________________________________________________________ . . .
+
+    @override
+    def formatException(self, ei) -> str:
+        return "".join(traceback.format_exception(*ei))
+# =================================================================================================
+
+
 
 
 
@@ -468,8 +641,8 @@ def month_day_hour_file_name_generator(
 
     Gregorian_month_name = date.today().strftime("%B_%Y-%m")
     Gregorian_day_name = date.today().strftime("%A_%B_%d")
-    Jalali_month_name = JalaliDate.today().strftime("%B_%Y-%m")
-    Jalali_day_name = JalaliDate.today().strftime("%A_%d_%B")
+    Jalali_month_name = jdatetime.JalaliDate.today().strftime("%B_%Y-%m")
+    Jalali_day_name = jdatetime.JalaliDate.today().strftime("%A_%d_%B")
 
     sub_folders_name_map = {
         "Gregorian_Dated": f"{Gregorian_month_name}/{Gregorian_day_name}/",
@@ -502,7 +675,7 @@ def timed_file_handler(
     time_zone: str,
     logs_date_type: Literal["Gregorian", "Jalali"],
     json_fields: Mapping[str, str] | None = None,
-    log_level: int = get_log_level("file"),
+    log_level: int | None = None,
     naming_approach: Literal[
         "Gregorian_Dated",
         "Jalali_Dated",
@@ -527,24 +700,25 @@ def timed_file_handler(
     Returns:
         file_handler (logging.TimedRotatingFileHandler): _description_.
     """
+    file_suffix = file_suffix.lstrip(".")    # type: ignore  # 'log_suffix' is configured as '.jsonl'
+
     file_handler = TimedRotatingFileHandler(
         filename    = month_day_hour_file_name_generator(
             parent_logs_path       = logs_path,
-            time_zone_name         = LOCAL_TIME_ZONE_NAME,
+            time_zone_name         = _local_time_zone_name(),
             file_suffix            = file_suffix,
             folder_naming_approach = naming_approach),
         when        = when,
         interval    = rotating_interval,
         backupCount = backup_count)
 
-    file_handler.setLevel(log_level)
+    file_handler.setLevel(log_level if log_level is not None else get_log_level("file"))
 
     if file_suffix == "jsonl":
         file_handler.setFormatter(
-            fmt=JSONWithTimezoneFormatter(
+            fmt=FastJSONFormatter(
                 datefmt       = date_fmt,
                 timezone      = time_zone,
-                output_json   = True,
                 json_fields   = json_fields,
                 calendar_type = logs_date_type)
         )
@@ -585,7 +759,7 @@ def stdout_handler(log_level: int,
             fmt           = extract_log_configs(field="stdout_fmt"),
             datefmt       = extract_log_configs(field="date_fmt"),
             style         = "{",
-            timezone      = LOCAL_TIME_ZONE_NAME,
+            timezone      = _local_time_zone_name(),
             calendar_type = calendar_type,
         )
     )
@@ -614,7 +788,7 @@ def stderr_handler(calendar_type: Literal["Jalali", "Gregorian"]) -> logging.Han
             fmt           = extract_log_configs(field="stderr_fmt"),
             datefmt       = extract_log_configs(field="date_fmt"),
             style         = "{",
-            timezone      = LOCAL_TIME_ZONE_NAME,
+            timezone      = _local_time_zone_name(),
             calendar_type = calendar_type,
         )
     )
@@ -623,15 +797,61 @@ def stderr_handler(calendar_type: Literal["Jalali", "Gregorian"]) -> logging.Han
 # ________________________________________________________________________________ . . .
 
 
-def queue_workers() -> (tuple[logging.handlers.QueueHandler, logging.handlers.QueueListener]):
+class DroppingQueueHandler(logging.handlers.QueueHandler):
     """
-    _summary_
+    Queue handler which never blocks the logging thread. Records that do not fit into the bounded
+    queue are dropped and counted per level, and the number of dropped records is reported by a
+    warning as soon as the queue has room again.
+    """
+    def __init__(self, logs_queue: queue.Queue):
+        super().__init__(logs_queue)
+        self.dropped: dict[str, int] = {}
+        self._unreported: int = 0
+        self._lock = threading.Lock()
+
+    # ____________________________________________________________________________ . . .
+
+    @override
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+                self._unreported += 1
+            return
+
+        if self._unreported:
+            with self._lock:
+                unreported, self._unreported = self._unreported, 0
+
+            report = logging.LogRecord(name     = 'root',
+                                       level    = logging.WARNING,
+                                       pathname = __file__,
+                                       lineno   = 0,
+                                       msg      = f'{unreported} log records got dropped since the '
+                                                  'logs queue was full.',
+                                       args     = None,
+                                       exc_info = None,
+                                       func     = 'enqueue')
+            try:
+                self.queue.put_nowait(report)
+            except queue.Full:
+                with self._lock:
+                    self._unreported += unreported
+# ________________________________________________________________________________ . . .
+
+
+def queue_workers() -> (tuple[DroppingQueueHandler, logging.handlers.QueueListener]):
+    """
+    Creates the logs queue along with its handler and its listener, which owns the stream and
+    file handlers.
 
     Returns:
-        _type_: _description_
+        workers (tuple): The queue handler and the (not yet started) queue listener.
     """
-    logs_queue: queue.Queue = queue.Queue()
-    queue_handler = logging.handlers.QueueHandler(logs_queue)
+    logs_queue: queue.Queue = queue.Queue(maxsize=extract_log_configs(field='logs_queue_max_size'))
+    queue_handler = DroppingQueueHandler(logs_queue)
     queue_listener = logging.handlers.QueueListener(
         logs_queue,
 
@@ -649,7 +869,7 @@ def queue_workers() -> (tuple[logging.handlers.QueueHandler, logging.handlers.Qu
             rotating_interval = extract_log_configs(field="rotating_file_handler_interval"),
             backup_count      = extract_log_configs(field="files_backup_count",),
             date_fmt          = extract_log_configs(field="date_fmt"),
-            time_zone         = LOCAL_TIME_ZONE_NAME,
+            time_zone         = _local_time_zone_name(),
             logs_date_type    = extract_log_configs(field="file_handlers_calendar_type"),
             json_fields       =extract_log_configs(field="json_fields"),
             log_level         = get_log_level("file"),
@@ -659,9 +879,36 @@ def queue_workers() -> (tuple[logging.handlers.QueueHandler, logging.handlers.Qu
     )
 
     return queue_handler, queue_listener
+# ________________________________________________________________________________ . . .
 
 
+# The single logs backend shared by all loggers
+queue_handler: DroppingQueueHandler | None = None
 queue_listener: logging.handlers.QueueListener | None = None
+_backend_lock = threading.Lock()
+
+
+def shared_queue_handler() -> DroppingQueueHandler:
+    """
+    Returns the queue handler shared by all loggers, and creates and starts the logs backend (one
+    queue, one listener thread and one set of handlers) on first call.
+    """
+    global queue_handler, queue_listener
+
+    with _backend_lock:
+        if queue_handler is None:
+            queue_handler, queue_listener = queue_workers()
+            queue_listener.start()
+
+    return queue_handler
+# ________________________________________________________________________________ . . .
+
+
+def dropped_logs() -> dict[str, int]:
+    """
+    Returns the number of log records dropped so far, per level name.
+    """
+    return dict(queue_handler.dropped) if queue_handler else {}
 # ________________________________________________________________________________ . . .
 
 # Other Handlers ...
@@ -678,8 +925,6 @@ def initialize_logger(logger_name: str) -> logging.Logger:
     
     Args:
         logger_name (str): Name of the logger.
-        log_level (int): Logging level.
-        capture_third_party (bool): Whether to capture logs from third-party libraries.
     
     Returns:
         logging.Logger: Configured logger instance.
@@ -687,34 +932,34 @@ def initialize_logger(logger_name: str) -> logging.Logger:
     logger = logging.getLogger(name=logger_name)
     
     # Check if the logger has handlers already to avoid duplication
-    if logger.hasHandlers():
+    if logger.handlers:
         logger.warning(f'Logger "{logger_name}" is already initialized. Reusing existing configuration.')
         return logger
 
     # Set logger level
     logger.setLevel(get_log_level(logger_name))
 
-    # Create queue handler and listener
-    global queue_listener
-    queue_handler, queue_listener = queue_workers()
-    logger.addHandler(hdlr=queue_handler)
+    # Attach the shared queue handler, records must not reach it again through the root logger
+    handler = shared_queue_handler()
+    logger.addHandler(hdlr=handler)
+    logger.propagate = False
 
-    # Start the queue listener
-    queue_listener.start()
+    # Sample and rate limit the loggers of hot paths
+    sampling = _read_config(r'Application/configs/logs_config.json').get('hot_path_sampling', {})
+    if sampling.get('enabled') and logger_name in sampling.get('loggers', []):
+        logger.addFilter(build_hot_path_filter(sampling))
 
     logger.info(f'Initialized the "{logger.name}" logger.')
     
-    if CAPTURE_THIRD_PARTIES_AS_ROOT:
+    if _capture_third_parties_as_root():
         # Configure the root logger to capture third-party logs
         root_logger = logging.getLogger()
         
         # Avoid adding duplicate handlers to the root logger
-        if not root_logger.hasHandlers():
+        if handler not in root_logger.handlers:
             root_logger.setLevel(get_log_level('root'))
-            root_logger.addHandler(hdlr=queue_handler)
+            root_logger.addHandler(hdlr=handler)
             root_logger.info("Configured root logger to capture third-party logs.")
-        else:
-            root_logger.warning("Root logger already configured. Skipping additional handler configuration.")
 
     return logger
 # ________________________________________________________________________________ . . .
@@ -724,7 +969,11 @@ def finish_logs():
     """Finishes handling queued logs by stopping the QueueListener."""
     global queue_listener
     if queue_listener:
+        if dropped_logs():
+            logging.getLogger().warning(f'Dropped log records per level: {dropped_logs()}')
+
         queue_listener.stop()
+        queue_listener = None
         logging.getLogger().info("Queue listener stopped.")
     else:
         logging.getLogger().error("Queue listener is not active. Cannot stop.")
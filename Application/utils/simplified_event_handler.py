@@ -5,10 +5,12 @@ from dotenv import dotenv_values
 from collections import defaultdict
 from typing import Callable, Coroutine, Dict, List, Any, Tuple
 
-path = dotenv_values('project_path.env').get('PYTHONPATH')
-sys.path.append(path) if path else None
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
 
 from Application import jarchi_logs # noqa: E402
+from Application.utils import tracing # noqa: E402
 
 
 
@@ -112,13 +114,14 @@ class EventHandler:
         tasks = [self.__invoke_listener(listener, **kwargs) for listener in self._listeners[event]]
         loop = asyncio.get_event_loop()
 
-        # Check if the event loop is already running
-        if loop.is_running():
-            # Use asyncio.gather to run tasks if the loop is already running
-            await asyncio.gather(*tasks)
+        with tracing.span(f'emit "{event}"'):
+            # Check if the event loop is already running
+            if loop.is_running():
+                # Use asyncio.gather to run tasks if the loop is already running
+                await asyncio.gather(*tasks)
 
-        else:
-            loop.run_until_complete(asyncio.gather(*tasks))
+            else:
+                loop.run_until_complete(asyncio.gather(*tasks))
     # ____________________________________________________________________________ . . .
 
 
@@ -161,8 +164,9 @@ class EventHandler:
             tasks.extend([self.__invoke_listener(listener, **kwargs)
                           for listener in self._listeners[event]])
 
-        if loop.is_running():
-            asyncio.gather(*tasks)
-        else:
-            loop.run_until_complete(asyncio.gather(*tasks))
+        with tracing.span(f'bulk_emit {sorted({event for event, _ in events})}'):
+            if loop.is_running():
+                await asyncio.gather(*tasks)
+            else:
+                loop.run_until_complete(asyncio.gather(*tasks))
 # =================================================================================================
\ No newline at end of file
@@ -0,0 +1,203 @@
+import sys
+import time
+import asyncio
+import functools
+import itertools
+import numpy as np
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple
+from dotenv import dotenv_values
+
+if __name__ == '__main__':
+    path = dotenv_values('project_path.env').get('PYTHONPATH')
+    sys.path.append(path) if path else None
+
+from Application import bot_logs                        # noqa: E402
+import Application.configs.admin_config as aconfig      # noqa: E402
+
+
+QUANTILES = (50, 95, 99)
+
+
+
+
+# =================================================================================================
+class Trace(NamedTuple):
+    """
+    Stamp of a kline tick, every span recorded under it is measured from its arrival too.
+    """
+    tick_id : int
+    started : float
+# ________________________________________________________________________________ . . .
+
+
+class Span(NamedTuple):
+    tick_id    : int
+    stage      : str
+    duration   : float    # Seconds spent in the stage
+    since_tick : float    # Seconds from arrival of the tick to the end of the stage
+# ________________________________________________________________________________ . . .
+
+
+class SpanRing:
+    """
+    Fixed size in-memory ring of the latest spans.
+
+    Writers claim a slot from an 'itertools.count()' and store an immutable tuple in it, both are
+    atomic under the GIL, so recording never takes a lock; old spans are silently overwritten.
+    """
+    __slots__ = ('capacity', '_spans', '_cursor')
+
+    def __init__(self, capacity: int = aconfig.Tracing.RING_SIZE):
+        self.capacity = capacity
+        self._spans   : list[Span | None] = [None] * capacity
+        self._cursor  = itertools.count()
+
+    def record(self, span: Span) -> None:
+        self._spans[next(self._cursor) % self.capacity] = span
+
+    def spans(self) -> list[Span]:
+        return [span for span in self._spans[:] if span is not None]
+
+    def clear(self) -> None:
+        self._spans = [None] * self.capacity
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+_trace: ContextVar[Trace | None] = ContextVar('tick_trace', default=None)
+_tick_ids = itertools.count(1)
+
+ring = SpanRing()
+
+
+def start_tick() -> Trace:
+    """
+    Stamps a newly arrived tick with a monotonic id, it propagates through the context to every
+    coroutine awaited or task created from here on (e.g. the listeners run by 'EventHandler.emit').
+    """
+    trace = Trace(next(_tick_ids), time.perf_counter())
+    _trace.set(trace)
+
+    return trace
+# ________________________________________________________________________________ . . .
+
+
+def current_trace() -> Trace | None:
+    return _trace.get()
+# ________________________________________________________________________________ . . .
+
+
+@contextmanager
+def resume(trace: Trace | None) -> Iterator[None]:
+    """
+    Continues a trace captured in another context, e.g. by a worker which dequeued an order.
+    """
+    token = _trace.set(trace)
+    try:
+        yield
+    finally:
+        _trace.reset(token)
+# ________________________________________________________________________________ . . .
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Records the duration of the enclosed block as a stage of the current tick, does nothing if
+    there is no tick being traced.
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        ring.record(Span(trace.tick_id, stage, end - start, end - trace.started))
+# ________________________________________________________________________________ . . .
+
+
+def mark(stage: str) -> None:
+    """
+    Records a point of the current tick (e.g. the order going on the wire) as a zero length span.
+    """
+    trace = _trace.get()
+    if trace is not None:
+        ring.record(Span(trace.tick_id, stage, 0.0, time.perf_counter() - trace.started))
+# ________________________________________________________________________________ . . .
+
+
+def traced(stage: str) -> Callable:
+    """
+    Decorator recording every traced call of a coroutine function as a span of 'stage'.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs) -> Any:
+            if _trace.get() is None:
+                return await function(*args, **kwargs)
+
+            with span(stage):
+                return await function(*args, **kwargs)
+
+        return wrapper
+    return decorator
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+def stage_percentiles(spans     : list[Span] | None = None,
+                      quantiles : tuple[int, ...] = QUANTILES) -> dict[str, dict[str, float]]:
+    """
+    Summarizes spans per stage.
+
+    Parameters:
+        spans (list[Span]): Spans to summarize, defaults to the content of the ring.
+        quantiles (tuple[int]): Percentiles to compute.
+
+    Returns:
+        summary (dict): For each stage, the number of spans and the percentiles of its duration
+                        ('p50', ...) and of its latency since the tick ('tick_p50', ...), in
+                        milliseconds.
+    """
+    grouped: dict[str, list[tuple[float, float]]] = {}
+    for record in ring.spans() if spans is None else spans:
+        grouped.setdefault(record.stage, []).append((record.duration, record.since_tick))
+
+    summary: dict[str, dict[str, float]] = {}
+    for stage, samples in grouped.items():
+        values = np.array(samples) * 1000
+        durations = np.percentile(values[:, 0], quantiles)
+        since_tick = np.percentile(values[:, 1], quantiles)
+
+        summary[stage] = {'count': len(samples)}
+        summary[stage].update({f'p{q}': round(float(v), 3) for q, v in zip(quantiles, durations)})
+        summary[stage].update({f'tick_p{q}': round(float(v), 3)
+                               for q, v in zip(quantiles, since_tick)})
+
+    return summary
+# ________________________________________________________________________________ . . .
+
+
+async def export_stage_percentiles(interval: float = aconfig.Tracing.EXPORT_INTERVAL) -> None:
+    """
+    Periodically logs the per stage percentiles of the recent ticks.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            for stage, stats in sorted(stage_percentiles().items(),
+                                       key=lambda item: item[1]['tick_p50']):
+                bot_logs.info(f'Tick latency of "{stage}": {stats}')
+        except Exception as err:
+            bot_logs.error(f'Inside "export_stage_percentiles()" function: {err}')
+# =================================================================================================
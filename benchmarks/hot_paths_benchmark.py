@@ -0,0 +1,291 @@
+"""
+Benchmarks the data and indicator hot paths over kline windows of 100 to 100k candles, built from
+synthetic random walks and from the checked-in 'Temp/BTCUSDT-15m-2023-01-01' CSV.
+
+Results are compared with the stored baseline, and the run fails if any case got slower than the
+baseline by more than the tolerance. The NumPy fallback of the indicator kernels, which is what
+deployments run since Numba is optional, keeps its baseline in 'benchmarks/results/hot_paths.json';
+runs with Numba compiling the kernels use 'benchmarks/results/hot_paths_numba.json'.
+
+Usage:
+    python benchmarks/hot_paths_benchmark.py [--sizes 100 1000] [--cases update_dataframe]
+                                             [--tolerance 0.25] [--save]
+
+    Set 'NUMBA_DISABLE_JIT=1' to benchmark the NumPy fallback where Numba is installed.
+"""
+import sys
+import json
+import time
+import timeit
+import asyncio
+import logging
+import argparse
+import platform
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable
+from dotenv import dotenv_values
+
+path = dotenv_values('project_path.env').get('PYTHONPATH')
+sys.path.append(path) if path else None
+
+from Application.trading.analysis import kernels                            # noqa: E402
+from Application.trading import strategy_fields as strategy                 # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler         # noqa: E402
+from Application.trading.signals.signal_generator import generate_signals   # noqa: E402
+from Application.trading.analysis.indicator_supervisor import compute_indicators   # noqa: E402
+from Application.data.data_tools import has_signal,\
+                                        df_has_news,\
+                                        update_dataframe,\
+                                        parse_order_book,\
+                                        parse_kline_to_df       # noqa: E402
+
+
+RESULTS_FILE = Path(__file__).parent / 'results' / \
+               ('hot_paths_numba.json' if kernels.JIT else 'hot_paths.json')
+CSV_FILE = Path(__file__).parent.parent / 'Temp' / 'BTCUSDT-15m-2023-01-01' / \
+           'BTCUSDT-15m-2023-01-01.csv'
+
+SIZES = [100, 1_000, 10_000, 100_000]
+FAN_OUTS = [1, 10, 100, 1_000]
+RESOLUTION = 900
+
+loop = asyncio.new_event_loop()
+
+
+
+
+# =================================================================================================
+def synthetic_raw_kline(size: int, seed: int = 7) -> dict[str, list]:
+    """
+    Returns a raw kline (shaped like the OHLC endpoint response) of a random walk.
+    """
+    rng = np.random.default_rng(seed)
+    close = 16_500 * np.exp(np.cumsum(rng.normal(0, 0.002, size)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0015, size)) * close
+
+    return {'t': (1_672_531_200 + RESOLUTION * np.arange(size)).tolist(),
+            'o': open_.round(2).tolist(),
+            'h': (np.maximum(open_, close) + spread).round(2).tolist(),
+            'l': (np.minimum(open_, close) - spread).round(2).tolist(),
+            'c': close.round(2).tolist(),
+            'v': rng.gamma(2.0, 600, size).round(3).tolist()}
+# ________________________________________________________________________________ . . .
+
+
+def csv_raw_kline(size: int) -> dict[str, list]:
+    """
+    Returns a raw kline of the checked-in BTCUSDT 15m candles, tiled to 'size' candles. The file
+    is exported with an ESC column separator and '/' as the decimal mark of its time columns.
+    """
+    csv_df = pd.read_csv(CSV_FILE, sep='\x1b', dtype={'open_time': str})
+    repeats = -(-size // len(csv_df))
+    tiled = pd.concat([csv_df] * repeats, ignore_index=True).head(size)
+    start = int(float(csv_df['open_time'].iloc[0].replace('/', '.')) // 1000)
+
+    return {'t': (start + RESOLUTION * np.arange(size)).tolist(),
+            'o': tiled['open'].tolist(),
+            'h': tiled['high'].tolist(),
+            'l': tiled['low'].tolist(),
+            'c': tiled['close'].tolist(),
+            'v': tiled['volume'].tolist()}
+# ________________________________________________________________________________ . . .
+
+
+def raw_order_book(depth: int, seed: int = 7) -> dict[str, list]:
+    rng = np.random.default_rng(seed)
+    asks = 16_510 + np.cumsum(rng.uniform(0.1, 2, depth))
+    bids = 16_500 - np.cumsum(rng.uniform(0.1, 2, depth))
+    volumes = rng.gamma(1.5, 0.3, (2, depth))
+
+    return {'asks': [[f'{price:.2f}', f'{volume:.4f}'] for price, volume in zip(asks, volumes[0])],
+            'bids': [[f'{price:.2f}', f'{volume:.4f}'] for price, volume in zip(bids, volumes[1])]}
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+# Each case takes the window size and a raw kline, and returns the zero-argument callable to time
+def case_parse_kline_to_df(size: int, raw: dict) -> Callable[[], Any]:
+    return lambda: parse_kline_to_df(raw)
+# ________________________________________________________________________________ . . .
+
+
+def case_update_dataframe(size: int, raw: dict) -> Callable[[], Any]:
+    kline_df = parse_kline_to_df(raw)
+    origin_df, late_df = kline_df.iloc[:-1].copy(), kline_df.iloc[-3:]
+
+    return lambda: update_dataframe(origin_df.copy(), late_df, size)
+# ________________________________________________________________________________ . . .
+
+
+def case_df_has_news(size: int, raw: dict) -> Callable[[], Any]:
+    kline_df = parse_kline_to_df(raw)
+    late_df = kline_df.copy()
+
+    return lambda: df_has_news(kline_df, late_df)
+# ________________________________________________________________________________ . . .
+
+
+def case_parse_order_book(size: int, raw: dict) -> Callable[[], Any]:
+    order_book = raw_order_book(min(size, 1_000))
+    return lambda: parse_order_book(order_book)
+# ________________________________________________________________________________ . . .
+
+
+def case_compute_indicators(size: int, raw: dict) -> Callable[[], Any]:
+    kline_df = parse_kline_to_df(raw)
+    system = strategy.ENTRY_SYSTEM
+
+    # A new frame per call, like every tick, so primitives shared within a tick are not reused
+    return lambda: loop.run_until_complete(compute_indicators(system, kline_df.copy(deep=False)))
+# ________________________________________________________________________________ . . .
+
+
+def case_generate_signals(size: int, raw: dict) -> Callable[[], Any]:
+    kline_df = parse_kline_to_df(raw)
+    system = strategy.ENTRY_SYSTEM
+    indicators_df = loop.run_until_complete(compute_indicators(system, kline_df))
+
+    return lambda: loop.run_until_complete(generate_signals(system, kline_df, indicators_df))
+# ________________________________________________________________________________ . . .
+
+
+def case_has_signal(size: int, raw: dict) -> Callable[[], Any]:
+    kline_df = parse_kline_to_df(raw)
+    system = strategy.ENTRY_SYSTEM
+    indicators_df = loop.run_until_complete(compute_indicators(system, kline_df))
+    signal_df = loop.run_until_complete(generate_signals(system, kline_df, indicators_df)).frame()
+    column = signal_df.columns[0]
+
+    return lambda: has_signal(signal_df, column)
+# ________________________________________________________________________________ . . .
+
+
+def case_latest_signals(size: int, raw: dict) -> Callable[[], Any]:
+    kline_df = parse_kline_to_df(raw)
+    system = strategy.ENTRY_SYSTEM
+    indicators_df = loop.run_until_complete(compute_indicators(system, kline_df))
+    signals = loop.run_until_complete(generate_signals(system, kline_df, indicators_df))
+
+    return signals.latest
+# ________________________________________________________________________________ . . .
+
+
+def case_emit_fan_out(listeners: int, raw: dict) -> Callable[[], Any]:
+    jarchi = EventHandler()
+    event = f'benchmark fan-out of {listeners} listeners'
+    jarchi.register_event(event, ['kline_df'])
+
+    async def listener(kline_df):
+        return None
+
+    for _ in range(listeners):
+        jarchi.attach(listener, event)
+    kline_df = pd.DataFrame()
+
+    return lambda: loop.run_until_complete(jarchi.emit(event, kline_df=kline_df))
+# ________________________________________________________________________________ . . .
+
+
+CASES: dict[str, Callable[[int, dict], Callable[[], Any]]] = {
+    'parse_kline_to_df'  : case_parse_kline_to_df,
+    'update_dataframe'   : case_update_dataframe,
+    'df_has_news'        : case_df_has_news,
+    'parse_order_book'   : case_parse_order_book,
+    'compute_indicators' : case_compute_indicators,
+    'generate_signals'   : case_generate_signals,
+    'has_signal'         : case_has_signal,
+    'latest_signals'     : case_latest_signals,
+    'emit_fan_out'       : case_emit_fan_out,
+}
+# =================================================================================================
+
+
+
+
+# =================================================================================================
+def measure(function: Callable[[], Any], repeat: int = 3) -> float:
+    """
+    Returns the best mean duration of a call in seconds, over 'repeat' runs of at least 0.2s.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+# ________________________________________________________________________________ . . .
+
+
+def run(cases: list[str], sizes: list[int]) -> dict[str, float]:
+    """
+    Returns the measured durations in seconds keyed by '<case>[<source>-<size>]'.
+    """
+    results: dict[str, float] = {}
+    csv_size = len(pd.read_csv(CSV_FILE, sep='\x1b'))
+
+    for name in cases:
+        if name == 'emit_fan_out':
+            windows = [('listeners', listeners, {}) for listeners in FAN_OUTS]
+        else:
+            windows = [('synthetic', size, synthetic_raw_kline(size)) for size in sizes]
+            windows.append(('csv', csv_size, csv_raw_kline(csv_size)))
+
+        for source, size, raw in windows:
+            key = f'{name}[{source}-{size}]'
+            results[key] = measure(CASES[name](size, raw))
+            print(f'{key:<45} {results[key] * 1e6:14.1f} us')
+
+    return results
+# ________________________________________________________________________________ . . .
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """
+    Returns the descriptions of cases which are slower than baseline by more than tolerance.
+    """
+    regressions = []
+    for key, seconds in results.items():
+        reference = baseline.get(key)
+        if reference and seconds > reference * (1 + tolerance):
+            regressions.append(f'{key}: {reference * 1e6:.1f} us -> {seconds * 1e6:.1f} us '
+                               f'(+{(seconds / reference - 1) * 100:.0f}%)')
+
+    return regressions
+# =================================================================================================
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the data and indicator hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown against the baseline, 0.25 means 25%%.')
+    parser.add_argument('--save', action='store_true', help='Store the results as the baseline.')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = run(args.cases, args.sizes)
+
+    stored = json.loads(RESULTS_FILE.read_text()) if RESULTS_FILE.exists() else {}
+    regressions = compare(results, stored.get('results', {}), args.tolerance)
+
+    if args.save:
+        RESULTS_FILE.parent.mkdir(exist_ok=True)
+        RESULTS_FILE.write_text(json.dumps({
+            'created' : time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'machine' : {'python'   : platform.python_version(),
+                         'pandas'   : pd.__version__,
+                         'numpy'    : np.__version__,
+                         'numba'    : kernels.JIT,
+                         'platform' : platform.platform()},
+            'results' : {**stored.get('results', {}), **results}
+        }, indent=4) + '\n')
+        print(f'Stored the results in "{RESULTS_FILE}".')
+
+    if regressions:
+        print('\nRegressions against the baseline:\n\t' + '\n\t'.join(regressions))
+        sys.exit(1)
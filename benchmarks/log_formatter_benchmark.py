@@ -0,0 +1,82 @@
+"""
+Benchmarks 'FastJSONFormatter' against 'JSONWithTimezoneFormatter' on the records of a trading
+loop, with the formatter settings of 'logs_config.json'.
+
+Usage:
+    python benchmarks/log_formatter_benchmark.py [records]
+"""
+import sys
+import json
+import time
+import logging
+from dotenv import dotenv_values
+
+path = dotenv_values('project_path.env').get('PYTHONPATH')
+sys.path.append(path) if path else None
+
+from Application.utils.logs import FastJSONFormatter,\
+                                   JSONWithTimezoneFormatter,\
+                                   extract_log_configs         # noqa: E402
+
+
+
+
+# =================================================================================================
+def make_records(count: int) -> list[logging.LogRecord]:
+    """
+    Returns log records spread over a few seconds, a third of them carry extra fields.
+    """
+    records = []
+    start = time.time()
+
+    for number in range(count):
+        record = logging.LogRecord(name     = 'trade',
+                                   level    = logging.INFO,
+                                   pathname = __file__,
+                                   lineno   = number,
+                                   msg      = 'Indicator "%s" has been added to Indicators.',
+                                   args     = ('pandas_supertrend',),
+                                   exc_info = None,
+                                   func     = 'compute_indicators')
+        record.created = start + number / 1000
+        if number % 3 == 0:
+            record.symbol = 'USDTIRT'
+            record.price = 58_123.5
+
+        records.append(record)
+
+    return records
+# ________________________________________________________________________________ . . .
+
+
+def bench(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    """
+    Returns the mean formatting time of a record in microseconds.
+    """
+    started = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+
+    return (time.perf_counter() - started) / len(records) * 1e6
+# =================================================================================================
+
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    settings = dict(datefmt       = extract_log_configs(field='date_fmt'),
+                    timezone      = 'Asia/Tehran',
+                    json_fields   = extract_log_configs(field='json_fields'),
+                    calendar_type = extract_log_configs(field='file_handlers_calendar_type'))
+
+    current = JSONWithTimezoneFormatter(output_json=True, **settings)
+    fast = FastJSONFormatter(**settings)
+
+    sample = make_records(1)[0]
+    assert json.loads(fast.format(sample))['message'] == sample.getMessage()
+
+    current_us = bench(current, make_records(count))
+    fast_us = bench(fast, make_records(count))
+
+    print(f'JSONWithTimezoneFormatter : {current_us:8.2f} us/record')
+    print(f'FastJSONFormatter         : {fast_us:8.2f} us/record  ({current_us / fast_us:.1f}x)')
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import httpx
+import asyncio
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.api.api_service import APIService                          # noqa: E402
+from Application.api.retry_policy import DeadlineExceeded, deadline_after   # noqa: E402
+from Application.api.hedging import LatencyTracker, hedged, latency_tracker # noqa: E402
+
+class TestHedging(unittest.TestCase):
+
+    def test_quantile_needs_enough_samples(self):
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for i in range(9):
+            tracker.record(i / 100)
+        self.assertIsNone(tracker.quantile())
+        for i in range(9, 100):
+            tracker.record(i / 100)
+        self.assertAlmostEqual(tracker.quantile(0.95), 0.95)
+
+    def test_slow_request_gets_hedged(self):
+        tracker = latency_tracker('/hedge-test')
+        for _ in range(tracker.min_samples):
+            tracker.record(0.01)
+
+        delays = [1.0, 0.0]
+
+        async def send():
+            await asyncio.sleep(delays.pop(0))
+            return httpx.Response(200)
+
+        async def run():
+            start = time.monotonic()
+            response = await hedged(send, '/hedge-test', 'ORDER_BOOK')
+            return response, time.monotonic() - start
+
+        response, elapsed = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(delays, [])
+        self.assertLess(elapsed, 0.5)
+
+    def test_deadline_bounds_retries(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(time.monotonic())
+            await asyncio.sleep(0.05)
+            raise httpx.ConnectError('Connection refused', request=request)
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with httpx.AsyncClient(transport=transport) as client:
+                # Fewer tries than the circuit breaker threshold fit in the deadline
+                return await APIService()._request(client, 'GET', 'https://example.test',
+                                                   '/deadline-test', 5.0, 0.05, 10,
+                                                   deadline=deadline_after(0.2))
+
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            asyncio.run(run())
+
+        self.assertGreaterEqual(len(calls), 2)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import asyncio
+import unittest
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data import market_info                # noqa: E402
+from Application.api.nobitex_api import Trade           # noqa: E402
+from Application.data.market_info import PairInfo       # noqa: E402
+
+class FakeService:
+    def __init__(self):
+        self.payloads = []
+
+    async def post(self, **kwargs):
+        self.payloads.append(kwargs['data'])
+        return mock.Mock(json=lambda: {'status': 'ok'})
+
+class TestOrderNormalization(unittest.TestCase):
+
+    def setUp(self):
+        self.service = FakeService()
+        self.trade = Trade(self.service)    # type: ignore
+
+    def place(self, amount, **kwargs):
+        return asyncio.run(self.trade._base_place_order(None, 'token', 'spot', 'buy', 'btc',    # type: ignore
+                                                        'usdt', amount, **kwargs))
+
+    def test_expired_rules_are_fetched_before_normalizing(self):
+        pairs = {'BTCUSDT': PairInfo(min_notional=5, amount_step=0.0001, price_step=0.01)}
+
+        async def fetch_market_info(http_agent=None, force=False):
+            market_info._cache.update(pairs=pairs, expires=time.time() + 60)
+            return pairs
+
+        with mock.patch.dict(market_info._cache, pairs={}, expires=0.0), \
+             mock.patch.object(market_info, 'fetch_market_info', fetch_market_info):
+            self.place(0.123456, execution='limit', price=61234.567)
+
+            # The notional is checked by the normalized stop price, 0.0001 * 50000
+            self.place(0.0001, execution='stop_market', stop_price=49999.999)
+
+            with self.assertRaises(ValueError):
+                self.place(0.00005, execution='limit', price=61234.567)
+            with self.assertRaises(ValueError):
+                self.place(0.0001, execution='stop_market', stop_price=49000)
+
+        self.assertEqual([payload['amount'] for payload in self.service.payloads],
+                         ['0.1234', '0.0001'])
+        self.assertEqual(self.service.payloads[0]['price'], '61234.57')
+        self.assertEqual(self.service.payloads[1]['stopPrice'], '50000')
+
+if __name__ == '__main__':
+    unittest.main()
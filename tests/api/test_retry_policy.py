@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import httpx
+import asyncio
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.api.api_service import APIService    # noqa: E402
+from Application.api.retry_policy import RetryPolicy,\
+                                         CircuitBreaker,\
+                                         CircuitOpenError,\
+                                         circuit_breaker     # noqa: E402
+
+def run_request(handler, method='GET', endpoint='/test', **kwargs):
+    calls = []
+
+    def transport(request):
+        calls.append(request)
+        return handler(len(calls))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(transport)) as client:
+            return await APIService()._request(client, method, 'https://example.test', endpoint,
+                                               1.0, 0.0, 3, **kwargs)
+
+    return asyncio.run(run()), calls
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_non_idempotent_requests_retry_only_unprocessed_failures(self):
+        policy = RetryPolicy(tries=3, base_delay=0.1, idempotent=False)
+        self.assertTrue(policy.should_retry(0, error=httpx.ConnectError('down')))
+        self.assertFalse(policy.should_retry(0, error=httpx.ReadTimeout('slow')))
+        self.assertTrue(policy.should_retry(0, response=httpx.Response(429)))
+        self.assertFalse(policy.should_retry(0, response=httpx.Response(500)))
+        self.assertFalse(policy.should_retry(2, error=httpx.ConnectError('down')))
+
+    def test_fail_fast_does_not_retry_timeouts(self):
+        policy = RetryPolicy(tries=3, base_delay=0.1, fail_fast=True)
+        self.assertFalse(policy.should_retry(0, error=httpx.ReadTimeout('slow')))
+        self.assertTrue(policy.should_retry(0, error=httpx.ReadError('reset')))
+
+    def test_delay_is_bounded_and_honors_retry_after(self):
+        policy = RetryPolicy(tries=5, base_delay=0.5, max_delay=4.0)
+        for attempt in range(5):
+            self.assertLessEqual(policy.delay(attempt), min(4.0, 0.5 * 2 ** attempt))
+        response = httpx.Response(429, headers={'Retry-After': '3'})
+        self.assertGreaterEqual(policy.delay(0, response), 3.0)
+
+    def test_request_retries_server_errors_of_get(self):
+        response, calls = run_request(lambda n: httpx.Response(502 if n < 3 else 200),
+                                      endpoint='/get-retry')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 3)
+
+    def test_request_does_not_repeat_post(self):
+        response, calls = run_request(lambda n: httpx.Response(500), method='POST',
+                                      endpoint='/post-once')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(calls), 1)
+
+    def test_circuit_breaker_opens_and_half_opens(self):
+        breaker = CircuitBreaker('/breaker', failure_threshold=2, reset_timeout=0.0)
+        breaker.record_failure()
+        breaker.check()
+        breaker.record_failure()
+        breaker.check()                     # Half-open trial after the reset timeout
+        with self.assertRaises(CircuitOpenError):
+            breaker.check()
+        breaker.record_success()
+        breaker.check()
+
+    def test_canceled_trial_releases_the_half_open_circuit(self):
+        breaker = circuit_breaker('/canceled-trial')
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+
+        async def hang(request):
+            await asyncio.sleep(60)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+                await asyncio.wait_for(APIService()._request(client, 'GET', 'https://example.test',
+                                                             '/canceled-trial', 1.0, 0.0, 3),
+                                       timeout=0.05)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run())
+
+        self.assertTrue(breaker.check())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data.resampler import OHLCVResampler    # noqa: E402
+from Application.data.data_tools import parse_kline_to_df, resample_kline    # noqa: E402
+
+class TestOHLCVResampler(unittest.TestCase):
+
+    def setUp(self):
+        # 1-minute candles starting at the open of a 15-minute candle
+        self.start = 1_700_000_100 - (1_700_000_100 % 900)
+        self.rows = [(self.start + 60 * i, 100 + i, 110 + i % 7, 90 - i % 5, 101 + i, 1 + i)
+                     for i in range(40)]
+
+    def test_matches_batch_resampling(self):
+        resampler = OHLCVResampler(period=900)
+        closed_candles = []
+        for row in self.rows:
+            closed_candles.extend(resampler.update(*row))
+
+        expected = resample_kline(parse_kline_to_df({'t': [row[0] for row in self.rows],
+                                                     'o': [row[1] for row in self.rows],
+                                                     'h': [row[2] for row in self.rows],
+                                                     'l': [row[3] for row in self.rows],
+                                                     'c': [row[4] for row in self.rows],
+                                                     'v': [row[5] for row in self.rows]}), 900)
+
+        candles = closed_candles + [resampler.current()]
+        self.assertEqual(len(closed_candles), 2)
+        self.assertEqual([list(candle[1:]) for candle in candles],
+                         expected.astype(float).values.tolist())
+
+    def test_revision_of_latest_candle(self):
+        resampler = OHLCVResampler(period=900)
+        resampler.update(*self.rows[0])
+        resampler.update(*self.rows[1])
+        resampler.update(self.rows[1][0], 101, 200, 50, 150, 10)
+
+        self.assertEqual(resampler.current(), (self.start, 100.0, 200.0, 50.0, 150.0, 11.0))
+
+    def test_partial_candle_is_not_reported(self):
+        resampler = OHLCVResampler(period=900)
+        closed_candles = []
+        for row in self.rows[5:15]:
+            closed_candles.extend(resampler.update(*row))
+
+        # The first candle was joined after its open, so neither its open nor its close is reported
+        self.assertIsNone(resampler.current())
+
+        for row in self.rows[15:]:
+            closed_candles.extend(resampler.update(*row))
+
+        self.assertEqual([candle[0] for candle in closed_candles], [self.start + 900])
+        self.assertEqual(resampler.current()[0], self.start + 1800)    # type: ignore
+
+if __name__ == '__main__':
+    unittest.main()
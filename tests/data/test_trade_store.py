@@ -0,0 +1,81 @@
+import os
+import sys
+import asyncio
+import unittest
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data.user import User    # noqa: E402
+from Application.utils.event_channels import Event    # noqa: E402
+from Application.data.trade_store import TradeStore    # noqa: E402
+from Application.api.rate_limits import endpoint_throttle    # noqa: E402
+
+def order(order_id, status='Active', matched='0', unmatched='1', client_oid=None):
+    return {'id': order_id, 'status': status, 'matchedAmount': matched,
+            'unmatchedAmount': unmatched, 'clientOrderId': client_oid}
+
+class TestTradeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TradeStore()
+        self.store._initialize_data()
+
+    def test_order_deltas(self):
+        self.assertEqual(self.store.apply_orders([order(10, client_oid='a'), order(11)]), [])
+        self.assertEqual(self.store.order_by_client_id('a')['id'], 10)
+
+        changes = self.store.apply_orders([order(10, matched='0.4', unmatched='0.6'),
+                                           order(11, status='Canceled'),
+                                           order(12, status='Done', matched='1', unmatched='0')])
+        self.assertEqual([(event, record['id']) for event, record in changes],
+                         [(Event.ORDER_PARTIALLY_FILLED, 10),
+                          (Event.ORDER_CANCELED, 11),
+                          (Event.ORDER_FILLED, 12)])
+        self.assertEqual(self.store.open_order_ids, {'10'})
+        self.assertEqual(self.store.newest_order_id, 12)
+
+        # An unchanged snapshot produces no events
+        self.assertEqual(self.store.apply_orders([order(10, matched='0.4', unmatched='0.6')]), [])
+
+    def test_position_deltas(self):
+        opened = self.store.apply_positions([{'id': 1}, {'id': 2}])
+        self.assertEqual([event for event, _ in opened], [Event.POSITION_OPENED] * 2)
+
+        changes = self.store.apply_positions([{'id': 2, 'liquidationPrice': '5'}, {'id': 3}])
+        self.assertEqual(sorted((event, record['id']) for event, record in changes),
+                         sorted([(Event.POSITION_CLOSED, 1), (Event.POSITION_OPENED, 3)]))
+        self.assertEqual(self.store.position(2)['liquidationPrice'], '5')
+        self.assertEqual(len(self.store.positions_df()), 2)
+
+    def test_first_sync_seeds_without_history(self):
+        history = [order(i, status='Done', matched='1', unmatched='0') for i in range(1, 8)]
+        requests = []
+
+        async def fetch_orders_page(http_agent, token, *, status='all', page=1, from_id=None):
+            requests.append((status, from_id))
+            if status == 'open':
+                return {'orders': []}
+            orders = [record for record in history if from_id is None or record['id'] >= from_id]
+            return {'orders': orders[::-1][:3] if from_id is None else orders}
+
+        async def sync_twice():
+            await self.store.sync_orders(None)
+            history.append(order(8, status='Done', matched='1', unmatched='0'))
+            return await self.store.sync_orders(None)
+
+        with mock.patch.object(self.store.trade, 'fetch_orders_page', fetch_orders_page), \
+             mock.patch.object(endpoint_throttle('ORDERS'), 'min_interval', 0.0), \
+             mock.patch.object(User, 'TOKEN', 'token'):
+            changes = asyncio.run(sync_twice())
+
+        self.assertEqual(requests, [('open', None), ('all', None), ('all', 8)])
+        self.assertEqual([(event, record['id']) for event, record in changes],
+                         [(Event.ORDER_FILLED, 8)])
+
+if __name__ == '__main__':
+    unittest.main()
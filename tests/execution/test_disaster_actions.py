@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import asyncio
+import unittest
+import pandas as pd
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data import market_info, trade_store                       # noqa: E402
+from Application.execution import actions                                   # noqa: E402
+from Application.data.market_info import PairInfo                           # noqa: E402
+from Application.execution.actions.disaster_actions import find_gadabouts,\
+                                                           build_recovery_plan,\
+                                                           execute_recovery_plan,\
+                                                           take_recovery_snapshot   # noqa: E402
+
+class FakeTrade:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.canceled = False
+
+    async def cancel_all_orders(self, client, token):
+        self.canceled = True
+        return 'succeeded'
+
+    async def close_position(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {'status': 'failed'} if kwargs['id'] == 3 else {'status': 'ok'}
+
+class FakeSnapshotSource:
+    async def fetch_positions(self, http_agent, token, page=1, **params):
+        return {'positions': [{'id': 1, 'srcCurrency': 'btc', 'dstCurrency': 'usdt',
+                               'side': 'buy', 'liability': '0.1'}]}
+
+    async def fetch_orders_page(self, http_agent, token, page=1, **params):
+        return {'orders': []}
+
+    async def fetch_market_prices(self, http_agent, src_currencies, dst_currencies):
+        return {'btc-usdt': 61234.567}
+
+class TestRecoveryEngine(unittest.TestCase):
+
+    def test_snapshot_warms_the_market_rules(self):
+        pairs = {'BTCUSDT': PairInfo(min_notional=5, amount_step=0.0001, price_step=0.1)}
+
+        async def fetch_market_info(http_agent=None, force=False):
+            market_info._cache.update(pairs=pairs, expires=time.time() + 60)
+            return pairs
+
+        source = FakeSnapshotSource()
+        throttle = mock.Mock(acquire=mock.AsyncMock())
+        disaster_actions = actions.disaster_actions
+        with mock.patch.dict(market_info._cache, pairs={}, expires=0.0), \
+             mock.patch.object(disaster_actions, 'fetch_market_info', fetch_market_info), \
+             mock.patch.object(disaster_actions, 'endpoint_throttle', lambda name: throttle), \
+             mock.patch.object(trade_store, 'endpoint_throttle', lambda name: throttle):
+            positions, orders, prices = asyncio.run(
+                take_recovery_snapshot(None, 'token', source, source)    # type: ignore
+            )
+            plan = build_recovery_plan(positions, orders, prices)
+
+        self.assertEqual(plan.closes[0]['price'], '61234.6')
+
+    def test_plan_and_bounded_execution(self):
+        positions = [{'id': i, 'srcCurrency': 'btc', 'dstCurrency': 'rls', 'side': 'buy',
+                      'liability': '0.1'} for i in range(6)]
+        positions.append({'id': 9, 'srcCurrency': 'eth', 'dstCurrency': 'usdt', 'side': 'sell',
+                          'liability': '1'})
+
+        plan = build_recovery_plan(positions, [{'id': 1}], {'btc-rls': 600_000_000.0})
+        self.assertTrue(plan.cancel_orders)
+        self.assertEqual(plan.unpriced, ['9'])
+        self.assertEqual(plan.closes[0]['price'], '60000000')
+        self.assertEqual(plan.closes[0]['side'], 'sell')
+
+        trade = FakeTrade()
+        closed, failed, canceled = asyncio.run(
+            execute_recovery_plan(None, 'token', trade, plan, concurrency=2)    # type: ignore
+        )
+        self.assertTrue(canceled and trade.canceled)
+        self.assertEqual(trade.max_in_flight, 2)
+        self.assertEqual(sorted(failed), ['3', '9'])
+        self.assertEqual(len(closed), 5)
+
+    def test_find_gadabouts(self):
+        positions = pd.DataFrame({'id'          : [1, 2, 3, 4, 5],
+                                  'srcCurrency' : ['btc', 'btc', 'eth', 'xrp', 'btc'],
+                                  'dstCurrency' : ['usdt', 'usdt', 'usdt', 'usdt', 'usdt'],
+                                  'side'        : ['buy', 'buy', 'buy', 'buy', 'sell'],
+                                  'liability'   : ['0.5', '0.5', '2', '10', '1']})
+        orders = pd.DataFrame({'srcCurrency'     : ['btc', 'btc', 'eth', 'eth', 'eth', 'btc'],
+                               'dstCurrency'     : ['usdt', 'usdt', 'usdt', 'usdt', 'usdt',
+                                                    'usdt'],
+                               'type'            : ['sell', 'sell', 'sell', 'sell', 'buy', 'buy'],
+                               'execution'       : ['StopMarket', 'Limit', 'StopLimit', 'Limit',
+                                                    'Limit', 'StopMarket'],
+                               'unmatchedAmount' : ['1', '1', '2', '1.5', '5', '1']})
+
+        # The pending eth entry does not cover the long, the btc short is covered apart from the
+        # long and only has a stop-loss
+        gadabouts = find_gadabouts(positions, orders).set_index('id')
+        self.assertEqual(sorted(gadabouts.index), [3, 4, 5])
+        self.assertEqual(gadabouts.loc[3, 'tp_coverage'], 1.5)
+        self.assertEqual(
+            gadabouts.loc[5, ['position_total', 'sl_coverage', 'tp_coverage']].tolist(),
+            [1.0, 1.0, 0.0]
+        )
+        self.assertEqual(sorted(find_gadabouts(positions, pd.DataFrame())['id']), [1, 2, 3, 4, 5])
+        self.assertTrue(find_gadabouts(pd.DataFrame(), orders).empty)
+
+if __name__ == '__main__':
+    unittest.main()
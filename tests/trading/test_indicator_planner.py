@@ -0,0 +1,99 @@
+import os
+import sys
+import asyncio
+import unittest
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.trading.analysis import kernels    # noqa: E402
+from Application.trading.analysis.indicator_supervisor import compute_indicators    # noqa: E402
+from Application.trading.analysis.indicator_planner import tick_values,\
+                                                            plan_indicators    # noqa: E402
+
+def kline(size=300, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, size))
+    return pd.DataFrame({'open'  : close,
+                         'high'  : close + rng.uniform(0, 1, size),
+                         'low'   : close - rng.uniform(0, 1, size),
+                         'close' : close,
+                         'volume': rng.uniform(1, 10, size)})
+
+def setup(*indicators):
+    return {'name': 'setup', 'indicators': [{'name': name, 'properties': properties}
+                                            for name, properties in indicators]}
+
+class TestIndicatorPlanner(unittest.TestCase):
+
+    def test_shared_primitives_are_planned_once(self):
+        entry = [setup(('pandas_supertrend', {'window': 14, 'factor': 3}),
+                       ('native_macd', {}))]
+        validation = [setup(('native_atr', {'window': 14}), ('native_ema', {'window': 12}))]
+
+        plan = plan_indicators(entry, validation)
+        order = plan.order
+
+        self.assertEqual(len(order), len(set(order)))
+        self.assertLess(order.index(('true_range',)), order.index(('atr', 14)))
+        self.assertLess(order.index(('atr', 14)), order.index(('supertrend', 14, 3.0)))
+        self.assertLess(order.index(('ema', 12)), order.index(('macd', 12, 26, 9)))
+        self.assertIs(plan_indicators(entry, validation), plan)
+
+        df = kline()
+        result = plan.compute(df)
+        high, low, close = (df[column].to_numpy() for column in ('high', 'low', 'close'))
+        trend, _ = kernels.supertrend(high, low, close, 14, 3.0)
+
+        np.testing.assert_array_equal(result['supertrend_value'], trend)
+        np.testing.assert_array_equal(result['atr_value'], result['atr_14'])
+        np.testing.assert_array_equal(result['atr_value'], kernels.atr(high, low, close, 14))
+        np.testing.assert_array_equal(result['ema_12'], kernels.ema(close, 12))
+
+    def test_systems_share_primitives_of_a_tick(self):
+        df = kline()
+        values = tick_values(df)
+        plan_indicators([setup(('native_supertrend', {'window': 10}))]).compute(df, values)
+        atr = values[('atr', 10)]
+
+        result = plan_indicators([setup(('native_atr', {'window': 10}))]).compute(df,
+                                                                                 tick_values(df))
+        self.assertIs(tick_values(df)[('atr', 10)], atr)
+        np.testing.assert_array_equal(result['atr_10'], atr)
+
+    def test_unchanged_inputs_are_not_recomputed(self):
+        plan = plan_indicators([setup(('native_obv', {}), ('native_sma', {'window': 5}))])
+        df = kline()
+        previous = {}
+        plan.compute(df, previous)
+
+        df_volume = df.copy()
+        df_volume.iloc[-1, df.columns.get_loc('volume')] += 1
+        values = {}
+        result = plan.compute(df_volume, values, previous)
+
+        self.assertIs(values[('sma', 5)], previous[('sma', 5)])
+        self.assertIsNot(values[('obv',)], previous[('obv',)])
+        np.testing.assert_array_equal(result['obv'], kernels.obv(df_volume['close'].to_numpy(),
+                                                                 df_volume['volume'].to_numpy()))
+
+    def test_opaque_indicators_are_merged(self):
+        async def custom(kline_df, properties):
+            return pd.DataFrame({'custom': kline_df['close'] * 2})
+
+        system = [setup(('native_sma', {'window': 5}))]
+        system[0]['indicators'].append({'name': 'custom', 'function': custom, 'properties': {}})
+
+        df = kline()
+        result = asyncio.run(compute_indicators(system, df))
+
+        self.assertEqual(list(result.columns), ['sma_5', 'custom'])
+        np.testing.assert_array_equal(result['custom'], df['close'] * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import asyncio
+import unittest
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.trading.analysis import kernels    # noqa: E402
+from Application.trading.analysis.indicator_functions import native_supertrend    # noqa: E402
+
+def random_walk(size=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 16_500 * np.exp(np.cumsum(rng.normal(0, 0.002, size)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0015, size)) * close
+
+    return pd.DataFrame({'open'  : open_,
+                         'high'  : np.maximum(open_, close) + spread,
+                         'low'   : np.minimum(open_, close) - spread,
+                         'close' : close.round(0),    # Rounded to get unchanged closes too
+                         'volume': rng.gamma(2.0, 600, size)})
+
+def replay(state, *columns):
+    return np.array([state.update(*values) for values in zip(*columns)], dtype=float)
+
+class TestKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.df = random_walk()
+        self.high, self.low, self.close, self.volume = (self.df[column].to_numpy()
+                                                        for column in ('high', 'low', 'close',
+                                                                       'volume'))
+
+    def assertSame(self, actual, expected):
+        np.testing.assert_allclose(np.asarray(actual, dtype=float),
+                                   np.asarray(expected, dtype=float),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True)
+
+    def test_equal_to_pandas_ta(self):
+        df = self.df
+        self.assertSame(kernels.sma(self.close, 20), ta.sma(df['close'], length=20))
+        self.assertSame(kernels.ema(self.close, 20), ta.ema(df['close'], length=20))
+        self.assertSame(kernels.rsi(self.close, 14), ta.rsi(df['close'], length=14))
+        self.assertSame(kernels.atr(self.high, self.low, self.close, 14),
+                        ta.atr(df['high'], df['low'], df['close'], length=14))
+
+        bands = ta.bbands(df['close'], length=20, lower_std=2.0, upper_std=2.0)
+        self.assertSame(np.column_stack(kernels.bbands(self.close, 20, 2.0)), bands.iloc[:, :3])
+
+        macd = ta.macd(df['close'], fast=12, slow=26, signal=9)
+        line, signal, histogram = kernels.macd(self.close, 12, 26, 9)
+        self.assertSame(np.column_stack([line, histogram, signal]), macd)
+
+        supertrend = ta.supertrend(df['high'], df['low'], df['close'], length=14, multiplier=3.0)
+        self.assertSame(np.column_stack(kernels.supertrend(self.high, self.low, self.close, 14,
+                                                           3.0)),
+                        supertrend.iloc[:, :2])
+
+        # pandas_ta starts OBV from the second candle, TA-Lib and pandas_ta 0.3 from the first
+        self.assertSame((kernels.obv(self.close, self.volume) - self.volume[0])[1:],
+                        ta.obv(df['close'], df['volume'])[1:])
+
+    def test_vectorized_variants_match_loop_kernels(self):
+        high, low, close, volume = self.high, self.low, self.close, self.volume
+        presma = kernels._presma(close, 20)
+        mean = kernels.sma(close, 20)
+
+        self.assertSame(kernels._vectorized_ewm(presma, 0.1), kernels._ewm(presma, 0.1))
+        self.assertSame(kernels._vectorized_sma(close, 20), mean)
+        self.assertSame(kernels._vectorized_sma(close[:5], 20), kernels.sma(close[:5], 20))
+        self.assertSame(kernels._vectorized_rsi(close, 14), kernels.rsi(close, 14))
+        self.assertSame(kernels._vectorized_true_range(high, low, close),
+                        kernels.true_range(high, low, close))
+        self.assertSame(kernels._vectorized_rolling_std(close, mean, 20),
+                        kernels.rolling_std(close, mean, 20))
+        self.assertSame(kernels._vectorized_obv(close, volume), kernels.obv(close, volume))
+
+    def test_incremental_states_match_batch_kernels(self):
+        high, low, close, volume = self.high, self.low, self.close, self.volume
+
+        self.assertSame(replay(kernels.SMAState(20), close), kernels.sma(close, 20))
+        self.assertSame(replay(kernels.EMAState(20), close), kernels.ema(close, 20))
+        self.assertSame(replay(kernels.RSIState(14), close), kernels.rsi(close, 14))
+        self.assertSame(replay(kernels.ATRState(14), high, low, close),
+                        kernels.atr(high, low, close, 14))
+        self.assertSame(replay(kernels.BBandsState(20), close),
+                        np.column_stack(kernels.bbands(close, 20)))
+        self.assertSame(replay(kernels.MACDState(), close), np.column_stack(kernels.macd(close)))
+        self.assertSame(replay(kernels.SupertrendState(14, 3.0), high, low, close),
+                        np.column_stack(kernels.supertrend(high, low, close, 14, 3.0)))
+        self.assertSame(replay(kernels.OBVState(), close, volume), kernels.obv(close, volume))
+
+    def test_native_supertrend_indicator_function(self):
+        result = asyncio.run(native_supertrend(self.df, {'window': 14, 'factor': 3}))
+
+        self.assertEqual(list(result.columns), ['supertrend', 'supertrend_side'])
+        self.assertTrue(result.index.equals(self.df.index))
+        self.assertEqual(set(result['supertrend_side'].dropna()), {1.0, -1.0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import asyncio
+import unittest
+import pandas as pd
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.utils.event_channels import Event                      # noqa: E402
+from Application.trading.market import validator                        # noqa: E402
+from Application.trading import strategy_fields as strategy             # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler     # noqa: E402
+
+calls = []
+
+async def valid(kline_df, validation_indicators_df, properties):
+    calls.append(('valid', properties.get('tag')))
+    return 'valid'
+
+async def invalid(kline_df, validation_indicators_df, properties):
+    calls.append(('invalid', None))
+    return 'invalid'
+
+async def hang(kline_df, validation_indicators_df, properties):
+    try:
+        await asyncio.sleep(60)
+    except asyncio.CancelledError:
+        calls.append(('hang canceled', None))
+        raise
+
+def setup(function, **properties):
+    return {'name': function.__name__, 'function': function, 'properties': properties}
+
+def kline(last_candle):
+    return pd.DataFrame({'close': [1.0, 2.0]}, index=[last_candle - 1, last_candle])
+
+class TestMarketValidation(unittest.TestCase):
+
+    def setUp(self):
+        calls.clear()
+        validator._verdicts.update(candle=None, verdicts={})
+
+        self.emitted = []
+        self.jarchi = EventHandler()
+        self.jarchi.attach(self.on_market_is_valid, Event.MARKET_IS_VALID)
+
+    def tearDown(self):
+        self.jarchi.detach(self.on_market_is_valid, Event.MARKET_IS_VALID)
+
+    async def on_market_is_valid(self):
+        self.emitted.append(True)
+
+    def validate(self, system, *klines):
+        async def run():
+            for kline_df in klines:
+                await validator.execute_validator_functions(kline_df, kline_df)
+            return validator.market_verdict(klines[-1])
+
+        with mock.patch.object(strategy, 'MARKET_VALIDATION_SYSTEM', system):
+            return asyncio.run(run())
+
+    def test_rejection_cancels_outstanding_validators(self):
+        self.assertIs(self.validate([setup(hang), setup(invalid)], kline(5)), False)
+        self.assertEqual(calls, [('invalid', None), ('hang canceled', None)])
+        self.assertEqual(self.emitted, [])
+
+    def test_verdicts_are_cached_per_candle(self):
+        system = [setup(valid, tag='a'), setup(valid, tag='b')]
+
+        self.assertIs(self.validate(system, kline(5), kline(5)), True)
+        self.assertEqual(sorted(calls), [('valid', 'a'), ('valid', 'b')])
+
+        self.assertIs(self.validate(system, kline(6)), True)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(self.emitted, [True] * 3)
+
+        self.assertIs(self.validate(system + [setup(invalid)], kline(6), kline(6)), False)
+        self.assertEqual(calls[4:], [('invalid', None)])
+        self.assertEqual(self.emitted, [True] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import asyncio
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.trading.orders.order_dispatcher import OrderDispatcher,\
+                                                        OrderIntent,\
+                                                        OrderPriority    # noqa: E402
+
+class FakeTrade:
+    def __init__(self):
+        self.placed = []
+
+    async def _base_place_order(self, **kwargs):
+        self.placed.append(kwargs)
+        if kwargs['amount'] <= 0:
+            raise ValueError('invalid amount')
+        return {'status': 'ok', 'order': {'clientOrderId': kwargs['client_oid']}}
+
+class TestOrderDispatcher(unittest.TestCase):
+
+    def intent(self, amount=1.0, **params):
+        return OrderIntent('spot', 'buy', 'usdt', 'rls', amount, **params)
+
+    def test_default_priorities(self):
+        self.assertEqual(self.intent(execution='stop_market').priority, OrderPriority.PROTECTIVE)
+        self.assertEqual(self.intent(mode='oco').priority, OrderPriority.PROTECTIVE)
+        self.assertEqual(self.intent(execution='limit').priority, OrderPriority.ENTRY)
+        self.assertNotEqual(self.intent().client_oid, self.intent().client_oid)
+
+    def test_protective_orders_go_first_and_futures_resolve(self):
+        async def run():
+            trade = FakeTrade()
+            dispatcher = OrderDispatcher(trade=trade, token='token', workers=1)    # type: ignore
+
+            # The stop-loss of an open position overtakes the entry and exit queued before it
+            entry = self.intent(execution='market')
+            take_profit = self.intent(execution='limit', priority=OrderPriority.EXIT)
+            stop_loss = self.intent(execution='stop_market')
+            futures = [dispatcher.submit(intent) for intent in (entry, take_profit, stop_loss)]
+            failed = dispatcher.submit(self.intent(amount=0, execution='market'))
+
+            await dispatcher.start()
+            results = await asyncio.gather(*futures)
+            with self.assertRaises(ValueError):
+                await failed
+            await dispatcher.stop()
+
+            return trade, results, (entry, stop_loss, take_profit)
+
+        trade, results, (entry, stop_loss, take_profit) = asyncio.run(run())
+
+        self.assertEqual([order['client_oid'] for order in trade.placed],
+                         [stop_loss.client_oid, entry.client_oid, trade.placed[2]['client_oid'],
+                          take_profit.client_oid])
+        self.assertEqual([result['order']['clientOrderId'] for result in results],
+                         [entry.client_oid, take_profit.client_oid, stop_loss.client_oid])
+
+if __name__ == '__main__':
+    unittest.main()
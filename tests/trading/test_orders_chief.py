@@ -0,0 +1,141 @@
+import os
+import sys
+import asyncio
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.api.retry_policy import DeadlineExceeded              # noqa: E402
+from Application.trading.orders.order_dispatcher import OrderIntent    # noqa: E402
+from Application.trading.orders.orders_chief import OrderState,\
+                                                    OrderStateMachine    # noqa: E402
+
+class FakeDispatcher:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, intent):
+        self.submitted.append(intent)
+        intent.future = asyncio.get_running_loop().create_future()
+        return intent.future
+
+class FakeStore:
+    def __init__(self):
+        self.orders = {}
+
+    def order_by_client_id(self, client_oid):
+        return self.orders.get(client_oid)
+
+class TestOrderStateMachine(unittest.TestCase):
+
+    def test_lifecycle_with_stop_loss_follow_up(self):
+        async def run():
+            dispatcher = FakeDispatcher()
+            machine = OrderStateMachine(dispatcher)    # type: ignore
+            entry = OrderIntent('futures', 'buy', 'btc', 'usdt', 2.0, execution='limit')
+            stop = OrderIntent('futures', 'sell', 'btc', 'usdt', 0, execution='stop_market')
+
+            record = machine.place(entry, follow_up=stop)
+            self.assertEqual(record.state, OrderState.NEW)
+
+            entry.future.set_result({'status': 'ok', 'order': {'id': 7, 'status': 'Active'}})
+            await asyncio.sleep(0)
+            self.assertEqual(record.state, OrderState.ACKNOWLEDGED)
+
+            # Updates are found by exchange id too, and never move backwards
+            self.assertEqual(machine.update({'id': 7, 'matchedAmount': '0.5'}),
+                             OrderState.PARTIALLY_FILLED)
+            self.assertIsNone(machine.update({'id': 7, 'matchedAmount': '0.5'}))
+            self.assertIsNone(machine.update({'id': 7, 'status': 'Active', 'matchedAmount': '0'}))
+
+            self.assertEqual(machine.reconcile([{'id': 7, 'status': 'Done', 'matchedAmount': '2'}]),
+                             1)
+            self.assertEqual(record.state, OrderState.FILLED)
+            self.assertEqual(dispatcher.submitted, [entry, stop])
+            self.assertEqual(stop.amount, 2.0)
+            self.assertEqual(machine.get(stop.client_oid).role, 'stop_loss')
+
+            stop.future.set_result({'status': 'failed', 'message': 'insufficient balance'})
+            await asyncio.sleep(0)
+            self.assertEqual(machine.get(stop.client_oid).state, OrderState.REJECTED)
+            self.assertEqual(machine.active(), [])
+
+        asyncio.run(run())
+
+    def test_canceled_partial_fill_gets_its_follow_up(self):
+        async def run():
+            dispatcher = FakeDispatcher()
+            machine = OrderStateMachine(dispatcher)    # type: ignore
+            entry = OrderIntent('futures', 'buy', 'btc', 'usdt', 2.0, execution='limit')
+            stop = OrderIntent('futures', 'sell', 'btc', 'usdt', 0, execution='stop_market')
+
+            machine.place(entry, follow_up=stop)
+            entry.future.set_result({'status': 'ok', 'order': {'id': 8, 'status': 'Active'}})
+            await asyncio.sleep(0)
+
+            machine.update({'id': 8, 'matchedAmount': '0.5'})
+            machine.update({'id': 8, 'status': 'Canceled', 'matchedAmount': '0.5'})
+
+            self.assertEqual(dispatcher.submitted, [entry, stop])
+            self.assertEqual(stop.amount, 0.5)
+
+        asyncio.run(run())
+
+    def test_bracket_protection_follows_the_entry_fill(self):
+        async def run():
+            dispatcher = FakeDispatcher()
+            machine = OrderStateMachine(dispatcher)    # type: ignore
+            entry = OrderIntent('spot', 'buy', 'btc', 'usdt', 2.0, execution='limit')
+            stop = OrderIntent('spot', 'sell', 'btc', 'usdt', 2.0, execution='stop_market')
+            take_profit = OrderIntent('spot', 'sell', 'btc', 'usdt', 2.0, execution='limit')
+
+            machine.place_bracket(entry, stop, take_profit)
+            self.assertEqual(dispatcher.submitted, [entry])
+
+            entry.future.set_result({'status': 'ok', 'order': {'id': 10, 'status': 'Active'}})
+            await asyncio.sleep(0)
+            machine.update({'id': 10, 'status': 'Done', 'matchedAmount': '1.5'})
+
+            self.assertEqual(dispatcher.submitted, [entry, stop, take_profit])
+            self.assertEqual([stop.amount, take_profit.amount], [1.5, 1.5])
+            self.assertEqual([machine.get(stop.client_oid).role,               # type: ignore
+                              machine.get(take_profit.client_oid).role],       # type: ignore
+                             ['stop_loss', 'take_profit'])
+
+        asyncio.run(run())
+
+    def test_timed_out_placement_is_resolved_by_reconciliation(self):
+        async def run():
+            dispatcher, store = FakeDispatcher(), FakeStore()
+            machine = OrderStateMachine(dispatcher, store)    # type: ignore
+            entry = OrderIntent('futures', 'buy', 'btc', 'usdt', 2.0, execution='limit')
+            stop = OrderIntent('futures', 'sell', 'btc', 'usdt', 0, execution='stop_market')
+            lost = OrderIntent('futures', 'buy', 'eth', 'usdt', 1.0, execution='limit')
+
+            record = machine.place(entry, follow_up=stop)
+            lost_record = machine.place(lost)
+            entry.future.set_exception(DeadlineExceeded('Deadline passed after 1 tries.'))
+            lost.future.set_exception(DeadlineExceeded('Deadline passed after 1 tries.'))
+            await asyncio.sleep(0)
+            self.assertEqual(record.state, OrderState.UNKNOWN)
+            self.assertEqual(machine.active(), [record, lost_record])
+
+            # The entry reached the exchange and got filled, the lost order never shows up
+            store.orders[entry.client_oid] = {'id': 9, 'clientOrderId': entry.client_oid,
+                                              'status': 'Done', 'matchedAmount': '2'}
+            self.assertEqual(machine.reconcile_store(), 1)
+            self.assertEqual(record.state, OrderState.FILLED)
+            self.assertEqual(dispatcher.submitted, [entry, lost, stop])
+            self.assertEqual(stop.amount, 2.0)
+
+            self.assertEqual(machine.reconcile_store(unknown_timeout=0.0), 1)
+            self.assertEqual(lost_record.state, OrderState.REJECTED)
+
+        asyncio.run(run())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import asyncio
+import unittest
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data.data_hub import DataHub                               # noqa: E402
+from Application.data.trade_store import TradeStore                         # noqa: E402
+from Application.trading import strategy_fields as strategy                 # noqa: E402
+from Application.trading.portfolio_manager import PairRisk,\
+                                                  PortfolioRiskEngine       # noqa: E402
+from Application.trading.position_sizing import position_sizer              # noqa: E402
+
+def position(position_id, side, size, entry, leverage='1', src='btc', dst='usdt'):
+    return {'id': position_id, 'srcCurrency': src, 'dstCurrency': dst, 'side': side,
+            'liability': size, 'entryPrice': entry, 'leverage': leverage}
+
+def stop(order_id, side, amount, stop_price, src='btc', dst='usdt'):
+    return {'id': order_id, 'srcCurrency': src, 'dstCurrency': dst, 'type': side,
+            'execution': 'StopMarket', 'status': 'Active', 'matchedAmount': '0',
+            'unmatchedAmount': amount, 'stopPrice': stop_price}
+
+def order_book():
+    return None, None, 100.0
+
+class TestPortfolioRiskEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.store, self.hub, self.engine = TradeStore(), DataHub(), PortfolioRiskEngine()
+        for singleton in (self.store, self.hub, self.engine):
+            singleton._initialize_data()
+        self.engine.set_balance((50_000_000.0, 1_000.0))
+
+    def test_incremental_exposure_risk_and_margin(self):
+        self.store.apply_positions([position(1, 'buy', '2', '100', leverage='2'),
+                                    position(2, 'sell', '5', '10', src='eth', dst='rls')])
+        self.store.apply_orders([stop(10, 'sell', '1', '90')])
+        self.hub.market_prices.update({'btc-usdt': 110.0})
+
+        # Half of the long is covered by a stop, the Rial short is valued by the balance's rate
+        self.assertEqual(self.engine.pair_risk('btc', 'usdt'), PairRisk(220.0, 20.0 + 110.0, 100.0))
+        self.assertEqual(self.engine.pair_risk('eth', 'rls'), PairRisk(1e-3, 1e-3, 1e-3))
+
+        self.hub.market_prices.update({'btc-usdt': 95.0, 'usdt-rls': 25_000.0})
+        self.store.apply_orders([stop(10, 'sell', '2', '90')])
+        self.store.apply_positions([position(1, 'buy', '2', '100', leverage='2')])
+
+        self.assertEqual(self.engine.total_risk(), PairRisk(190.0, 10.0, 100.0))
+        self.assertEqual(set(self.engine.pair_risks), {'btc-usdt'})
+
+    def test_can_open(self):
+        self.store.apply_positions([position(1, 'buy', '4', '100')])
+        self.store.apply_orders([stop(10, 'sell', '4', '95')])
+
+        with mock.patch.object(strategy, 'PORTFOLIO_EXPOSURE', 1.0):
+            self.assertTrue(self.engine.can_open('eth', 'usdt', 2, 100, 90))
+            self.assertEqual(self.engine.rejection_reason('eth', 'usdt', 7, 100, 99, leverage=5),
+                             'exposure limit')
+            self.assertEqual(self.engine.rejection_reason('eth', 'usdt', 5, 100, 91),
+                             'open risk limit')
+            self.assertEqual(self.engine.rejection_reason('eth', 'usdt', 1, 100, 99, leverage=0.1),
+                             'margin limit')
+
+            self.engine.set_balance(None)
+            self.assertFalse(self.engine.can_open('eth', 'usdt', 1, 100, 99))
+
+    def test_sizing_is_gated_on_risk_limits(self):
+        self.store.apply_positions([position(1, 'buy', '4', '100')])
+        self.store.apply_orders([stop(10, 'sell', '4', '95')])
+
+        def compute_size(size, stop_loss_price):
+            async def sizing(order_book, **params):
+                return size
+
+            approach = {'function': sizing}
+            with mock.patch.object(strategy, 'POSITION_SIZING_APPROACH', approach), \
+                 mock.patch.object(strategy, 'TRADING_PAIR', {'symbol'       : 'ETHUSDT',
+                                                              'src_currency' : 'eth',
+                                                              'dst_currency' : 'usdt'}), \
+                 mock.patch.object(position_sizer, 'fetch_pair_info', mock.AsyncMock()):
+                return asyncio.run(position_sizer.compute_position_margin_size(
+                    portfolio_balance = self.engine.balance,
+                    entry_price       = 100,
+                    stop_loss_price   = stop_loss_price,
+                    order_book        = order_book()
+                ))
+
+        with mock.patch.object(strategy, 'PORTFOLIO_EXPOSURE', 1.0):
+            self.assertEqual(compute_size(2, 90), 2)
+            self.assertEqual(compute_size(5, 91), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import asyncio
+import unittest
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.trading.signals.rules import RuleSyntaxError, compile_rule             # noqa: E402
+from Application.trading.signals.signal_generator import generate_signals               # noqa: E402
+from Application.trading.signals.setup_functions import rule_setupfunc,\
+                                                        supertrend_setupfunc            # noqa: E402
+
+def setup(function, **properties):
+    return {'name': function.__name__, 'function': function, 'properties': properties}
+
+class TestRules(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        size = 500
+        self.kline_df = pd.DataFrame({'close': 100 + np.cumsum(rng.normal(0, 1, size))})
+        self.indicator_df = pd.DataFrame({'supertrend_side': np.sign(rng.normal(0, 1, size)),
+                                          'rsi_14': rng.uniform(0, 100, size)})
+
+    def evaluate(self, text):
+        return compile_rule(text).evaluate(self.kline_df, self.indicator_df)
+
+    def test_precedence_and_arithmetic(self):
+        close, rsi = self.kline_df['close'].to_numpy(), self.indicator_df['rsi_14'].to_numpy()
+
+        np.testing.assert_array_equal(self.evaluate('rsi_14 < 30 or rsi_14 > 70 and close > 100'),
+                                      (rsi < 30) | ((rsi > 70) & (close > 100)))
+        np.testing.assert_array_equal(self.evaluate('not (rsi_14 - 50) * 2 >= -close / 10'),
+                                      ~((rsi - 50) * 2 >= -close / 10))
+        self.assertEqual(len(self.evaluate('1 < 2')), len(self.kline_df))
+
+    def test_common_subexpressions_are_shared(self):
+        first = compile_rule('rsi_14 < 70 and close > 100')
+        second = compile_rule('close > 100 or rsi_14 < 70')
+
+        shared = {node_id for node_id, _, _ in first.nodes} & \
+                 {node_id for node_id, _, _ in second.nodes}
+        self.assertEqual(len(shared), 6)    # both columns, both constants, both comparisons
+        self.assertIs(compile_rule('rsi_14 < 70 and close > 100'), first)
+
+        values = {}
+        first.evaluate(self.kline_df, self.indicator_df, values)
+        evaluated = dict(values)
+        second.evaluate(self.kline_df, self.indicator_df, values)
+        self.assertTrue(all(values[node_id] is evaluated[node_id] for node_id in shared))
+
+    def test_rule_setup_matches_supertrend_setup(self):
+        system = [setup(supertrend_setupfunc),
+                  setup(rule_setupfunc, label='rule',
+                        long='supertrend_side crosses_above 0',
+                        short='supertrend_side crosses_below 0')]
+
+        signals = asyncio.run(generate_signals(system, self.kline_df, self.indicator_df))
+
+        np.testing.assert_array_equal(signals.column('rule'),
+                                      signals.column('supertrend_setupfunc'))
+        self.assertTrue(signals.column('rule').any())
+
+    def test_syntax_errors(self):
+        for text in ('rsi_14 <', 'rsi_14 < 70 70', '(close > 1', 'close $ 1', 'and close'):
+            with self.assertRaises(RuleSyntaxError, msg=text):
+                compile_rule(text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import asyncio
+import unittest
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data.data_tools import has_signal                                  # noqa: E402
+from Application.trading.signals.signal_matrix import SignalMatrix                  # noqa: E402
+from Application.trading.signals.signal_generator import generate_signals           # noqa: E402
+from Application.trading.signals.setup_functions import supertrend_setupfunc        # noqa: E402
+
+async def legacy_setupfunc(kline_df, indicator_df, properties):
+    signal_df = pd.DataFrame({'legacy': 0}, index=kline_df.index)
+    signal_df.iloc[-2, 0] = -1
+    return signal_df
+
+class TestSignalMatrix(unittest.TestCase):
+
+    def setUp(self):
+        sides = [np.nan, 1, 1, -1, -1, 1, 1, -1]
+        self.kline_df = pd.DataFrame({'close': np.arange(len(sides), dtype=float)})
+        self.indicator_df = pd.DataFrame({'supertrend_side': sides})
+
+    def generate(self, system):
+        return asyncio.run(generate_signals(system, self.kline_df, self.indicator_df))
+
+    def test_setups_fill_their_columns(self):
+        signals = self.generate([
+            {'name': 'supertrend_setupfunc', 'function': supertrend_setupfunc, 'properties': {}},
+            {'name': 'legacy', 'function': legacy_setupfunc, 'properties': {}}
+        ])
+
+        self.assertEqual(signals.values.dtype, np.int8)
+        self.assertEqual(signals.values.shape, (8, 2))
+        np.testing.assert_array_equal(signals.column('supertrend_setupfunc'),
+                                      [0, 0, 0, -1, 0, 1, 0, -1])
+        np.testing.assert_array_equal(signals.column('legacy'), [0, 0, 0, 0, 0, 0, -1, 0])
+
+        self.assertEqual(signals.latest(), (['supertrend_setupfunc'], ['legacy']))
+
+    def test_latest_matches_has_signal(self):
+        rng = np.random.default_rng(7)
+        signals = SignalMatrix(pd.RangeIndex(2), [f'setup_{number}' for number in range(30)])
+        signals.values[:] = rng.choice([-1, 0, 0, 1], size=signals.values.shape)
+
+        signal_df = signals.frame()
+        new_signals, late_signals = signals.latest()
+
+        self.assertEqual(new_signals, [setup for setup in signal_df
+                                       if has_signal(signal_df, setup) == 'new_signal'])
+        self.assertEqual(late_signals, [setup for setup in signal_df
+                                        if has_signal(signal_df, setup) == 'late_signal'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import asyncio
+import unittest
+import pandas as pd
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+import Application.configs.admin_config as aconfig                      # noqa: E402
+from Application.utils.event_channels import Event                      # noqa: E402
+from Application.trading import strategy_fields as strategy             # noqa: E402
+from Application.trading.signals import signal_generator                # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler     # noqa: E402
+
+calls = []
+
+async def accept(kline_df, indicators_df, setup_name, properties):
+    calls.append('accept')
+    return 'valid'
+
+async def reject(kline_df, indicators_df, setup_name, properties):
+    calls.append('reject')
+    return 'invalid'
+
+async def hang(kline_df, indicators_df, setup_name, properties):
+    try:
+        await asyncio.sleep(60)
+    except asyncio.CancelledError:
+        calls.append('hang canceled')
+        raise
+
+def system(*validators):
+    return [{'name'       : 'setup',
+             'function'   : None,
+             'properties' : {},
+             'validators' : [{'name': validator.__name__, 'function': validator, 'properties': {}}
+                             for validator in validators]}]
+
+class TestSignalValidation(unittest.TestCase):
+
+    def setUp(self):
+        calls.clear()
+        signal_generator._verdicts.clear()
+        signal_generator._emitted.clear()
+        self.kline_df = pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+
+    def validate(self, *validators, signal_time=None, times=1):
+        async def run():
+            return [await signal_generator.validate_signals(self.kline_df, self.kline_df, 'setup',
+                                                            signal_time)
+                    for _ in range(times)]
+
+        with mock.patch.object(strategy, 'ENTRY_SYSTEM', system(*validators)), \
+             mock.patch.object(aconfig.SignalValidation, 'TIMEOUT', 0.05):
+            return asyncio.run(run())
+
+    def test_first_rejection_cancels_the_others(self):
+        started = time.perf_counter()
+        self.assertEqual(self.validate(accept, hang, reject), [False])
+
+        self.assertLess(time.perf_counter() - started, 0.05)
+        self.assertIn('hang canceled', calls)
+
+    def test_timed_out_validator_rejects(self):
+        self.assertEqual(self.validate(accept, hang), [False])
+        self.assertEqual(calls, ['accept', 'hang canceled'])
+
+    def test_verdict_is_cached_per_signal_candle(self):
+        emitted = []
+
+        async def listener(setup_name, signal_time):
+            emitted.append((setup_name, signal_time))
+
+        jarchi = EventHandler()
+        jarchi.attach(listener, Event.VALID_ENTRY_SIGNAL)
+        try:
+            self.assertEqual(self.validate(accept, times=2), [True, True])
+            self.assertEqual(self.validate(accept, signal_time=2), [True])
+            self.assertEqual(self.validate(accept, signal_time=1), [True])
+        finally:
+            jarchi.detach(listener, Event.VALID_ENTRY_SIGNAL)
+
+        self.assertEqual(calls, ['accept', 'accept'])
+        self.assertEqual(emitted, [('setup', 2), ('setup', 1)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import asyncio
+import unittest
+import numpy as np
+import pandas as pd
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.data.market_info import PairInfo,\
+                                         check_order,\
+                                         order_price,\
+                                         normalize_price,\
+                                         normalize_amount,\
+                                         parse_market_options                  # noqa: E402
+from Application.trading.position_sizing import position_sizing_functions    # noqa: E402
+from Application.trading.position_sizing.sizing_engine import best_candidate,\
+                                                               depth_slippage,\
+                                                               size_positions   # noqa: E402
+
+def order_book():
+    asks_df = pd.DataFrame({'price': [103.0, 101.0, 102.0], 'volume': [50.0, 10.0, 20.0]})
+    bids_df = pd.DataFrame({'price': [97.0, 98.0, 99.0], 'volume': [50.0, 20.0, 10.0]})
+    return asks_df, bids_df, 100.0
+
+class TestSizingEngine(unittest.TestCase):
+
+    def test_risk_based_size_broadcasts_over_candidates(self):
+        stop_losses = np.array([95.0, 90.0, 105.0])
+        result = size_positions(capital            = 10_000,
+                                risk_per_trade_pct = 0.02,
+                                entry_price        = 100.0,
+                                stop_loss_price    = stop_losses[:, None],
+                                leverage           = np.array([1.0, 5.0]),
+                                maker_fee          = 0.001,
+                                taker_fee          = 0.002)
+
+        unit_loss = np.abs(100 - stop_losses) + 0.001 * 100 + 0.002 * stop_losses
+        self.assertEqual(result.size.shape, (3, 2))
+        np.testing.assert_allclose(result.size[:, 0], np.minimum(200 / unit_loss, 100))
+        np.testing.assert_allclose(result.margin[:, 1], result.size[:, 1] * 100 / 5)
+        self.assertTrue(result.feasible.all())
+
+    def test_depth_slippage(self):
+        prices, volumes = np.array([99.0, 98.0, 97.0]), np.array([10.0, 20.0, 50.0])
+
+        np.testing.assert_allclose(depth_slippage(prices, volumes, [0, 10, 30, 100]),
+                                   [0, 0, 99 - (990 + 1960) / 30,
+                                    99 - (990 + 1960 + 97 * 70) / 100])
+
+    def test_order_book_slippage_keeps_risk_within_budget(self):
+        result = size_positions(capital            = 10_000,
+                                risk_per_trade_pct = 0.02,
+                                entry_price        = 100.0,
+                                stop_loss_price    = [95.0, 105.0],
+                                order_book         = order_book(),
+                                tolerance_pct      = 0.001)
+
+        self.assertTrue((result.slippage > 0).all())
+        np.testing.assert_allclose(result.risk, 200, rtol=0.002)
+
+    def test_market_bounds_and_best_candidate(self):
+        pair = PairInfo(min_notional=5_000, max_notional=20_000)
+        result = size_positions(capital            = 10_000,
+                                risk_per_trade_pct = 0.02,
+                                entry_price        = 100.0,
+                                stop_loss_price    = [50.0, 99.0, 99.9],
+                                leverage           = 3.0,
+                                pair               = pair)
+
+        np.testing.assert_allclose(result.size, [50, 200, 200])
+        np.testing.assert_array_equal(result.feasible, [False, True, True])
+        self.assertEqual(best_candidate(result, 100.0, take_profit_price=[150, 102, 101]), 1)
+        self.assertIsNone(best_candidate(result._replace(feasible=np.zeros(3, dtype=bool)), 100.0))
+
+    def test_infeasible_size_is_not_returned(self):
+        def position_size(min_notional):
+            with mock.patch.object(position_sizing_functions, 'pair_info',
+                                   lambda symbol: PairInfo(min_notional=min_notional)):
+                return asyncio.run(position_sizing_functions.risk_adjusted_position_sizing(
+                    portfolio_balance  = (0.0, 10_000.0),
+                    risk_per_trade_pct = 0.02,
+                    entry_price        = 100.0,
+                    stop_loss_price    = 90.0,
+                    maker_fee          = 0.0,
+                    taker_fee          = 0.0,
+                    src_currency       = 'btc',
+                    dst_currency       = 'usdt'))
+
+        self.assertEqual(position_size(min_notional=1_000), 20.0)
+        # The minimum order of the market, 50 units, would risk 500 of a budget of 200
+        self.assertEqual(position_size(min_notional=5_000), 0.0)
+
+    def test_parse_market_options(self):
+        pairs = parse_market_options({'nobitex': {'minOrders'        : {'2': '3000000', '13': '5'},
+                                                  'amountPrecisions' : {'BTCIRT': '0.000001',
+                                                                        'BTCUSDT': '0.000001'},
+                                                  'pricePrecisions'  : {'BTCIRT': '10',
+                                                                        'BTCUSDT': '0.01'}}})
+
+        self.assertEqual(pairs['BTCIRT'], PairInfo(3_000_000, float('inf'), 0.000001, 10, 0.1))
+        self.assertEqual(pairs['BTCUSDT'].min_notional, 5)
+        self.assertEqual(pairs['BTCUSDT'].price_step, 0.01)
+        self.assertEqual(pairs['BTCUSDT'].price_scale, 1.0)
+
+    def test_order_normalization(self):
+        pair = PairInfo(min_notional=3_000_000, amount_step=0.000001, price_step=10, price_scale=0.1)
+
+        self.assertEqual(normalize_amount(0.1234567, pair), '0.123456')
+        self.assertEqual(normalize_amount(2.0, pair), '2')
+        self.assertEqual(normalize_price(60_123_456.7, pair), '60123460')
+        self.assertEqual(order_price(600_000_004.0, pair), '60000000')
+        self.assertEqual(normalize_price('61234.567', PairInfo(price_step=0.01)), '61234.57')
+
+        check_order('0.01', '60000000', pair)
+        with self.assertRaises(ValueError):
+            check_order('0.000001', '60000000', pair)
+        with self.assertRaises(ValueError):
+            check_order(normalize_amount(0.0000001, pair), None, pair)
+
+if __name__ == '__main__':
+    unittest.main()
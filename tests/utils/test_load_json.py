@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.utils.load_json import load_cached    # noqa: E402
+from Application.trading import strategy_fields         # noqa: E402
+
+class TestLoadCached(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'config.json')
+        self.write({'field': 1, 'nested': {'items': [1, 2]}})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content, modified_time=None):
+        with open(self.file_path, 'w') as file:
+            file.write(content if isinstance(content, str) else json.dumps(content))
+
+        if modified_time:
+            os.utime(self.file_path, (modified_time, modified_time))
+
+    def test_config_is_cached_and_frozen(self):
+        config = load_cached(self.file_path, check_interval=0)
+
+        self.assertIs(load_cached(self.file_path, check_interval=0), config)
+        self.assertEqual(config['nested']['items'], (1, 2))
+        with self.assertRaises(TypeError):
+            config['field'] = 2    # type: ignore
+
+    def test_reload_on_modification(self):
+        config = load_cached(self.file_path, check_interval=0)
+        self.write({'field': 2}, modified_time=1_000_000)
+
+        self.assertIsNot(load_cached(self.file_path, check_interval=0), config)
+        self.assertEqual(load_cached(self.file_path, check_interval=0)['field'], 2)
+
+    def test_invalid_modification_keeps_previous_config(self):
+        config = load_cached(self.file_path, check_interval=0)
+        self.write('{invalid', modified_time=1_000_000)
+
+        self.assertIs(load_cached(self.file_path, check_interval=0), config)
+
+    def test_invalid_strategy_is_validated_once(self):
+        self.write({'trading_pair': {}}, modified_time=1_000_000)
+        fields = {'TRADING_PAIR': 'previous'}
+
+        with mock.patch.object(strategy_fields, 'STRATEGY_CONFIG_PATH', self.file_path), \
+             mock.patch.dict(strategy_fields._state, config={}, fields=fields, rejected=None), \
+             mock.patch.object(strategy_fields.bot_logs, 'error') as logged:
+            self.assertIs(strategy_fields._current_fields(), fields)
+            self.assertIs(strategy_fields._current_fields(), fields)
+
+        self.assertEqual(logged.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import logging
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.utils.log_sampling import HotPathFilter    # noqa: E402
+
+class TestHotPathFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def record(self, message, level=logging.INFO, line=1):
+        return logging.LogRecord('trade', level, __file__, line, message, None, None)
+
+    def test_deduplication(self):
+        log_filter = HotPathFilter(dedup_window=10, clock=self.clock)
+
+        self.assertTrue(log_filter.filter(self.record('tick')))
+        self.assertFalse(log_filter.filter(self.record('tick')))
+        self.assertFalse(log_filter.filter(self.record('tick')))
+
+        record = self.record('new tick')
+        self.assertTrue(log_filter.filter(record))
+        self.assertIn('previous message repeated 2 times', record.getMessage())
+
+    def test_sampling(self):
+        log_filter = HotPathFilter(sample_every=3, clock=self.clock)
+        passed = [log_filter.filter(self.record(f'tick {number}')) for number in range(7)]
+
+        self.assertEqual(passed, [True, False, False, True, False, False, True])
+
+    def test_token_bucket(self):
+        log_filter = HotPathFilter(rate_per_second=1, burst=2, clock=self.clock)
+        passed = [log_filter.filter(self.record(f'tick {number}')) for number in range(4)]
+        self.assertEqual(passed, [True, True, False, False])
+
+        self.now = 1.0
+        record = self.record('tick 4')
+        self.assertTrue(log_filter.filter(record))
+        self.assertIn('2 messages suppressed', record.getMessage())
+
+    def test_call_sites_and_warnings_are_independent(self):
+        log_filter = HotPathFilter(rate_per_second=1, burst=1, clock=self.clock)
+
+        self.assertTrue(log_filter.filter(self.record('tick', line=1)))
+        self.assertTrue(log_filter.filter(self.record('tick', line=2)))
+        self.assertFalse(log_filter.filter(self.record('tick', line=1)))
+        self.assertTrue(log_filter.filter(self.record('failure', level=logging.ERROR, line=1)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import queue
+import logging
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.utils.logs import DroppingQueueHandler, FastJSONFormatter    # noqa: E402
+
+class TestDroppingQueueHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = queue.Queue(maxsize=2)
+        self.logger = logging.getLogger('test_dropping_queue_handler')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_full_queue_drops_without_blocking(self):
+        for number in range(5):
+            self.logger.info(f'record {number}')
+
+        self.assertEqual(self.queue.qsize(), 2)
+        self.assertEqual(self.handler.dropped, {'INFO': 3})
+
+    def test_drops_are_reported_when_queue_has_room(self):
+        for number in range(3):
+            self.logger.info(f'record {number}')
+
+        self.queue.get_nowait()
+        self.queue.get_nowait()
+        self.logger.info('record after drain')
+
+        messages = [self.queue.get_nowait().getMessage() for _ in range(self.queue.qsize())]
+        self.assertEqual(messages[0], 'record after drain')
+        self.assertIn('1 log records got dropped', messages[1])
+
+class TestFastJSONFormatter(unittest.TestCase):
+
+    def setUp(self):
+        self.formatter = FastJSONFormatter(datefmt       = '%Y-%m-%d %H:%M:%S',
+                                           timezone      = 'UTC',
+                                           json_fields   = {'level'   : 'levelname',
+                                                            'time'    : 'asctime',
+                                                            'message' : 'message',
+                                                            'line'    : 'lineno'},
+                                           calendar_type = 'Gregorian')
+
+    def make_record(self, created, **extra):
+        record = logging.LogRecord('trade', logging.INFO, __file__, 7, 'price is %s', (10,), None)
+        record.created = created
+        record.__dict__.update(extra)
+        return record
+
+    def test_configured_fields_and_extras(self):
+        log_record = json.loads(self.formatter.format(self.make_record(0.5, symbol='USDTIRT',
+                                                                       unserializable=object())))
+
+        self.assertEqual(log_record['level'], 'INFO')
+        self.assertEqual(log_record['time'], '1970-01-01 00:00:00')
+        self.assertEqual(log_record['message'], 'price is 10')
+        self.assertEqual(log_record['line'], 7)
+        self.assertEqual(log_record['symbol'], 'USDTIRT')
+        self.assertIsInstance(log_record['unserializable'], str)
+        self.assertNotIn('msg', log_record)
+
+    def test_time_is_cached_per_second(self):
+        first = json.loads(self.formatter.format(self.make_record(60.1)))['time']
+        second = json.loads(self.formatter.format(self.make_record(60.9)))['time']
+        third = json.loads(self.formatter.format(self.make_record(61.0)))['time']
+
+        self.assertEqual(first, second)
+        self.assertEqual(third, '1970-01-01 00:01:01')
+
+if __name__ == '__main__':
+    unittest.main()
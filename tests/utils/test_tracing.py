@@ -0,0 +1,70 @@
+import os
+import sys
+import asyncio
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv('project_path.env')
+path = os.getenv('PYTHONPATH')
+if path:
+    sys.path.append(path)
+
+from Application.utils import tracing                                   # noqa: E402
+from Application.utils.simplified_event_handler import EventHandler     # noqa: E402
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        tracing.ring.clear()
+
+    def test_tick_propagates_through_emit_and_queues(self):
+        jarchi = EventHandler()
+        event = 'tracing test tick'
+        jarchi.register_event(event, [])
+        queue = asyncio.Queue()
+
+        @tracing.traced('indicators')
+        async def compute():
+            await asyncio.sleep(0)
+
+        async def listener():
+            await compute()
+            queue.put_nowait(tracing.current_trace())
+
+        async def worker():
+            with tracing.resume(await queue.get()):
+                tracing.mark('order_on_wire')
+
+        async def run():
+            jarchi.attach(listener, event)
+            task = asyncio.create_task(worker())
+
+            trace = tracing.start_tick()
+            await jarchi.emit(event)
+            await task
+            return trace
+
+        trace = asyncio.run(run())
+        spans = tracing.ring.spans()
+
+        self.assertEqual({span.tick_id for span in spans}, {trace.tick_id})
+        self.assertEqual({span.stage for span in spans},
+                         {'indicators', f'emit "{event}"', 'order_on_wire'})
+
+        summary = tracing.stage_percentiles()
+        self.assertEqual(summary['indicators']['count'], 1)
+        self.assertLessEqual(summary['indicators']['tick_p99'], summary['order_on_wire']['tick_p50'])
+
+    def test_untraced_calls_and_ring_overwrite(self):
+        ring = tracing.SpanRing(capacity=3)
+        for number in range(5):
+            ring.record(tracing.Span(number, 'stage', 0.0, 0.0))
+
+        self.assertEqual(sorted(span.tick_id for span in ring.spans()), [2, 3, 4])
+
+        with tracing.span('nothing'):
+            pass
+        self.assertEqual(tracing.ring.spans(), [])
+
+if __name__ == '__main__':
+    unittest.main()